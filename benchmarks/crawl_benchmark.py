@@ -0,0 +1,210 @@
+"""
+Offline crawl benchmark.
+
+Runs the full start_crawling -> city_task -> corporate_batch_task pipeline with Celery in eager
+mode against a local GlassDollar stand-in, and stores into mongomock or a local mongod.
+
+    python -m benchmarks.crawl_benchmark --corporates 2000 --cities 20 --latency-ms 20 --error-rate 0.02
+"""
+import argparse
+import functools
+import json
+import math
+import resource
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Optional
+
+import mongomock
+from celery.signals import task_postrun, task_prerun
+from loguru import logger
+from pymongo import MongoClient
+
+from benchmarks.fake_glassdollar import FakeGlassDollarDataset, FakeGlassDollarServer
+from src.celery.app import celery_app
+from src.configs.app import AppConfig
+from src.configs.dataaccess import DataAccessConfig
+from src.dataaccess.database import MongoConnection
+from src.dataaccess.glassdollar_crawler import GlassDollarCrawlerDataAccess
+from src.services.glassdollar_crawler import GlassDollarCrawlingService
+
+COLLECTION_OPERATIONS = [
+    "find", "find_one", "insert_one", "insert_many", "update_one", "update_many", "replace_one",
+    "find_one_and_update", "bulk_write", "count_documents",
+]
+
+
+@contextmanager
+def override(target, **attributes):
+    """Temporarily sets attributes of a config class."""
+    previous = {name: getattr(target, name) for name in attributes}
+    for name, value in attributes.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(target, name, value)
+
+
+@contextmanager
+def count_collection_operations(collection_class, counts: Counter):
+    """Counts the calls of the collection methods that reach MongoDB."""
+    originals = {name: getattr(collection_class, name) for name in COLLECTION_OPERATIONS if hasattr(collection_class, name)}
+
+    def counted(name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return method(*args, **kwargs)
+        return wrapper
+
+    for name, method in originals.items():
+        setattr(collection_class, name, counted(name, method))
+    try:
+        yield
+    finally:
+        for name, method in originals.items():
+            setattr(collection_class, name, method)
+
+
+@contextmanager
+def record_task_latencies(latencies: Dict[str, List[float]]):
+    """Records the execution time of every task by task name."""
+    started_at = {}
+
+    def on_prerun(task_id=None, **kwargs):
+        started_at[task_id] = time.perf_counter()
+
+    def on_postrun(task_id=None, task=None, **kwargs):
+        if task_id in started_at:
+            latencies[task.name.rsplit(".", 1)[-1]].append(time.perf_counter() - started_at.pop(task_id))
+
+    task_prerun.connect(on_prerun, weak=False)
+    task_postrun.connect(on_postrun, weak=False)
+    try:
+        yield
+    finally:
+        task_prerun.disconnect(on_prerun)
+        task_postrun.disconnect(on_postrun)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of the values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_benchmark(corporates: int = 1000, cities: int = 10, page_size: int = 50, latency: float = 0.0,
+                  error_rate: float = 0.0, batch_size: int = AppConfig.CORPORATE_BATCH_SIZE, engine: str = "celery",
+                  mongo_uri: Optional[str] = None, enumeration: str = "city") -> Dict:
+    """
+    Crawls a fake dataset end to end and measures the run.
+
+    Parameters:
+    corporates (int): The number of corporates of the dataset.
+    cities (int): The number of cities the corporates are spread over.
+    page_size (int): The number of rows of a corporates listing page.
+    latency (float): The delay of every fake API response in seconds.
+    error_rate (float): The probability of a fake API response failing with 503.
+    batch_size (int): The number of corporates fetched per detail request.
+    engine (str): "celery" for city and batch tasks, "async" for the single async crawl task.
+    mongo_uri (str, optional): A MongoDB to store into, mongomock when not given.
+    enumeration (str): "city" for one listing per city, "global" for a single listing of all cities.
+
+    Returns:
+    Dict: The measurements.
+    """
+    dataset = FakeGlassDollarDataset(corporates, cities)
+    server = FakeGlassDollarServer(dataset, page_size, latency, error_rate).start()
+    client = MongoClient(mongo_uri) if mongo_uri else mongomock.MongoClient()
+    database_name = f"glassdollar_benchmark_{uuid.uuid4().hex[:8]}"
+    collection_class = type(client[database_name]["job"])
+    mongo_operations = Counter()
+    task_latencies = defaultdict(list)
+    job_id = f"benchmark-{uuid.uuid4().hex[:8]}"
+
+    with ExitStack() as stack:
+        stack.callback(server.stop)
+        stack.callback(client.close)
+        if mongo_uri:
+            stack.callback(client.drop_database, database_name)
+        stack.enter_context(override(
+            DataAccessConfig.GlassDollar, URI=server.uri, RATE_LIMIT=1e6, RATE_LIMIT_MAX=1e6, RATE_LIMIT_BURST=1e6,
+            RETRY_BACKOFF_BASE=0.01, RETRY_BACKOFF_MAX=0.1
+        ))
+        stack.enter_context(override(DataAccessConfig.MongoDB, DB_NAME=database_name))
+        stack.enter_context(override(AppConfig, CORPORATE_BATCH_SIZE=batch_size, CRAWL_ENGINE=engine,
+                                          CRAWL_ENUMERATION=enumeration))
+        stack.enter_context(override(celery_app.conf, task_always_eager=True, task_eager_propagates=True))
+        stack.enter_context(override(MongoConnection, client=client))
+        MongoConnection.ensure_indices()
+        GlassDollarCrawlerDataAccess.connect()
+        stack.callback(GlassDollarCrawlerDataAccess.disconnect)
+        stack.enter_context(count_collection_operations(collection_class, mongo_operations))
+        stack.enter_context(record_task_latencies(task_latencies))
+
+        started_at = time.perf_counter()
+        GlassDollarCrawlingService.start_crawling(job_id)
+        MongoConnection.flush_buffer()
+        elapsed = time.perf_counter() - started_at
+
+        stored_count = MongoConnection("corporates").collection.count_documents({"job_id": job_id})
+        counter, total_corporate_count = MongoConnection("job").get_counter_and_total_value(job_id)
+
+    return {
+        "engine": engine,
+        "enumeration": enumeration,
+        "corporates": corporates,
+        "stored_corporates": stored_count,
+        "job_completed": counter == total_corporate_count == corporates,
+        "elapsed_seconds": round(elapsed, 3),
+        "corporates_per_second": round(stored_count / elapsed, 1) if elapsed else 0.0,
+        "api_requests": server.request_count,
+        "api_errors": server.error_count,
+        "task_latency_seconds": {
+            name: {
+                "count": len(values),
+                "p50": round(percentile(values, 0.5), 4),
+                "p99": round(percentile(values, 0.99), 4),
+            }
+            for name, values in task_latencies.items()
+        },
+        "mongo_operations": dict(mongo_operations, total=sum(mongo_operations.values())),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmarks a crawl against a local GlassDollar stand-in.")
+    parser.add_argument("--corporates", type=int, default=1000)
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--batch-size", type=int, default=AppConfig.CORPORATE_BATCH_SIZE)
+    parser.add_argument("--engine", choices=["celery", "async"], default="celery")
+    parser.add_argument("--enumeration", choices=["city", "global"], default="city")
+    parser.add_argument("--mongo-uri", help="Stores into this MongoDB instead of mongomock")
+    parser.add_argument("--verbose", action="store_true", help="Keeps the info logs of the crawl")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+
+    results = run_benchmark(
+        args.corporates, args.cities, args.page_size, args.latency_ms / 1000, args.error_rate,
+        args.batch_size, args.engine, args.mongo_uri, args.enumeration
+    )
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
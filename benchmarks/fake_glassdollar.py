@@ -0,0 +1,159 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class FakeGlassDollarDataset:
+    """
+    A deterministic set of corporates spread over cities, shaped like the GlassDollar API responses.
+    """
+
+    WORDS = [
+        "atlas", "nordic", "quantum", "vertex", "orbit", "summit", "harbor", "pioneer", "lumen", "delta",
+        "fusion", "crest", "meridian", "cobalt", "zenith", "aurora", "granite", "apex", "nova", "sterling",
+    ]
+    COUNTRIES = ["Denmark", "Germany", "Turkey", "France", "Japan", "United States", "Brazil", "India"]
+    THEMES = ["Automation", "Digital Transformation", "Sustainability", "Fintech", "Healthcare", "Mobility"]
+
+    def __init__(self, corporate_count: int, city_count: int, seed: int = 42):
+        generator = random.Random(seed)
+        self.cities = [f"City {index}" for index in range(city_count)]
+        self.corporates: Dict[str, Dict] = {}
+        self.ids_by_city: Dict[str, List[str]] = {city: [] for city in self.cities}
+        for index in range(corporate_count):
+            city = self.cities[index % city_count]
+            corporate_id = f"corporate-{index}"
+            name = " ".join(generator.sample(FakeGlassDollarDataset.WORDS, 2)).title()
+            partners_count = generator.randint(0, 5)
+            self.corporates[corporate_id] = {
+                "id": corporate_id,
+                "name": f"{name} {index}",
+                "description": " ".join(generator.choices(FakeGlassDollarDataset.WORDS, k=30)),
+                "logo_url": f"https://logos.example.com/{corporate_id}.png",
+                "hq_city": city,
+                "hq_country": generator.choice(FakeGlassDollarDataset.COUNTRIES),
+                "website_url": f"https://{corporate_id}.example.com",
+                "linkedin_url": f"https://www.linkedin.com/company/{corporate_id}",
+                "twitter_url": f"https://twitter.com/{corporate_id}",
+                "startup_partners_count": partners_count,
+                "startup_partners": [
+                    {
+                        "company_name": f"Startup {index}-{partner}",
+                        "logo_url": None,
+                        "city": generator.choice(self.cities),
+                        "website": f"startup-{index}-{partner}.example.com",
+                        "country": generator.choice(FakeGlassDollarDataset.COUNTRIES),
+                        "theme_gd": generator.choice(FakeGlassDollarDataset.THEMES),
+                    }
+                    for partner in range(partners_count)
+                ],
+                "startup_themes": [
+                    [theme, str(generator.randint(1, 5))]
+                    for theme in generator.sample(FakeGlassDollarDataset.THEMES, 2)
+                ],
+            }
+            self.ids_by_city[city].append(corporate_id)
+
+
+class FakeGlassDollarServer:
+    """
+    A local stand-in for the GlassDollar GraphQL API.
+
+    It answers the queries built by GlassDollarQueries: getCorporateCities, paginated
+    corporates listings and counts, and corporate(id) details, aliased or not. Every
+    request is delayed by `latency` seconds and fails with 503 with probability `error_rate`.
+    """
+
+    def __init__(self, dataset: FakeGlassDollarDataset, page_size: int = 50, latency: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 42):
+        self.dataset = dataset
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def uri(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def start(self) -> "FakeGlassDollarServer":
+        """Serves the API on a free local port from a background thread."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("content-length", 0)))
+                status, response = fake.handle(json.loads(body)["query"])
+                payload = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving."""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def handle(self, query: str):
+        """
+        Answers a GraphQL query.
+
+        Returns:
+            Tuple[int, Dict]: The HTTP status and the response body.
+        """
+        with self.random_lock:
+            self.request_count += 1
+            is_failing = self.random.random() < self.error_rate
+            if is_failing:
+                self.error_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if is_failing:
+            return 503, {"errors": [{"message": "Service Unavailable"}]}
+
+        if "getCorporateCities" in query:
+            return 200, {"data": {"getCorporateCities": self.dataset.cities}}
+
+        aliases = re.findall(r'(\w+): corporate\(id: "([^"]+)"\)', query)
+        if aliases:
+            return 200, {"data": {alias: self.dataset.corporates.get(corporate_id) for alias, corporate_id in aliases}}
+
+        corporate_match = re.search(r'corporate\(id: "([^"]+)"\)', query)
+        if corporate_match:
+            return 200, {"data": {"corporate": self.dataset.corporates.get(corporate_match.group(1))}}
+
+        cities = re.findall(r'"([^"]*)"', re.search(r"hq_city: \[(.*?)\]", query).group(1))
+        page = int(re.search(r"page: (\d+)", query).group(1))
+        corporate_ids = [corporate_id for city in cities for corporate_id in self.dataset.ids_by_city.get(city, [])]
+        page_ids = corporate_ids[(page - 1) * self.page_size:page * self.page_size]
+        listing_fields = ("id", "name", "hq_city", "hq_country", "startup_partners_count")
+        rows = [
+            {field: self.dataset.corporates[corporate_id][field] for field in listing_fields}
+            for corporate_id in page_ids
+        ]
+        return 200, {"data": {"corporates": {"rows": rows, "count": len(corporate_ids)}}}
@@ -0,0 +1,91 @@
+"""
+Serialization micro-benchmark.
+
+Encodes the same page of raw corporate documents, as read from MongoDB, the validating way
+(BSON to JSON round trip, Corporate models, TypeAdapter dump) and the fast way
+(CorporateSerializer), and reports the time per 10k corporates.
+
+    python -m benchmarks.serialization_benchmark --corporates 10000 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from bson import ObjectId, json_util
+
+from benchmarks.fake_glassdollar import FakeGlassDollarDataset
+from src.constants.dataaccess import DataAccessConstants
+from src.schemas.corporates import Corporate
+from src.services.corporate_serializer import CorporateSerializer
+from src.services.response_cache import ResponseCacheService
+
+
+def build_documents(corporates: int) -> List[Dict]:
+    """Builds raw documents shaped like the corporates read for a response, with their _id."""
+    dataset = FakeGlassDollarDataset(corporates, max(1, corporates // 100))
+    created_at = datetime.now()
+    documents = []
+    for corporate in dataset.corporates.values():
+        document = Corporate(**corporate, job_id="benchmark", created_at=created_at).model_dump()
+        for field in DataAccessConstants.GlassDollar.EXCLUDED_FIELDS:
+            document.pop(field, None)
+        documents.append({"_id": ObjectId(), **document})
+    return documents
+
+
+def encode_with_models(documents: List[Dict]) -> bytes:
+    """The validating path: every document becomes a Corporate before it is dumped."""
+    corporates = [Corporate(**json.loads(json_util.dumps(document))) for document in documents]
+    return ResponseCacheService.corporates_adapter.dump_json(corporates, exclude_none=True)
+
+
+def time_encoder(encode: Callable[[List[Dict]], bytes], documents: List[Dict], repeat: int) -> float:
+    """Returns the fastest of `repeat` runs in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        encode(documents)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def run_benchmark(corporates: int = 10000, repeat: int = 5) -> Dict:
+    """
+    Times both encoders over the same documents.
+
+    Parameters:
+    corporates (int): The number of documents encoded per run.
+    repeat (int): The number of runs per encoder.
+
+    Returns:
+    Dict: The measurements.
+    """
+    documents = build_documents(corporates)
+    models_seconds = time_encoder(encode_with_models, documents, repeat)
+    fast_seconds = time_encoder(CorporateSerializer.encode_documents, documents, repeat)
+    per_10k = 10000 / corporates
+
+    return {
+        "corporates": corporates,
+        "identical_output": json.loads(encode_with_models(documents)) == json.loads(CorporateSerializer.encode_documents(documents)),
+        "models_ms_per_10k": round(models_seconds * per_10k * 1000, 1),
+        "fast_ms_per_10k": round(fast_seconds * per_10k * 1000, 1),
+        "speedup": round(models_seconds / fast_seconds, 1) if fast_seconds else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Compares the validating and the fast corporate serialization.")
+    parser.add_argument("--corporates", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.corporates, args.repeat)
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
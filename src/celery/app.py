@@ -1,62 +1,329 @@
-from datetime import datetime
+import asyncio
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 from celery import Celery
-from celery.signals import worker_init, worker_shutdown
+from kombu import Exchange, Queue
+from celery.signals import (
+    before_task_publish, task_postrun, task_prerun, worker_init, worker_process_shutdown, worker_shutdown
+)
 from loguru import logger
+from pymongo.errors import PyMongoError
 
 from src.dataaccess.database import MongoConnection
 from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
 from src.dataaccess.glassdollar_crawler import GlassDollarCrawlerDataAccess
-from src.schemas.corporates import Corporate
+from src.dataaccess.rate_limiter import GlassDollarRequestError, UnresolvedCorporatesError
+from src.monitoring.metrics import TASK_DURATION, TASK_QUEUE_WAIT, mark_process_dead, start_worker_exporter
+from src.services.corporate_ingestion import CorporateIngestionService
+from src.services.data_retention import DataRetentionService
+from src.services.glassdollar_async_crawler import GlassDollarAsyncCrawlingService
+from src.services.incremental_crawl import IncrementalCrawlingService
 
 celery_app = Celery('my_celery_app', broker=AppConfig.BROKER_URL)
+celery_app.conf.update(
+    task_acks_late=AppConfig.TASK_ACKS_LATE,
+    task_reject_on_worker_lost=AppConfig.TASK_ACKS_LATE,
+    task_queues=[
+        Queue(queue, Exchange(queue), routing_key=queue, queue_arguments={"x-max-priority": AppConfig.TASK_MAX_PRIORITY})
+        for queue in (AppConfig.CRAWL_QUEUE, AppConfig.CORPORATE_QUEUE)
+    ],
+    task_default_queue=AppConfig.CRAWL_QUEUE,
+    task_routes={
+        f"{__name__}.corporate_task": {"queue": AppConfig.CORPORATE_QUEUE},
+        f"{__name__}.corporate_batch_task": {"queue": AppConfig.CORPORATE_QUEUE},
+    },
+    task_queue_max_priority=AppConfig.TASK_MAX_PRIORITY,
+    task_default_priority=AppConfig.TASK_DEFAULT_PRIORITY,
+    worker_pool=AppConfig.WORKER_POOL,
+    worker_concurrency=AppConfig.WORKER_CONCURRENCY,
+    worker_prefetch_multiplier=AppConfig.WORKER_PREFETCH_MULTIPLIER,
+    beat_schedule={
+        "data-retention": {"task": f"{__name__}.retention_task", "schedule": AppConfig.RETENTION_INTERVAL},
+    },
+)
+task_started_at: Dict[str, float] = {}
 
 
 @worker_init.connect
 def init_worker(**kwargs):
     MongoConnection.connect()
+    MongoConnection.ensure_indices()
     logger.info("Initialized MongoDB connection for worker")
+    GlassDollarCrawlerDataAccess.connect()
+    logger.info("Initialized GlassDollar HTTP session for worker")
+    start_worker_exporter()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    flushed_count = MongoConnection.flush_buffer()
+    logger.info(f"Flushed {flushed_count} buffered corporates for worker process")
+    mark_process_dead(os.getpid())
 
 
 @worker_shutdown.connect
 def shutdown_worker(**kwargs):
+    MongoConnection.flush_buffer()
     MongoConnection.disconnect()
     logger.info("Closed MongoDB connection for worker")
+    GlassDollarCrawlerDataAccess.disconnect()
+    logger.info("Closed GlassDollar HTTP session for worker")
+
+
+@before_task_publish.connect
+def stamp_published_at(headers=None, **kwargs):
+    """Stamps the publish time on the task message, to measure how long it waits in the queue."""
+    if headers is not None:
+        headers["published_at"] = time.time()
+
+
+@task_prerun.connect
+def record_task_start(task_id=None, task=None, **kwargs):
+    published_at = getattr(task.request, "published_at", None)
+    if published_at:
+        TASK_QUEUE_WAIT.labels(task.name).observe(max(0.0, time.time() - published_at))
+    task_started_at[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    started_at = task_started_at.pop(task_id, None)
+    if started_at is not None:
+        TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started_at)
 
 
 @celery_app.task
-def city_task(city: str, job_id: str) -> str:
+def city_task(city: str, job_id: str, incremental: bool = False) -> str:
     """
-    A Celery task that creates a task for each corporate in a given city for a specific job.
+    A Celery task that creates a batch task for every AppConfig.CORPORATE_BATCH_SIZE corporates
+    in a given city for a specific job.
 
     Parameters:
     city (str): The name of the city to crawl corporates in.
     job_id (str): The job ID associated with this task.
+    incremental (bool): Copies corporates that did not change since an earlier job instead of
+                        fetching their details again.
 
     Returns:
     str: Success message
     """
-    page = 1
-    corporate_count = 0
-    corporate_ids, total_corporate_count = GlassDollarCrawlerDataAccess.get_corporates_by_city(city, page)
+    crawl_listing(city, partial(GlassDollarCrawlerDataAccess.get_corporate_rows_by_city, city), job_id, incremental)
 
-    while corporate_ids:
-        for corporate_id in corporate_ids:
-            corporate_task.delay(corporate_id, job_id)
-        corporate_count += len(corporate_ids)
+    message = f"All subtasks are created for {city} in job {job_id}."
+    logger.info(message)
 
-        if corporate_count >= total_corporate_count:
-            break
+    return message
 
-        page += 1
-        corporate_ids, _ = GlassDollarCrawlerDataAccess.get_corporates_by_city(city, page)
 
-    message = f"All subtasks are created for {city} in job {job_id}."
+@celery_app.task
+def enumeration_task(cities: List[str], job_id: str, incremental: bool = False) -> str:
+    """
+    A Celery task that lists the corporates of all cities with a single paginated query and
+    creates their batch tasks.
+
+    A corporate listed more than once is only crawled once. The job total is then set to the
+    number of distinct corporates, so the job counter can reach it exactly.
+
+    Parameters:
+    cities (List[str]): The cities to crawl corporates in.
+    job_id (str): The job ID associated with this task.
+    incremental (bool): Copies corporates that did not change since an earlier job instead of
+                        fetching their details again.
+
+    Returns:
+    str: Success message
+    """
+    crawl_listing(
+        DataAccessConstants.MongoDB.Enumeration.GLOBAL_LISTING,
+        partial(GlassDollarCrawlerDataAccess.get_corporate_rows, cities), job_id, incremental
+    )
+
+    collection_names = DataAccessConstants.MongoDB.CollectionNames
+    enumerated_count = MongoConnection(collection_names.ENUMERATED_CORPORATES).count_by_job_id(job_id)
+    MongoConnection(collection_names.JOB).set_total_corporate_count(job_id, enumerated_count)
+
+    message = f"All subtasks are created for {enumerated_count} corporates in job {job_id}."
     logger.info(message)
 
     return message
 
 
 @celery_app.task
+def resume_task(job_id: str) -> str:
+    """
+    A Celery task that re-enqueues the work of a partial job that was lost in a crash.
+
+    The corporates stored under the job are its ingested IDs. Listed corporates that are neither
+    stored nor excluded as unresolvable get new batch tasks, and the pages missing from the
+    checkpoints of the job's listings are listed again, skipping the corporates that are already
+    known. Finally the counter is recounted from the stored and excluded corporates and the total
+    set to the number of distinct listed corporates, which completes the job if nothing is left
+    to crawl.
+
+    The job should not be processed by any worker while it is resumed.
+
+    Parameters:
+    job_id (str): The job ID to resume.
+
+    Returns:
+    str: Success message
+    """
+    collection_names = DataAccessConstants.MongoDB.CollectionNames
+    job = MongoConnection(collection_names.JOB).get_job(job_id)
+    if job is None:
+        message = f"There is no job with {job_id} to resume."
+        logger.error(message)
+        return message
+    incremental = job.get("incremental", False)
+
+    stored_ids = MongoConnection(collection_names.CORPORATES).get_stored_ids(job_id)
+    unresolvable_ids = MongoConnection(collection_names.ENUMERATED_CORPORATES).get_unresolvable_ids(job_id)
+    enumerated = MongoConnection(collection_names.ENUMERATED_CORPORATES).get_enumerated(job_id)
+    missing_fingerprints = {
+        corporate_id: fingerprint for corporate_id, fingerprint in enumerated.items() if corporate_id not in stored_ids
+    }
+    enqueue_corporates(missing_fingerprints, job_id, incremental)
+
+    cities = job.get("cities") or GlassDollarCrawlerDataAccess.get_cities()
+    if job.get("enumeration") == DataAccessConstants.MongoDB.Enumeration.GLOBAL:
+        listings = {
+            DataAccessConstants.MongoDB.Enumeration.GLOBAL_LISTING:
+                partial(GlassDollarCrawlerDataAccess.get_corporate_rows, cities)
+        }
+    else:
+        listings = {city: partial(GlassDollarCrawlerDataAccess.get_corporate_rows_by_city, city) for city in cities}
+
+    checkpoints = MongoConnection(collection_names.CHECKPOINTS).get_checkpoints(job_id)
+    known_ids = stored_ids | unresolvable_ids | set(enumerated)
+    relisted_page_count = 0
+    for listing, get_page in listings.items():
+        checkpoint = checkpoints.get(listing)
+        if checkpoint is None:
+            known_ids |= crawl_listing(listing, get_page, job_id, incremental, known_ids=known_ids)
+            continue
+
+        pages = sorted(set(range(1, checkpoint["page_count"] + 1)) - set(checkpoint.get("pages", [])))
+        if pages:
+            known_ids |= crawl_listing(listing, get_page, job_id, incremental, pages, checkpoint["page_count"], known_ids)
+            relisted_page_count += len(pages)
+
+    job_connection = MongoConnection(collection_names.JOB)
+    job_connection.raise_counter(job_id, len(stored_ids | unresolvable_ids))
+    job_connection.set_total_corporate_count(
+        job_id, MongoConnection(collection_names.ENUMERATED_CORPORATES).count_by_job_id(job_id)
+    )
+
+    message = (f"Job {job_id} is resumed with {len(missing_fingerprints)} listed corporates "
+               f"and {relisted_page_count} listing pages left.")
+    logger.info(message)
+
+    return message
+
+
+def fetch_listing_pages(get_page: Callable[[int], Tuple[List[Dict], int]], pages: Optional[List[int]] = None,
+                        page_count: Optional[int] = None) -> Iterator[Tuple[int, int, List[Dict]]]:
+    """
+    Yields the rows of the pages of a corporates listing.
+
+    Without given pages, page 1 gives the corporate count and the page size, so the remaining
+    pages are known up front. Pages are fetched concurrently by up to AppConfig.CITY_PAGE_CONCURRENCY
+    threads over the pooled session and yielded in the order they arrive.
+
+    Parameters:
+    get_page (Callable[[int], Tuple[List[Dict], int]]): Fetches the rows and the total count of a page.
+    pages (List[int], optional): Only these pages are fetched when given.
+    page_count (int, optional): The number of pages of the listing, required with pages.
+
+    Returns:
+    Iterator[Tuple[int, int, List[Dict]]]: The page number, the page count and the rows of each page.
+    """
+    if pages is None:
+        rows, total_corporate_count = get_page(1)
+        page_count = math.ceil(total_corporate_count / len(rows)) if rows else 1
+        yield 1, page_count, rows
+        if not rows:
+            return
+        pages = range(2, page_count + 1)
+
+    with ThreadPoolExecutor(max_workers=AppConfig.CITY_PAGE_CONCURRENCY) as executor:
+        futures = {executor.submit(get_page, page): page for page in pages}
+        for future in as_completed(futures):
+            page_rows, _ = future.result()
+            yield futures[future], page_count, page_rows
+
+
+def crawl_listing(listing: str, get_page: Callable[[int], Tuple[List[Dict], int]], job_id: str, incremental: bool,
+                  pages: Optional[List[int]] = None, page_count: Optional[int] = None,
+                  known_ids: Optional[Set[str]] = None) -> Set[str]:
+    """
+    Creates the batch tasks of the corporates of a listing, checkpointing every page.
+
+    The corporates of a page are recorded as listed for the job before their batch tasks are
+    created, and the page is checkpointed afterwards, so a crash at any point leaves either a
+    page to list again or listed corporates to enqueue again.
+
+    Parameters:
+    listing (str): The city of the listing, or the listing of all cities.
+    get_page (Callable[[int], Tuple[List[Dict], int]]): Fetches the rows and the total count of a page.
+    job_id (str): The job ID associated with the corporates.
+    incremental (bool): Copies corporates that did not change since an earlier job instead of
+                        fetching their details again.
+    pages (List[int], optional): Only these pages are listed when given.
+    page_count (int, optional): The number of pages of the listing, required with pages.
+    known_ids (Set[str], optional): Corporate IDs that are already handled and get no batch task.
+
+    Returns:
+    Set[str]: The IDs of the listed corporates.
+    """
+    collection_names = DataAccessConstants.MongoDB.CollectionNames
+    enumerated = MongoConnection(collection_names.ENUMERATED_CORPORATES)
+    checkpoints = MongoConnection(collection_names.CHECKPOINTS)
+    known_ids = set(known_ids or ())
+    listed_ids = set()
+
+    for page, listing_page_count, rows in fetch_listing_pages(get_page, pages, page_count):
+        fingerprints = IncrementalCrawlingService.fingerprint_rows(rows)
+        enumerated.record_enumerated(job_id, fingerprints)
+        new_fingerprints = {
+            corporate_id: fingerprint for corporate_id, fingerprint in fingerprints.items() if corporate_id not in known_ids
+        }
+        known_ids.update(new_fingerprints)
+        listed_ids.update(fingerprints)
+        enqueue_corporates(new_fingerprints, job_id, incremental)
+        checkpoints.record_listing_page(job_id, listing, page, listing_page_count)
+
+    return listed_ids
+
+
+def enqueue_corporates(fingerprints: Dict[str, str], job_id: str, incremental: bool) -> None:
+    """
+    Creates a batch task for every AppConfig.CORPORATE_BATCH_SIZE corporates.
+
+    Parameters:
+    fingerprints (Dict[str, str]): The listing fingerprints of the corporates by ID.
+    job_id (str): The job ID associated with the corporates.
+    incremental (bool): Copies corporates that did not change since an earlier job instead of
+                        fetching their details again.
+    """
+    if not fingerprints:
+        return
+    if incremental:
+        corporate_ids = IncrementalCrawlingService.reuse_unchanged(fingerprints, job_id)
+    else:
+        corporate_ids = list(fingerprints)
+
+    for start in range(0, len(corporate_ids), AppConfig.CORPORATE_BATCH_SIZE):
+        batch = corporate_ids[start:start + AppConfig.CORPORATE_BATCH_SIZE]
+        corporate_batch_task.delay(batch, job_id, {corporate_id: fingerprints[corporate_id] for corporate_id in batch})
+
+
+@celery_app.task(autoretry_for=(GlassDollarRequestError, PyMongoError), retry_backoff=True, max_retries=3,
+                 retry_kwargs={"priority": AppConfig.RETRY_TASK_PRIORITY})
 def corporate_task(corporate_id: str, job_id: str) -> str:
     """
     A Celery task that processes corporate data for a given corporate ID and job ID.
@@ -69,15 +336,81 @@ def corporate_task(corporate_id: str, job_id: str) -> str:
     str: Success message
     """
     corporate_data = GlassDollarCrawlerDataAccess.get_corporate_details(corporate_id)
+    CorporateIngestionService.store_corporates([corporate_data], job_id)
+
+    message = f"Task is completed for {corporate_data['name']} with job id {job_id}"
+    logger.info(message)
+    return message
+
+
+@celery_app.task(bind=True, autoretry_for=(GlassDollarRequestError, PyMongoError), retry_backoff=True, max_retries=3,
+                 retry_kwargs={"priority": AppConfig.RETRY_TASK_PRIORITY})
+def corporate_batch_task(self, corporate_ids: List[str], job_id: str, fingerprints: Optional[Dict[str, str]] = None) -> str:
+    """
+    A Celery task that fetches and stores the details of several corporates with a single request.
+
+    A batch with corporates the API returned no details for is retried. Once the retries are
+    used up, the resolved corporates are stored and the unresolved ones excluded from the job,
+    so the job counter still reaches its total.
+
+    Parameters:
+    corporate_ids (List[str]): The IDs of the corporate entities to process.
+    job_id (str): The ID of the job this task is part of.
+    fingerprints (Dict[str, str], optional): Listing fingerprints of the corporates by ID.
+
+    Returns:
+    str: Success message
+    """
     try:
-        corporate = Corporate(**corporate_data, job_id=job_id, created_at=datetime.now())
-    except ValueError as ex:
-        logger.error(f"Error occurred in validation {str(ex)}. corporate_data: {corporate_data}")
-        raise
+        corporates_data = GlassDollarCrawlerDataAccess.get_corporate_details_batch(corporate_ids)
+    except UnresolvedCorporatesError as ex:
+        if self.request.retries < self.max_retries:
+            raise
+        corporates_data = ex.corporates
+        CorporateIngestionService.exclude_corporates(ex.corporate_ids, job_id)
+    stored_count = CorporateIngestionService.store_corporates(corporates_data, job_id, fingerprints)
+
+    message = f"Task is completed for {stored_count} corporates with job id {job_id}"
+    logger.info(message)
+    return message
+
 
-    MongoConnection("corporates").insert_one(corporate.model_dump())
-    MongoConnection("job").increment_counter(job_id)
+@celery_app.task(autoretry_for=(GlassDollarRequestError, PyMongoError), retry_backoff=True, max_retries=3,
+                 retry_kwargs={"priority": AppConfig.RETRY_TASK_PRIORITY})
+def async_crawl_task(cities: List[str], job_id: str, incremental: bool = False) -> str:
+    """
+    A Celery task that crawls every corporate of the given cities inside a single event loop.
+
+    A failed page or batch fails the task after the rest of the crawl is stored, and the retry
+    only fetches the corporates that are not stored or excluded yet.
+
+    Parameters:
+    cities (List[str]): The cities to crawl corporates in.
+    job_id (str): The ID of the job this task is part of.
+    incremental (bool): Copies corporates that did not change since an earlier job.
+
+    Returns:
+    str: Success message
+    """
+    stored_count = asyncio.run(GlassDollarAsyncCrawlingService.crawl(cities, job_id, incremental))
+
+    message = f"Async crawl is completed for {stored_count} corporates with job id {job_id}"
+    logger.info(message)
+    return message
+
+
+@celery_app.task
+def retention_task() -> str:
+    """
+    A Celery task, scheduled every AppConfig.RETENTION_INTERVAL seconds by Celery beat, that
+    deletes the jobs the retention policy expires and compacts the older completed jobs.
+
+    Returns:
+    str: Success message
+    """
+    results = DataRetentionService.apply_retention()
 
-    message = f"Task is completed for {corporate.name} with job id {job_id}"
+    message = (f"Retention expired {results['expired_jobs']} jobs, deleted {results['deleted_corporates']} "
+               f"corporates and compacted {results['compacted_corporates']} corporates.")
     logger.info(message)
     return message
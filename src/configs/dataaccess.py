@@ -5,7 +5,26 @@ class DataAccessConfig:
     class MongoDB:
         CONNECTION_STRING = env.get("MONGO_CONNECTION_STRING", "mongodb://mongodb:27017")
         DB_NAME = env.get("MONGO_DB_NAME", "glassdollar")
+        CURSOR_BATCH_SIZE = int(env.get("MONGO_CURSOR_BATCH_SIZE", 1000))
+        ASYNC_POOL_SIZE = int(env.get("MONGO_ASYNC_POOL_SIZE", 100))
+        LATEST_JOB_CACHE_TTL = float(env.get("MONGO_LATEST_JOB_CACHE_TTL", 5))
+        WRITE_BUFFER_SIZE = int(env.get("MONGO_WRITE_BUFFER_SIZE", 0))
+        WRITE_BUFFER_FLUSH_INTERVAL = float(env.get("MONGO_WRITE_BUFFER_FLUSH_INTERVAL", 2))
 
     class GlassDollar:
         URI = env.get('GLASSDOLLAR_URI', "https://ranking.glassdollar.com/graphql")
-
+        POOL_SIZE = int(env.get("GLASSDOLLAR_POOL_SIZE", 10))
+        MAX_CONNECTIONS = int(env.get("GLASSDOLLAR_MAX_CONNECTIONS", 100))
+        MAX_KEEPALIVE_CONNECTIONS = int(env.get("GLASSDOLLAR_MAX_KEEPALIVE_CONNECTIONS", 100))
+        TIMEOUT = float(env.get("GLASSDOLLAR_TIMEOUT", 30))
+        MAX_RETRIES = int(env.get("GLASSDOLLAR_MAX_RETRIES", 5))
+        RETRY_BACKOFF_BASE = float(env.get("GLASSDOLLAR_RETRY_BACKOFF_BASE", 0.5))
+        RETRY_BACKOFF_MAX = float(env.get("GLASSDOLLAR_RETRY_BACKOFF_MAX", 30))
+        RATE_LIMIT = float(env.get("GLASSDOLLAR_RATE_LIMIT", 20))
+        RATE_LIMIT_MIN = float(env.get("GLASSDOLLAR_RATE_LIMIT_MIN", 1))
+        RATE_LIMIT_MAX = float(env.get("GLASSDOLLAR_RATE_LIMIT_MAX", 100))
+        RATE_LIMIT_BURST = float(env.get("GLASSDOLLAR_RATE_LIMIT_BURST", 20))
+        AIMD_DECREASE_FACTOR = float(env.get("GLASSDOLLAR_AIMD_DECREASE_FACTOR", 0.5))
+        AIMD_DECREASE_COOLDOWN = float(env.get("GLASSDOLLAR_AIMD_DECREASE_COOLDOWN", 5))
+        AIMD_INCREASE_STEP = float(env.get("GLASSDOLLAR_AIMD_INCREASE_STEP", 1))
+        AIMD_INCREASE_EVERY = int(env.get("GLASSDOLLAR_AIMD_INCREASE_EVERY", 20))
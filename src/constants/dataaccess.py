@@ -1,8 +1,31 @@
 class DataAccessConstants:
     class MongoDB:
+        DUPLICATE_KEY_ERROR_CODE = 11000
+        CONTENT_REF_FIELD = "content_ref"
+
         class CollectionNames:
             JOB = "job"
             CORPORATES = "corporates"
+            FINGERPRINTS = "fingerprints"
+            RATE_LIMITS = "rate_limits"
+            RESPONSE_CACHE = "response_cache"
+            CHECKPOINTS = "checkpoints"
+            ENUMERATED_CORPORATES = "enumerated_corporates"
+            CORPORATE_CONTENTS = "corporate_contents"
+
+        class JobStatus:
+            RUNNING = "running"
+            COMPLETED = "completed"
+            EXPIRED = "expired"
+
+        class Enumeration:
+            CITY = "city"
+            GLOBAL = "global"
+            GLOBAL_LISTING = "*"
 
     class GlassDollar:
-        EXCLUDED_FIELDS = ["id", "_id", "created_at", "job_id"]
+        EXCLUDED_FIELDS = ["id", "_id", "created_at", "job_id", "content_hash"]
+        RATE_LIMIT_KEY = "glassdollar"
+        RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+        THROTTLING_STATUS_CODES = [429, 503]
+        TRANSIENT_GRAPHQL_ERROR_CODES = ["INTERNAL_SERVER_ERROR", "SERVICE_UNAVAILABLE", "TIMEOUT"]
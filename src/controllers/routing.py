@@ -1,77 +1,425 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Union
+from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Awaitable, Callable, Iterator, List, Dict, Literal, Optional, Tuple, Union
+import os
+import re
 
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.monitoring.metrics import CONTENT_TYPE_LATEST, render_metrics
 from src.services.glassdollar_crawler import GlassDollarCrawlingService
 from src.services.glassdollar_retrieval import GlassDollarRetrievalService
+from src.services.job_diff import JobDiffService
+from src.services.job_progress import JobProgressService
+from src.services.response_cache import ResponseCacheService
+from src.services.snapshot_export import SnapshotExportService
 from src.schemas.corporates import Corporate
+from src.schemas.job import JobProgress
 
 router = APIRouter(prefix="")
 
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+class CorporatesResponse(Response):
+    """A JSON response whose body holds corporates already encoded by the response cache."""
+    media_type = "application/json"
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parses the comma separated `fields` query parameter into a list of Corporate fields.
+
+    Args:
+        fields (str, optional): Comma separated field names, e.g. "name,hq_city".
+
+    Returns:
+        Optional[List[str]]: The requested fields, None when every field is requested.
+
+    Raises:
+        HTTPException: If a field is not a returnable Corporate field.
+    """
+    if not fields:
+        return None
+
+    requested_fields = [field.strip() for field in fields.split(",") if field.strip()]
+    returnable_fields = set(Corporate.model_fields) - set(DataAccessConstants.GlassDollar.EXCLUDED_FIELDS)
+    unknown_fields = [field for field in requested_fields if field not in returnable_fields]
+    if unknown_fields:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown_fields)}")
+    return requested_fields
+
+
+def validate_cursor(after: Optional[str]) -> None:
+    """
+    Validates the `after` pagination cursor.
+
+    Raises:
+        HTTPException: If the cursor is not a cursor returned by a previous page.
+    """
+    if after is not None and not ObjectId.is_valid(after):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a single range of a Range header, e.g. "bytes=0-1023", "bytes=1024-" or "bytes=-512".
+
+    Args:
+        range_header (str, optional): The Range header.
+        size (int): The size of the file in bytes.
+
+    Returns:
+        Optional[Tuple[int, int]]: The first and last byte of the range, None when the whole
+                                   file is served (no header, or a header with several ranges).
+
+    Raises:
+        HTTPException: If the range is malformed or starts past the end of the file.
+    """
+    if not range_header or "," in range_header:
+        return None
+
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header)
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(status_code=416, detail="Invalid range", headers={"Content-Range": f"bytes */{size}"})
+
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(0, size - int(last)), size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def iter_file_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    """
+    Reads the bytes from start to end, inclusive, of a file in chunks of AppConfig.SNAPSHOT_CHUNK_SIZE.
+
+    Args:
+        path (str): The path of the file.
+        start (int): The first byte.
+        end (int): The last byte.
+
+    Returns:
+        Iterator[bytes]: The chunks.
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(AppConfig.SNAPSHOT_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def cached_documents_response(request: Request, cache_key: str,
+                                    load: Callable[[], Awaitable[Union[dict, Tuple[List[Corporate], Optional[str]]]]]) -> Union[dict, Response]:
+    """
+    Serves a page of documents from the response cache, loading and caching it on a miss.
+
+    Args:
+        request (Request): The request, whose If-None-Match header is honoured.
+        cache_key (str): The cache key of the response.
+        load (Callable): Loads the page of documents with the cursor of the next page.
+
+    Returns:
+        Union[dict, Response]: The cached JSON body, 304 Not Modified when the client holds it,
+                               or the message returned by `load` which is never cached.
+    """
+    cached_response = await ResponseCacheService.get(cache_key)
+    if cached_response is None:
+        result = await load()
+        if isinstance(result, dict):
+            return result
+        cached_response = await ResponseCacheService.put(cache_key, *result)
+
+    headers = {"ETag": cached_response.etag}
+    if cached_response.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = cached_response.next_cursor
+    if ResponseCacheService.etag_matches(request.headers.get("if-none-match"), cached_response.etag):
+        return Response(status_code=304, headers=headers)
+    return CorporatesResponse(content=cached_response.body, headers=headers)
+
 
 @router.post("/start-crawling/glassdollar", tags=["Crawling Operations"])
-async def start_glassdollar_crawling(job_id: str) -> dict[str, str]:
+async def start_glassdollar_crawling(job_id: str, incremental: bool = False) -> dict[str, str]:
     """
     Initiates the GlassDollar crawling process for the given job ID.
 
     Args:
         job_id (str): Unique identifier for the crawling job.
+        incremental (bool): Reuses corporates that did not change since an earlier job
+                            instead of fetching their details again.
 
     Returns:
         Dict[str, str]: A message indicating that the crawling process has started.
     """
-    GlassDollarCrawlingService.start_crawling(job_id)
+    await run_in_threadpool(GlassDollarCrawlingService.start_crawling, job_id, incremental)
     return {
         "job_id": job_id,
         "message": "Crawling started, come back later for results. Use job id to retrieve the data."
     }
 
 
+@router.post("/jobs/{job_id}/resume", tags=["Crawling Operations"])
+async def resume_glassdollar_crawling(job_id: str) -> dict[str, str]:
+    """
+    Resumes a partial crawling job, re-enqueueing only the work it is missing.
+
+    Args:
+        job_id (str): Unique identifier for the crawling job.
+
+    Returns:
+        Dict[str, str]: A message indicating that the crawling process is resumed.
+    """
+    await run_in_threadpool(GlassDollarCrawlingService.resume_crawling, job_id)
+    return {
+        "job_id": job_id,
+        "message": "Crawling resumed, come back later for results. Use job id to retrieve the data."
+    }
+
+
+@router.get("/jobs/{job_id}", tags=["Crawling Operations"])
+async def get_job_progress(job_id: str) -> JobProgress:
+    """
+    Retrieves the progress of a crawling job without touching its documents.
+
+    Args:
+        job_id (str): Unique identifier for the crawling job.
+
+    Returns:
+        JobProgress: The status, counter, total, rate in corporates per second and ETA in seconds of the job.
+    """
+    try:
+        return await JobProgressService.get_progress(job_id)
+    except ValueError as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+
+
+@router.get("/jobs/{job_id}/events", tags=["Crawling Operations"])
+async def stream_job_progress(job_id: str) -> StreamingResponse:
+    """
+    Pushes the progress of a crawling job as Server-Sent Events until it completes, expires or is deleted.
+
+    Args:
+        job_id (str): Unique identifier for the crawling job.
+
+    Returns:
+        StreamingResponse: A text/event-stream of `progress` events carrying the job progress.
+    """
+    try:
+        await JobProgressService.get_polled_progress(job_id)
+    except ValueError as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+    return StreamingResponse(
+        JobProgressService.stream_progress(job_id), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/jobs/{job_id}/diff/{other_job_id}", tags=["Data Retrieval"])
+async def get_job_diff(job_id: str, other_job_id: str) -> StreamingResponse:
+    """
+    Streams the corporates added, removed or changed from one completed job to another as NDJSON.
+
+    Args:
+        job_id (str): The job compared from.
+        other_job_id (str): The job compared to.
+
+    Returns:
+        StreamingResponse: One line per corporate: {"change": "added" | "removed", "id", "document"}
+                           or {"change": "changed", "id", "name", "fields"}, with the old and new
+                           value of every changed field.
+    """
+    try:
+        diff = await JobDiffService.stream_diff(job_id, other_job_id)
+    except ValueError as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+    if isinstance(diff, dict):
+        return diff
+    return StreamingResponse(diff, media_type=STREAM_MEDIA_TYPES["ndjson"])
+
+
 @router.get("/documents/glassdollar/{job_id}", tags=["Data Retrieval"], response_model_exclude_none=True)
-async def get_documents(job_id: str) -> Union[dict, List[Corporate]]:
+async def get_documents(job_id: str, request: Request, stream: Optional[Literal["ndjson", "json"]] = None,
+                        fields: Optional[str] = None, after: Optional[str] = None,
+                        limit: Optional[int] = Query(default=None, ge=1)) -> Union[dict, List[Corporate]]:
     """
     Retrieves a list of documents associated with the specified job ID from the GlassDollar crawling process.
 
     Args:
         job_id (str): Unique identifier for the crawling job.
+        stream (str, optional): Streams the documents as "ndjson" lines or as a "json" array
+                                straight from the database cursor.
+        fields (str, optional): Comma separated fields to return, e.g. "name,hq_city".
+        after (str, optional): The cursor of the page to return, taken from the X-Next-Cursor header.
+        limit (int, optional): The page size. The X-Next-Cursor header is set while more pages follow.
+
+    Pages are served from the response cache with an ETag; a matching If-None-Match header gets 304 Not Modified.
+    The job status is checked before the cache, so the pages of an expired or deleted job are never served.
 
     Returns:
         List[Corporate]: A list of Corporate documents related to the given job ID.
     """
+    requested_fields = parse_fields(fields)
+    validate_cursor(after)
     try:
-        documents = GlassDollarRetrievalService.get_documents(job_id)
+        if stream:
+            documents = await GlassDollarRetrievalService.stream_documents(job_id, stream, requested_fields)
+            if isinstance(documents, dict):
+                return documents
+            return StreamingResponse(documents, media_type=STREAM_MEDIA_TYPES[stream])
+
+        if not await GlassDollarRetrievalService.is_job_completed(job_id):
+            return {"message": "Come Back Later"}
+        return await cached_documents_response(
+            request,
+            ResponseCacheService.build_key("documents", job_id, fields=requested_fields, after=after, limit=limit),
+            lambda: GlassDollarRetrievalService.get_documents(job_id, requested_fields, after, limit)
+        )
     except ValueError as ex:
         raise HTTPException(status_code=404, detail=str(ex))
-    return documents
 
 
 @router.get("/documents/glassdollar-latest", tags=["Data Retrieval"], response_model_exclude_none=True)
-async def get_latest_completed_job_documents() -> List[Corporate]:
+async def get_latest_completed_job_documents(request: Request, stream: Optional[Literal["ndjson", "json"]] = None,
+                                             fields: Optional[str] = None, after: Optional[str] = None,
+                                             limit: Optional[int] = Query(default=None, ge=1)) -> List[Corporate]:
     """
     Retrieves a list of documents from the most recently completed GlassDollar crawling job.
 
+    Args:
+        stream (str, optional): Streams the documents as "ndjson" lines or as a "json" array
+                                straight from the database cursor.
+        fields (str, optional): Comma separated fields to return, e.g. "name,hq_city".
+        after (str, optional): The cursor of the page to return, taken from the X-Next-Cursor header.
+        limit (int, optional): The page size. The X-Next-Cursor header is set while more pages follow.
+
+    Pages are served from the response cache with an ETag; a matching If-None-Match header gets 304 Not Modified.
+
     Returns:
         List[Corporate]: A list of Corporate documents from the latest completed job.
     """
+    requested_fields = parse_fields(fields)
+    validate_cursor(after)
     try:
-        documents = GlassDollarRetrievalService.get_latest_documents()
+        if stream:
+            return StreamingResponse(
+                await GlassDollarRetrievalService.stream_latest_documents(stream, requested_fields),
+                media_type=STREAM_MEDIA_TYPES[stream]
+            )
+        job_id = await GlassDollarRetrievalService.get_latest_completed_job_id()
+        return await cached_documents_response(
+            request,
+            ResponseCacheService.build_key("documents", job_id, fields=requested_fields, after=after, limit=limit),
+            lambda: GlassDollarRetrievalService.get_latest_documents(requested_fields, after, limit, job_id)
+        )
     except ValueError as ex:
         raise HTTPException(status_code=404, detail=str(ex))
-    return documents
 
 
 @router.get("/search/glassdollar/{keyword}", tags=["Data Retrieval"], response_model_exclude_none=True)
-async def search_documents(keyword: str) -> List[Corporate]:
+async def search_documents(keyword: str, request: Request, fields: Optional[str] = None,
+                           limit: Optional[int] = Query(default=None, ge=1),
+                           offset: int = Query(default=0, ge=0)) -> List[Corporate]:
     """
     Searches for documents from the most recently crawled GlassDollar data using the provided keyword.
 
+    Args:
+        keyword (str): Keyword to search for within the crawled documents. Every term has to match
+                       a word of the name, city, country, startup themes or description, or be its prefix.
+        fields (str, optional): Comma separated fields to return, e.g. "name,hq_city".
+        limit (int, optional): The page size.
+        offset (int): The number of top ranked documents to skip.
+
+    Pages are served from the response cache with an ETag; a matching If-None-Match header gets 304 Not Modified.
+
+    Returns:
+        List[Corporate]: A list of Corporate documents that match the search keyword, the most relevant first.
+    """
+    requested_fields = parse_fields(fields)
+    try:
+        job_id = await GlassDollarRetrievalService.get_latest_completed_job_id()
+        return await cached_documents_response(
+            request,
+            ResponseCacheService.build_key("search", job_id, keyword, requested_fields, limit=limit, offset=offset),
+            lambda: GlassDollarRetrievalService.search_documents(keyword, requested_fields, limit, offset, job_id)
+        )
+    except ValueError as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+
+
+@router.get("/search/glassdollar/{keyword}/facets", tags=["Data Retrieval"])
+async def get_search_facets(keyword: str) -> Dict:
+    """
+    Counts the documents of the most recently crawled GlassDollar data matching the keyword.
+
     Args:
         keyword (str): Keyword to search for within the crawled documents.
 
     Returns:
-        List[Corporate]: A list of Corporate documents that match the search keyword.
+        Dict: The number of matching documents and their counts by `hq_country` and `startup_themes`.
+    """
+    try:
+        return await GlassDollarRetrievalService.get_search_facets(keyword)
+    except ValueError as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+
+
+@router.get("/snapshots/glassdollar/{job_id}", tags=["Data Retrieval"])
+async def download_snapshot(job_id: str, request: Request) -> Response:
+    """
+    Downloads the documents of a completed job as a zstd compressed Parquet file.
+
+    The snapshot is written on the first download of the job. A Range header is answered
+    with 206 Partial Content, so interrupted downloads can be resumed.
+
+    Args:
+        job_id (str): Unique identifier for the crawling job.
+
+    Returns:
+        Response: The snapshot, or a message if the job is not completed.
     """
     try:
-        documents = GlassDollarRetrievalService.search_documents(keyword)
+        path = await SnapshotExportService.get_snapshot(job_id)
     except ValueError as ex:
         raise HTTPException(status_code=404, detail=str(ex))
-    return documents
+    if isinstance(path, dict):
+        return path
+
+    size = os.path.getsize(path)
+    byte_range = parse_byte_range(request.headers.get("range"), size)
+    start, end = byte_range or (0, size - 1)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": f'attachment; filename="{os.path.basename(path)}"',
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        iter_file_range(path, start, end), status_code=206 if byte_range else 200,
+        media_type=PARQUET_MEDIA_TYPE, headers=headers
+    )
+
+
+@router.get("/metrics", tags=["Monitoring"], include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Exposes the metrics of the API process in the Prometheus text format.
+
+    Returns:
+        Response: The metrics.
+    """
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
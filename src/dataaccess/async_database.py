@@ -0,0 +1,295 @@
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+import time
+
+from src.configs.dataaccess import DataAccessConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.database import MongoConnection
+from src.monitoring.metrics import mongo_command_metrics
+from src.schemas.corporates import Corporate
+
+
+class AsyncMongoConnection:
+    """
+    A class for managing asynchronous MongoDB connections and operations of the API.
+
+    The route handlers run on the event loop, so they read through Motor instead of the
+    blocking pymongo client of MongoConnection, which the Celery workers keep using.
+    Reads mirror those of MongoConnection and share its pagination, projection, hydration and
+    latest completed job cache; writes belong to the workers and stay there.
+
+    Attributes:
+        client (AsyncIOMotorClient): The Motor client for database operations.
+        database (AsyncIOMotorDatabase): The database instance.
+        collection (AsyncIOMotorCollection): The collection instance.
+
+    Methods:
+        connect: Creates the Motor client.
+        disconnect: Closes the Motor client.
+        get_collection: Retrieves a cached collection handle.
+        fetch_by_job_id: Fetches documents by job ID.
+        find_page: Runs a query with keyset pagination and field selection.
+        iter_by_job_id: Iterates raw documents of a job ID straight from the cursor.
+        hydrate: Replaces compacted documents by their full documents.
+        get_latest_completed_job_id: Retrieves the latest completed job ID.
+        get_job_progress: Retrieves the progress fields of a job.
+        fetch_by_ids: Fetches the raw documents of given corporate IDs in a job.
+        iter_changed_ids: Iterates the corporate IDs that differ between two jobs.
+        get_cached_response: Retrieves an unexpired response of the shared response cache.
+        set_cached_response: Stores a response in the shared response cache.
+    """
+
+    client = None
+    collections = {}
+    collections_client = None
+
+    def __init__(self, collection_name):
+        """
+        Initializes the AsyncMongoConnection instance.
+
+        Args:
+            collection_name (str): The name of the collection to connect to.
+        """
+        self.client = AsyncMongoConnection.client
+        self.database = self.client[DataAccessConfig.MongoDB.DB_NAME]
+        self.collection = self.get_collection(collection_name)
+
+    @staticmethod
+    def connect():
+        """Creates the Motor client instance. It binds to the running event loop on first use."""
+        AsyncMongoConnection.client = AsyncIOMotorClient(
+            DataAccessConfig.MongoDB.CONNECTION_STRING, maxPoolSize=DataAccessConfig.MongoDB.ASYNC_POOL_SIZE,
+            event_listeners=[mongo_command_metrics]
+        )
+
+    @staticmethod
+    def disconnect():
+        """Closes the Motor client."""
+        if AsyncMongoConnection.client:
+            AsyncMongoConnection.client.close()
+
+    def get_collection(self, collection_name):
+        """
+        Retrieves a collection handle, cached per process for the current client.
+
+        Args:
+            collection_name (str): The name of the collection to retrieve.
+
+        Returns:
+            AsyncIOMotorCollection: The collection.
+        """
+        if AsyncMongoConnection.collections_client is not self.client:
+            AsyncMongoConnection.collections = {}
+            AsyncMongoConnection.collections_client = self.client
+
+        collection = AsyncMongoConnection.collections.get(collection_name)
+        if collection is None:
+            collection = self.database.get_collection(collection_name)
+            AsyncMongoConnection.collections[collection_name] = collection
+        return collection
+
+    async def fetch_by_job_id(self, job_id, excluded_fields: List[str], fields: Optional[List[str]] = None,
+                              after: Optional[str] = None, limit: Optional[int] = None,
+                              raw: bool = False) -> Tuple[List[Union[Corporate, Dict]], Optional[str]]:
+        """
+        Fetches the documents of a job, one page at a time.
+
+        Args:
+            job_id (str): The job ID to fetch documents for.
+            excluded_fields (List[str]): Fields left out of the documents.
+            fields (List[str], optional): Only these fields are returned when given.
+            after (str, optional): The cursor returned with the previous page.
+            limit (int, optional): The maximum number of documents of the page.
+            raw (bool): Returns the raw documents instead of validating them into Corporate. Documents
+                        read with fields are always raw.
+
+        Returns:
+            Tuple[List[Union[Corporate, Dict]], Optional[str]]: The documents and the cursor of the next page,
+                                                               None when there is no next page.
+        """
+        return await self.find_page({"job_id": job_id}, excluded_fields, fields, after, limit, raw)
+
+    async def find_page(self, query: Dict, excluded_fields: List[str], fields: Optional[List[str]] = None,
+                        after: Optional[str] = None, limit: Optional[int] = None,
+                        raw: bool = False) -> Tuple[List[Union[Corporate, Dict]], Optional[str]]:
+        """
+        Runs a query with keyset pagination on _id and a projection of the requested fields.
+
+        Without a limit every matching document is returned in natural order.
+
+        Args:
+            query (Dict): The filter of the query.
+            excluded_fields (List[str]): Fields left out of the documents.
+            fields (List[str], optional): Only these fields are returned when given.
+            after (str, optional): Only documents with an _id greater than this cursor are returned.
+            limit (int, optional): The maximum number of documents of the page.
+            raw (bool): Returns the raw documents instead of validating them into Corporate. Documents
+                        read with fields are always raw.
+
+        Returns:
+            Tuple[List[Union[Corporate, Dict]], Optional[str]]: The documents and the cursor of the next page.
+        """
+        projection = MongoConnection.build_projection(excluded_fields, fields, keep_id=limit is not None)
+        cursor = MongoConnection.limit_page(self.collection.find(
+            MongoConnection.page_query(query, after), projection, batch_size=DataAccessConfig.MongoDB.CURSOR_BATCH_SIZE
+        ), limit)
+        return MongoConnection.to_page(await self.hydrate(await cursor.to_list(length=None), projection), limit, raw, fields)
+
+    async def iter_by_job_id(self, job_id: str, excluded_fields: List[str],
+                             fields: Optional[List[str]] = None) -> AsyncIterator[Dict]:
+        """
+        Iterates the raw documents of a job without materializing them.
+
+        Documents are pulled from the server, and hydrated, in batches of DataAccessConfig.MongoDB.CURSOR_BATCH_SIZE.
+
+        Args:
+            job_id (str): The job ID to fetch documents for.
+            excluded_fields (List[str]): Fields left out of the documents.
+            fields (List[str], optional): Only these fields are returned when given.
+
+        Returns:
+            AsyncIterator[Dict]: The documents.
+        """
+        projection = MongoConnection.build_projection(excluded_fields, fields)
+        cursor = self.collection.find(
+            {"job_id": job_id}, projection, batch_size=DataAccessConfig.MongoDB.CURSOR_BATCH_SIZE
+        )
+        batch = []
+        async for document in cursor:
+            batch.append(document)
+            if len(batch) >= DataAccessConfig.MongoDB.CURSOR_BATCH_SIZE:
+                for hydrated_document in await self.hydrate(batch, projection):
+                    yield hydrated_document
+                batch = []
+        for hydrated_document in await self.hydrate(batch, projection):
+            yield hydrated_document
+
+    async def hydrate(self, documents: List[Dict], projection: Dict) -> List[Dict]:
+        """
+        Replaces the compacted documents among corporate documents by their full documents.
+
+        Documents that hold their contents are returned as they are, without a query.
+
+        Args:
+            documents (List[Dict]): The documents, read with the projection.
+            projection (Dict): The projection the documents were read with.
+
+        Returns:
+            List[Dict]: The full documents, in the same order.
+        """
+        content_refs = MongoConnection.get_content_refs(documents)
+        if not content_refs:
+            return documents
+
+        cursor = AsyncMongoConnection(DataAccessConstants.MongoDB.CollectionNames.CORPORATE_CONTENTS).collection.find(
+            {"_id": {"$in": content_refs}}, {"document": 1}
+        )
+        contents = {content["_id"]: content["document"] async for content in cursor}
+        return MongoConnection.merge_contents(documents, contents, projection)
+
+    async def get_latest_completed_job_id(self) -> Union[None, str]:
+        """
+        Retrieves the ID of the most recently created completed job.
+
+        The lookup is served by the (status, created_at) index and cached in-process for
+        DataAccessConfig.MongoDB.LATEST_JOB_CACHE_TTL seconds, in the cache of MongoConnection.
+
+        Returns:
+            Union[None, str]: The job ID, None if no job is completed.
+        """
+        job_id, expires_at = MongoConnection.latest_completed_job_cache
+        if time.monotonic() < expires_at:
+            return job_id
+
+        return MongoConnection.cache_latest_completed_job(
+            await self.collection.find_one(**MongoConnection.LATEST_COMPLETED_JOB_QUERY)
+        )
+
+    async def get_job_progress(self, job_id: str) -> Optional[Dict]:
+        """
+        Retrieves the progress fields of a job with a single projected read.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Optional[Dict]: The counter, total corporate count, status, created_at and completed_at
+                            of the job, None if no document is found.
+        """
+        return await self.collection.find_one(
+            {"job_id": job_id},
+            {"_id": 0, "counter": 1, "total_corporate_count": 1, "status": 1, "created_at": 1, "completed_at": 1}
+        )
+
+    async def fetch_by_ids(self, job_id: str, corporate_ids: List[str]) -> List[Dict]:
+        """
+        Fetches the raw documents of the given corporate IDs stored under a job.
+
+        Args:
+            job_id (str): The job ID the documents are stored under.
+            corporate_ids (List[str]): The corporate IDs to fetch.
+
+        Returns:
+            List[Dict]: The documents, without their _id.
+        """
+        projection = {"_id": 0}
+        cursor = self.collection.find({"job_id": job_id, "id": {"$in": corporate_ids}}, projection)
+        return await self.hydrate(await cursor.to_list(length=None), projection)
+
+    async def iter_changed_ids(self, job_id: str, other_job_id: str) -> AsyncIterator[Dict]:
+        """
+        Iterates the corporates added, removed or changed between two jobs, compared inside MongoDB.
+
+        The aggregation reads only the ID and content hash of the corporates of both jobs from
+        the (job_id, id, content_hash) index, without fetching their documents, and groups them
+        by corporate ID. Corporates stored under one job
+        only, or under both with different content hashes, are returned. Corporates stored without
+        a content hash count as changed.
+
+        Args:
+            job_id (str): The job ID compared from.
+            other_job_id (str): The job ID compared to.
+
+        Returns:
+            AsyncIterator[Dict]: Documents of the corporate ID (_id) and the jobs holding it (jobs), by ID.
+        """
+        pipeline = [
+            {"$match": {"job_id": {"$in": [job_id, other_job_id]}}},
+            {"$project": {"_id": 0, "id": 1, "content_hash": 1, "job_id": 1}},
+            {"$group": {
+                "_id": "$id",
+                "jobs": {"$addToSet": "$job_id"},
+                "hashes": {"$addToSet": {"$ifNull": ["$content_hash", "$job_id"]}},
+            }},
+            {"$match": {"$or": [{"jobs": {"$size": 1}}, {"hashes": {"$size": 2}}]}},
+            {"$project": {"jobs": 1}},
+            {"$sort": {"_id": ASCENDING}},
+        ]
+        async for document in self.collection.aggregate(
+            pipeline, allowDiskUse=True, batchSize=DataAccessConfig.MongoDB.CURSOR_BATCH_SIZE
+        ):
+            yield document
+
+    async def get_cached_response(self, key: str) -> Optional[Dict]:
+        """
+        Retrieves an unexpired cached response.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[Dict]: The cached response ({body, etag, next_cursor, expires_at}), None on a miss.
+        """
+        return await self.collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}}, {"_id": 0})
+
+    async def set_cached_response(self, key: str, response: Dict) -> None:
+        """
+        Stores a cached response, replacing an earlier one under the same key.
+
+        Args:
+            key (str): The cache key.
+            response (Dict): The cached response ({body, etag, next_cursor, expires_at}).
+        """
+        await self.collection.replace_one({"_id": key}, response, upsert=True)
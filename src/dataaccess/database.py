@@ -1,14 +1,50 @@
+from collections import Counter
+from datetime import datetime
 from loguru import logger
-from pymongo import MongoClient, ASCENDING, DESCENDING
-from typing import Dict, List, Union
-from bson import json_util
+from pymongo import MongoClient, ReplaceOne, ReturnDocument, UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure, PyMongoError
+from typing import Dict, List, Optional, Set, Tuple, Union
+from bson import ObjectId, json_util
 import json
+import os
+import threading
+import time
 
 from src.configs.dataaccess import DataAccessConfig
 from src.constants.dataaccess import DataAccessConstants
+from src.monitoring.metrics import mongo_command_metrics
 from src.schemas.corporates import Corporate
 
 
+class CorporatesNotStoredError(PyMongoError):
+    """
+    Raised when a bulk of corporate upserts failed for some corporates.
+
+    Attributes:
+        stored_counts (Dict[str, int]): The number of corporates newly stored by the bulk, by job ID.
+        errors (List[Dict]): The write errors of the corporates that were not stored.
+    """
+
+    def __init__(self, stored_counts: Dict[str, int], errors: List[Dict]):
+        super().__init__(f"{len(errors)} corporates could not be stored: {errors}")
+        self.stored_counts = stored_counts
+        self.errors = errors
+
+
+class BufferedWrite:
+    """
+    The corporate documents written by one flush of the write buffer.
+
+    Attributes:
+        flushed (threading.Event): Set once the documents were written, or failed to be.
+        error (Exception): The error of the flush, if it failed.
+    """
+
+    def __init__(self):
+        self.flushed = threading.Event()
+        self.error = None
+
+
 class MongoConnection:
     """
     A class for managing MongoDB connections and operations.
@@ -21,18 +57,73 @@ class MongoConnection:
     Methods:
         connect: Establishes a MongoDB connection.
         disconnect: Closes the MongoDB connection.
-        get_collection: Retrieves a MongoDB collection and sets up indices.
+        get_collection: Retrieves a cached MongoDB collection handle.
+        ensure_indices: Sets up the indices of every collection once at startup.
         setup_indices: Sets up indices for a specified collection based on its name.
+        remove_duplicate_corporates: Deletes corporates stored more than once under a job.
         insert_one: Inserts a single document into the collection.
-        search: Searches for documents matching criteria in the collection.
-        fetch_by_job_id: Fetches documents by job ID.
+        page_query: Restricts a query to the documents after a pagination cursor.
+        limit_page: Sorts and limits a cursor to a page.
+        to_page: Builds a page and the cursor of the next page from its documents.
+        build_projection: Builds the projection of a query.
+        hydrate: Replaces compacted documents by their full documents.
+        get_content_refs: Retrieves the references to shared contents of compacted documents.
+        merge_contents: Merges the shared contents into compacted documents.
+        project: Applies a projection to a document in memory.
         get_latest_completed_job_id: Retrieves the latest completed job ID.
-        increment_counter: Increments a counter field in a document.
+        cache_latest_completed_job: Caches the latest completed job ID.
+        invalidate_latest_completed_job: Drops the cached latest completed job ID.
+        increment_counter: Increments a counter field in a document and completes the job at its total.
+        mark_completed: Marks a job completed.
+        backfill_job_status: Sets the status of jobs created before jobs carried one.
+        set_total_corporate_count: Replaces the total of a job and completes it at its counter.
+        raise_counter: Raises the counter of a job to a recounted value and completes it at its total.
         get_counter_and_total_value: Retrieves the counter and total values from a document.
+        get_job: Retrieves the document of a job.
         is_job_id_exist: Checks if a job ID exists in the collection.
+        fetch_by_ids: Fetches the raw documents of given corporate IDs in a job.
+        get_fingerprints: Retrieves the stored fingerprints of given corporate IDs.
+        upsert_fingerprints: Stores the fingerprints of corporates with the job holding them.
+        buffer_corporates: Stores corporate documents through the write-behind buffer.
+        upsert_corporates: Stores corporate documents once per (job_id, id).
+        count_by_job: Counts documents by job ID.
+        flush_buffer: Writes the buffered corporate documents and wakes up their callers.
+        write_corporates: Bulk upserts corporate documents and advances job counters.
+        increment_counters: Advances the counters of several jobs.
+        get_stored_ids: Retrieves the IDs of the corporates stored under a job.
+        count_by_job_id: Counts the documents of a job.
+        record_enumerated: Stores the corporate IDs listed for a job with their fingerprints.
+        get_enumerated: Retrieves the corporate IDs listed for a job with their fingerprints.
+        mark_unresolvable: Marks listed corporates whose details could not be fetched.
+        get_unresolvable_ids: Retrieves the IDs of the listed corporates marked unresolvable.
+        record_listing_page: Checkpoints a listing page whose batch tasks are created.
+        get_checkpoints: Retrieves the checkpoints of the listings of a job.
+        list_jobs: Retrieves the jobs with a status, newest first.
+        mark_expired: Marks a job expired, to be deleted by the retention policy.
+        mark_compacted: Marks a job compacted.
+        claim_job: Atomically claims a job for a retention run.
+        delete_by_job_id: Deletes every document of a job.
+        delete_corporates_batch: Deletes a batch of corporate documents of a job.
+        find_uncompacted: Retrieves a batch of corporate documents of a job that hold their contents.
+        replace_with_references: Replaces corporate documents by references to shared contents.
+        acquire_contents: Stores shared contents once, with the jobs referencing them.
+        release_contents: Drops references to shared contents, deleting unreferenced ones.
     """
 
     client = None
+    collections = {}
+    collections_client = None
+    latest_completed_job_cache = (None, 0.0)
+    LATEST_COMPLETED_JOB_QUERY = {
+        "filter": {"status": DataAccessConstants.MongoDB.JobStatus.COMPLETED},
+        "projection": {"job_id": 1},
+        "sort": [("created_at", DESCENDING)],
+    }
+    write_buffer = []
+    write_buffer_write = BufferedWrite()
+    write_buffer_lock = threading.Lock()
+    write_buffer_flushed_at = time.monotonic()
+    write_buffer_flusher_pid = None
 
     def __init__(self, collection_name):
         """
@@ -47,8 +138,10 @@ class MongoConnection:
 
     @staticmethod
     def connect():
-        """Creates MongoDB client instance."""
-        MongoConnection.client = MongoClient(DataAccessConfig.MongoDB.CONNECTION_STRING)
+        """Creates MongoDB client instance, timing every command for the metrics."""
+        MongoConnection.client = MongoClient(
+            DataAccessConfig.MongoDB.CONNECTION_STRING, event_listeners=[mongo_command_metrics]
+        )
 
     @staticmethod
     def disconnect():
@@ -56,6 +149,23 @@ class MongoConnection:
         if MongoConnection.client:
             MongoConnection.client.close()
 
+    @staticmethod
+    def ensure_indices():
+        """
+        Sets up the indices of every collection.
+
+        Index creation is idempotent, so this runs once per process at startup
+        (FastAPI startup event, Celery worker_init) instead of on every instantiation.
+        """
+        database = MongoConnection.client[DataAccessConfig.MongoDB.DB_NAME]
+        collection_names = DataAccessConstants.MongoDB.CollectionNames
+        for collection_name in (collection_names.JOB, collection_names.CORPORATES, collection_names.FINGERPRINTS,
+                                collection_names.RESPONSE_CACHE, collection_names.CHECKPOINTS,
+                                collection_names.ENUMERATED_CORPORATES):
+            MongoConnection.setup_indices(database.get_collection(collection_name), collection_name)
+        MongoConnection.backfill_job_status()
+        logger.info("MongoDB indices are set up")
+
     @staticmethod
     def setup_indices(collection, collection_name):
         """
@@ -68,17 +178,55 @@ class MongoConnection:
         if collection_name == DataAccessConstants.MongoDB.CollectionNames.JOB:
             collection.create_index([("job_id", ASCENDING)])
             collection.create_index([("created_at", DESCENDING)])
+            collection.create_index([("status", ASCENDING), ("created_at", DESCENDING)])
         elif collection_name == DataAccessConstants.MongoDB.CollectionNames.CORPORATES:
             collection.create_index([("job_id", ASCENDING)])
-            collection.create_index([
-                ('name', 'text'),
-                ('hq_city', 'text'),
-                ('hq_country', 'text')
-            ], name='text')
+            try:
+                collection.create_index([("job_id", ASCENDING), ("id", ASCENDING)], unique=True)
+            except OperationFailure as ex:
+                if ex.code == DataAccessConstants.MongoDB.DUPLICATE_KEY_ERROR_CODE:
+                    logger.error("Duplicate corporates keep the unique (job_id, id) index from being created, "
+                                 "remove them once with `python -m src.dataaccess.migrations`")
+                raise
+            collection.create_index([("job_id", ASCENDING), ("id", ASCENDING), ("content_hash", ASCENDING)])
+            if "text" in collection.index_information():
+                collection.drop_index("text")
+        elif collection_name == DataAccessConstants.MongoDB.CollectionNames.FINGERPRINTS:
+            collection.create_index([("id", ASCENDING)], unique=True)
+        elif collection_name == DataAccessConstants.MongoDB.CollectionNames.RESPONSE_CACHE:
+            collection.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+        elif collection_name == DataAccessConstants.MongoDB.CollectionNames.CHECKPOINTS:
+            collection.create_index([("job_id", ASCENDING), ("listing", ASCENDING)], unique=True)
+        elif collection_name == DataAccessConstants.MongoDB.CollectionNames.ENUMERATED_CORPORATES:
+            collection.create_index([("job_id", ASCENDING), ("id", ASCENDING)], unique=True)
+
+    @staticmethod
+    def remove_duplicate_corporates(collection) -> int:
+        """
+        Deletes the corporates stored more than once under a job, keeping the first stored document.
+
+        Jobs crawled before corporates were upserted on (job_id, id) may hold duplicates, which
+        keep the unique (job_id, id) index from being created. This is a one-off migration run by
+        `python -m src.dataaccess.migrations`, never at startup.
+
+        Args:
+            collection (Collection): The corporates collection.
+
+        Returns:
+            int: The number of deleted documents.
+        """
+        duplicates = collection.aggregate([
+            {"$group": {"_id": {"job_id": "$job_id", "id": "$id"}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ], allowDiskUse=True)
+        removed_count = 0
+        for duplicate in duplicates:
+            removed_count += collection.delete_many({"_id": {"$in": sorted(duplicate["ids"])[1:]}}).deleted_count
+        return removed_count
 
     def get_collection(self, collection_name):
         """
-        Retrieves a MongoDB collection and sets up indices based on the collection name.
+        Retrieves a MongoDB collection handle, cached per process for the current client.
 
         Args:
             collection_name (str): The name of the collection to retrieve.
@@ -86,8 +234,14 @@ class MongoConnection:
         Returns:
             Collection: The MongoDB collection.
         """
-        collection = self.database.get_collection(collection_name)
-        self.setup_indices(collection, collection_name)
+        if MongoConnection.collections_client is not self.client:
+            MongoConnection.collections = {}
+            MongoConnection.collections_client = self.client
+
+        collection = MongoConnection.collections.get(collection_name)
+        if collection is None:
+            collection = self.database.get_collection(collection_name)
+            MongoConnection.collections[collection_name] = collection
         return collection
 
     def insert_one(self, item: Dict) -> None:
@@ -104,39 +258,218 @@ class MongoConnection:
         """
         self.collection.insert_one(item)
 
-    def search(self, job_id: str, keyword: str, excluded_fields: List[str]) -> List[Corporate]:
+    @staticmethod
+    def page_query(query: Dict, after: Optional[str] = None) -> Dict:
+        """
+        Restricts a query to the documents after a pagination cursor.
+
+        Args:
+            query (Dict): The filter of the query.
+            after (str, optional): Only documents with an _id greater than this cursor are kept.
+
+        Returns:
+            Dict: The filter of the page.
+        """
+        if after is None:
+            return query
+        return {**query, "_id": {"$gt": ObjectId(after)}}
+
+    @staticmethod
+    def limit_page(cursor, limit: Optional[int] = None):
+        """
+        Sorts a pymongo or Motor cursor on _id and limits it to a page, without a limit it is left as it is.
+
+        Args:
+            cursor (Cursor): The cursor of the query.
+            limit (int, optional): The maximum number of documents of the page.
+
+        Returns:
+            Cursor: The cursor of the page.
+        """
+        if limit is None:
+            return cursor
+        return cursor.sort("_id", ASCENDING).limit(limit)
+
+    @staticmethod
+    def to_page(documents: List[Dict], limit: Optional[int] = None, raw: bool = False,
+                fields: Optional[List[str]] = None) -> Tuple[List[Union[Corporate, Dict]], Optional[str]]:
+        """
+        Builds a page from the documents read for it.
+
+        Documents read with a projection of fields stay raw, since a Corporate built from them
+        would hold the defaults of the fields that were not read.
+
+        Args:
+            documents (List[Dict]): The hydrated documents of the page.
+            limit (int, optional): The maximum number of documents of the page.
+            raw (bool): Returns the raw documents instead of validating them into Corporate.
+            fields (List[str], optional): The fields the documents were read with.
+
+        Returns:
+            Tuple[List[Union[Corporate, Dict]], Optional[str]]: The documents and the cursor of the next page,
+                                                               None when there is no next page.
+        """
+        next_cursor = None
+        if limit is not None and len(documents) == limit:
+            next_cursor = str(documents[-1]["_id"])
+        if raw or fields:
+            return documents, next_cursor
+        return [Corporate(**json.loads(json_util.dumps(doc))) for doc in documents], next_cursor
+
+    @staticmethod
+    def build_projection(excluded_fields: List[str], fields: Optional[List[str]] = None, keep_id: bool = False) -> Dict:
+        """
+        Builds the projection of a query.
+
+        The reference to the shared contents of a compacted document is always kept, so the
+        document can be hydrated.
+
+        Args:
+            excluded_fields (List[str]): Fields never returned.
+            fields (List[str], optional): Only these fields are returned when given.
+            keep_id (bool): Whether _id is returned, e.g. to build a pagination cursor.
+
+        Returns:
+            Dict: The MongoDB projection.
+        """
+        if fields:
+            projection = {field: 1 for field in fields if field not in excluded_fields}
+            projection["_id"] = 1 if keep_id else 0
+            projection[DataAccessConstants.MongoDB.CONTENT_REF_FIELD] = 1
+            return projection
+
+        projection = {field: 0 for field in excluded_fields}
+        if keep_id:
+            projection.pop("_id", None)
+        return projection
+
+    def hydrate(self, documents: List[Dict], projection: Dict) -> List[Dict]:
+        """
+        Replaces the compacted documents among corporate documents by their full documents.
+
+        Documents that hold their contents are returned as they are, without a query.
+
+        Args:
+            documents (List[Dict]): The documents, read with the projection.
+            projection (Dict): The projection the documents were read with.
+
+        Returns:
+            List[Dict]: The full documents, in the same order.
+        """
+        content_refs = MongoConnection.get_content_refs(documents)
+        if not content_refs:
+            return documents
+
+        contents = MongoConnection(DataAccessConstants.MongoDB.CollectionNames.CORPORATE_CONTENTS).collection.find(
+            {"_id": {"$in": content_refs}}, {"document": 1}
+        )
+        return MongoConnection.merge_contents(
+            documents, {content["_id"]: content["document"] for content in contents}, projection
+        )
+
+    @staticmethod
+    def get_content_refs(documents: List[Dict]) -> List[str]:
+        """Returns the references to shared contents of the compacted documents among documents."""
+        return [
+            document[DataAccessConstants.MongoDB.CONTENT_REF_FIELD] for document in documents
+            if DataAccessConstants.MongoDB.CONTENT_REF_FIELD in document
+        ]
+
+    @staticmethod
+    def merge_contents(documents: List[Dict], contents: Dict[str, Dict], projection: Dict) -> List[Dict]:
+        """
+        Merges the shared contents into the compacted documents among documents.
+
+        Args:
+            documents (List[Dict]): The documents, read with the projection.
+            contents (Dict[str, Dict]): The shared contents by content hash.
+            projection (Dict): The projection the documents were read with.
+
+        Returns:
+            List[Dict]: The full documents, in the same order.
+        """
+        merged_documents = []
+        for document in documents:
+            content_ref = document.get(DataAccessConstants.MongoDB.CONTENT_REF_FIELD)
+            if content_ref is None:
+                merged_documents.append(document)
+                continue
+
+            merged = {key: value for key, value in document.items() if key != DataAccessConstants.MongoDB.CONTENT_REF_FIELD}
+            content = contents.get(content_ref)
+            if content is None:
+                logger.error(f"The shared contents {content_ref} of corporate {document.get('id')} are missing")
+            else:
+                merged.update(MongoConnection.project(content, projection))
+            merged_documents.append(merged)
+        return merged_documents
+
+    @staticmethod
+    def project(document: Dict, projection: Dict) -> Dict:
+        """
+        Applies an inclusion or exclusion projection to a document in memory.
 
-        query = {
-            "$text": {"$search": f"{keyword}"},
-            "job_id": job_id
-        }
-        excluded_fields = {field: 0 for field in excluded_fields}
-        search_results = self.collection.find(query, excluded_fields)
-        return [Corporate(**json.loads(json_util.dumps(doc))) for doc in search_results]
+        Args:
+            document (Dict): The document.
+            projection (Dict): The MongoDB projection.
 
-    def fetch_by_job_id(self, job_id, excluded_fields: List[str]) -> List[Corporate]:
-        excluded_fields = {field: 0 for field in excluded_fields}
-        documents = self.collection.find({"job_id": job_id}, excluded_fields)
-        return [Corporate(**json.loads(json_util.dumps(doc))) for doc in documents]
+        Returns:
+            Dict: The projected document.
+        """
+        included_fields = {field for field, value in projection.items() if value and field != "_id"}
+        if included_fields:
+            return {key: value for key, value in document.items() if key in included_fields}
+        return {key: value for key, value in document.items() if projection.get(key, 1)}
 
     def get_latest_completed_job_id(self) -> Union[None, str]:
-        query = {"$expr": {"$eq": ["$counter", "$total_corporate_count"]}}
-        sort_order = [("created_at", -1)]
+        """
+        Retrieves the ID of the most recently created completed job.
+
+        The lookup is served by the (status, created_at) index and cached in-process for
+        DataAccessConfig.MongoDB.LATEST_JOB_CACHE_TTL seconds. Completing a job in this
+        process invalidates the cache right away.
+
+        Returns:
+            Union[None, str]: The job ID, None if no job is completed.
+        """
+        job_id, expires_at = MongoConnection.latest_completed_job_cache
+        if time.monotonic() < expires_at:
+            return job_id
+
+        return MongoConnection.cache_latest_completed_job(
+            self.collection.find_one(**MongoConnection.LATEST_COMPLETED_JOB_QUERY)
+        )
+
+    @staticmethod
+    def cache_latest_completed_job(latest_document: Optional[Dict]) -> Optional[str]:
+        """
+        Caches the latest completed job for DataAccessConfig.MongoDB.LATEST_JOB_CACHE_TTL seconds.
 
-        latest_document = self.collection.find_one(query, sort=sort_order)
-        if latest_document is None:
-            return None
+        Args:
+            latest_document (Dict, optional): The job found by LATEST_COMPLETED_JOB_QUERY, None if no job is completed.
 
-        latest_completed_job_id = latest_document.get("job_id")
+        Returns:
+            Optional[str]: The job ID.
+        """
+        latest_completed_job_id = latest_document.get("job_id") if latest_document else None
+        MongoConnection.latest_completed_job_cache = (
+            latest_completed_job_id, time.monotonic() + DataAccessConfig.MongoDB.LATEST_JOB_CACHE_TTL
+        )
         return latest_completed_job_id
 
-    def increment_counter(self, job_id, increment_value=1) -> None:
+    @staticmethod
+    def invalidate_latest_completed_job() -> None:
+        """Drops the cached latest completed job ID."""
+        MongoConnection.latest_completed_job_cache = (None, 0.0)
+
+    def increment_counter(self, job_id, increment_value=1) -> bool:
         """
         Increments a 'counter' field in a document identified by a specific job ID.
 
         This method increases the value of the 'counter' field in the document that matches
-        the given job ID. The increment value is configurable. It includes error handling to
-        catch and log any issues during the update process.
+        the given job ID. The increment value is configurable. When the counter reaches the
+        total corporate count, the job is marked completed in the same call; the conditional
+        update guarantees that exactly one caller completes it.
 
         Args:
             job_id (str): The job ID of the document to be updated.
@@ -144,12 +477,94 @@ class MongoConnection:
                                              Defaults to 1.
 
         Returns:
-            None: This method does not return anything.
+            bool: True if this increment completed the job, False otherwise.
         """
-        self.collection.update_one(
+        job = self.collection.find_one_and_update(
             {"job_id": job_id},
-            {"$inc": {"counter": increment_value}}
+            {"$inc": {"counter": increment_value}},
+            projection={"counter": 1, "total_corporate_count": 1, "status": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if job is None or job["counter"] < job["total_corporate_count"]:
+            return False
+        return self.mark_completed(job_id)
+
+    def set_total_corporate_count(self, job_id: str, total_corporate_count: int) -> bool:
+        """
+        Replaces the total corporate count of a job, completing it if the counter already reached it.
+
+        Args:
+            job_id (str): The job ID of the document to be updated.
+            total_corporate_count (int): The new total corporate count.
+
+        Returns:
+            bool: True if this update completed the job, False otherwise.
+        """
+        job = self.collection.find_one_and_update(
+            {"job_id": job_id},
+            {"$set": {"total_corporate_count": total_corporate_count}},
+            projection={"counter": 1, "total_corporate_count": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if job is None or job["counter"] < job["total_corporate_count"]:
+            return False
+        return self.mark_completed(job_id)
+
+    def raise_counter(self, job_id: str, counter: int) -> bool:
+        """
+        Raises the counter of a job to a recounted value, completing it if the counter reached the total.
+
+        The counter is never lowered, so increments that land after the recount are not lost.
+
+        Args:
+            job_id (str): The job ID of the document to be updated.
+            counter (int): The recounted number of stored corporates.
+
+        Returns:
+            bool: True if this update completed the job, False otherwise.
+        """
+        job = self.collection.find_one_and_update(
+            {"job_id": job_id},
+            {"$max": {"counter": counter}},
+            projection={"counter": 1, "total_corporate_count": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if job is None or job["counter"] < job["total_corporate_count"]:
+            return False
+        return self.mark_completed(job_id)
+
+    def mark_completed(self, job_id: str) -> bool:
+        """
+        Marks a job completed unless it already is.
+
+        Args:
+            job_id (str): The job ID of the document to be updated.
+
+        Returns:
+            bool: True if the job was marked completed by this call, False otherwise.
+        """
+        result = self.collection.update_one(
+            {"job_id": job_id, "status": {"$ne": DataAccessConstants.MongoDB.JobStatus.COMPLETED}},
+            {"$set": {"status": DataAccessConstants.MongoDB.JobStatus.COMPLETED, "completed_at": datetime.now()}}
         )
+        if not result.modified_count:
+            return False
+
+        MongoConnection.invalidate_latest_completed_job()
+        logger.info(f"Job {job_id} is completed")
+        return True
+
+    @staticmethod
+    def backfill_job_status() -> None:
+        """Sets the status of jobs created before jobs carried one."""
+        collection = MongoConnection(DataAccessConstants.MongoDB.CollectionNames.JOB).collection
+        jobs = collection.find({"status": {"$exists": False}}, {"counter": 1, "total_corporate_count": 1})
+        for job in jobs:
+            if job.get("counter", 0) >= job.get("total_corporate_count", 0):
+                status = DataAccessConstants.MongoDB.JobStatus.COMPLETED
+            else:
+                status = DataAccessConstants.MongoDB.JobStatus.RUNNING
+            collection.update_one({"_id": job["_id"]}, {"$set": {"status": status}})
 
     def get_counter_and_total_value(self, job_id):
         """
@@ -178,6 +593,18 @@ class MongoConnection:
             logger.error(f"An error occurred: {e}")
             return None, None
 
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """
+        Retrieves the document of a job.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Optional[Dict]: The job document without its _id, None if there is no such job.
+        """
+        return self.collection.find_one({"job_id": job_id}, {"_id": 0})
+
     def does_job_id_exist(self, job_id: str) -> bool:
         """
         Checks if a given job ID exists in the collection.
@@ -192,3 +619,511 @@ class MongoConnection:
             bool: True if a document with the given job ID exists, False otherwise.
         """
         return self.collection.find_one({'job_id': job_id}) is not None
+
+    def fetch_by_ids(self, job_id: str, corporate_ids: List[str]) -> List[Dict]:
+        """
+        Fetches the raw documents of the given corporate IDs stored under a job.
+
+        Args:
+            job_id (str): The job ID the documents are stored under.
+            corporate_ids (List[str]): The corporate IDs to fetch.
+
+        Returns:
+            List[Dict]: The documents, without their _id.
+        """
+        projection = {"_id": 0}
+        return self.hydrate(list(self.collection.find({"job_id": job_id, "id": {"$in": corporate_ids}}, projection)), projection)
+
+    def get_fingerprints(self, corporate_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Retrieves the stored fingerprints of the given corporate IDs.
+
+        Args:
+            corporate_ids (List[str]): The corporate IDs to look up.
+
+        Returns:
+            Dict[str, Dict]: The fingerprint documents ({id, fingerprint, job_id}) by corporate ID.
+        """
+        documents = self.collection.find({"id": {"$in": corporate_ids}}, {"_id": 0})
+        return {document["id"]: document for document in documents}
+
+    def upsert_fingerprints(self, fingerprints: Dict[str, str], job_id: str) -> None:
+        """
+        Stores the fingerprints of corporates together with the job that holds their documents.
+
+        Args:
+            fingerprints (Dict[str, str]): Fingerprints by corporate ID.
+            job_id (str): The job ID the corporate documents are stored under.
+        """
+        if not fingerprints:
+            return
+        self.collection.bulk_write([
+            UpdateOne({"id": corporate_id}, {"$set": {"fingerprint": fingerprint, "job_id": job_id}}, upsert=True)
+            for corporate_id, fingerprint in fingerprints.items()
+        ], ordered=False)
+
+    @staticmethod
+    def buffer_corporates(items: List[Dict]) -> None:
+        """
+        Stores validated corporate documents through the write-behind buffer of the process.
+
+        Without a DataAccessConfig.MongoDB.WRITE_BUFFER_SIZE the documents are written right away.
+        Otherwise the buffer is flushed once it holds WRITE_BUFFER_SIZE documents, or by a
+        background thread once DataAccessConfig.MongoDB.WRITE_BUFFER_FLUSH_INTERVAL seconds passed
+        since the last flush. Either way the call returns once its documents are written, so a
+        task is never acknowledged with documents only held in memory, and it raises the error
+        of the flush that wrote them.
+
+        Args:
+            items (List[Dict]): The corporate documents to be inserted, each with its job_id.
+        """
+        if DataAccessConfig.MongoDB.WRITE_BUFFER_SIZE <= 0:
+            MongoConnection.write_corporates(items)
+            return
+
+        MongoConnection.start_buffer_flusher()
+        with MongoConnection.write_buffer_lock:
+            MongoConnection.write_buffer.extend(items)
+            buffered_write = MongoConnection.write_buffer_write
+            is_full = len(MongoConnection.write_buffer) >= DataAccessConfig.MongoDB.WRITE_BUFFER_SIZE
+
+        if is_full:
+            MongoConnection.flush_buffer(raise_errors=False)
+        buffered_write.flushed.wait()
+        if buffered_write.error is not None:
+            raise buffered_write.error
+
+    def upsert_corporates(self, items: List[Dict]) -> Dict[str, int]:
+        """
+        Stores corporate documents with one unordered bulk of upserts keyed on (job_id, id).
+
+        A corporate already stored under its job, e.g. by a redelivered task or because it is
+        listed in two cities, is left as it is and not counted again.
+
+        Args:
+            items (List[Dict]): The corporate documents, each with its job_id.
+
+        Returns:
+            Dict[str, int]: The number of newly stored corporates by job ID.
+
+        Raises:
+            CorporatesNotStoredError: If some corporates failed for another reason than being
+                                      stored already. It carries the counts of those stored.
+        """
+        if not items:
+            return {}
+
+        operations = [
+            UpdateOne({"job_id": item["job_id"], "id": item["id"]}, {"$setOnInsert": item}, upsert=True)
+            for item in items
+        ]
+        try:
+            upserted_indices = list(self.collection.bulk_write(operations, ordered=False).upserted_ids)
+        except BulkWriteError as ex:
+            upserted_indices = [upserted["index"] for upserted in ex.details.get("upserted", [])]
+            errors = [
+                error for error in ex.details.get("writeErrors", [])
+                if error.get("code") != DataAccessConstants.MongoDB.DUPLICATE_KEY_ERROR_CODE
+            ]
+            if errors:
+                logger.error(f"{len(errors)} of {len(items)} corporates could not be stored: {errors}")
+                raise CorporatesNotStoredError(MongoConnection.count_by_job(items, upserted_indices), errors) from ex
+
+        return MongoConnection.count_by_job(items, upserted_indices)
+
+    @staticmethod
+    def count_by_job(items: List[Dict], indices: List[int]) -> Dict[str, int]:
+        """Counts the documents at the given indices by job ID."""
+        return dict(Counter(items[index]["job_id"] for index in indices))
+
+    @staticmethod
+    def flush_buffer(raise_errors: bool = True) -> int:
+        """
+        Writes the buffered corporate documents and wakes up the callers waiting for them.
+
+        Args:
+            raise_errors (bool, optional): Raises the error of a failed write. The error is
+                                           raised in the waiting callers either way.
+
+        Returns:
+            int: The number of newly stored documents.
+        """
+        with MongoConnection.write_buffer_lock:
+            items = MongoConnection.write_buffer
+            buffered_write = MongoConnection.write_buffer_write
+            MongoConnection.write_buffer = []
+            MongoConnection.write_buffer_write = BufferedWrite()
+            MongoConnection.write_buffer_flushed_at = time.monotonic()
+
+        try:
+            stored_count = MongoConnection.write_corporates(items)
+        except Exception as ex:
+            logger.error(f"An error occurred while flushing the write buffer: {ex}")
+            buffered_write.error = ex
+            if raise_errors:
+                raise
+            return 0
+        finally:
+            buffered_write.flushed.set()
+
+        if items:
+            logger.info(f"Flushed {len(items)} buffered corporates, {stored_count} of them new")
+        return stored_count
+
+    @staticmethod
+    def write_corporates(items: List[Dict]) -> int:
+        """
+        Bulk upserts corporate documents and advances the job counters.
+
+        Documents are written with MongoConnection.upsert_corporates, and every job counter is
+        incremented once by the number of its corporates that were not stored before, so the
+        counter counts distinct corporates and can not pass the job total. Corporates stored by
+        a bulk that failed for others are counted before the error is raised.
+
+        Args:
+            items (List[Dict]): The corporate documents, each with its job_id.
+
+        Returns:
+            int: The number of newly stored documents.
+        """
+        if not items:
+            return 0
+
+        try:
+            stored_counts = MongoConnection(DataAccessConstants.MongoDB.CollectionNames.CORPORATES).upsert_corporates(items)
+        except CorporatesNotStoredError as ex:
+            MongoConnection.increment_counters(ex.stored_counts)
+            raise
+
+        MongoConnection.increment_counters(stored_counts)
+        return sum(stored_counts.values())
+
+    @staticmethod
+    def increment_counters(stored_counts: Dict[str, int]) -> None:
+        """Increments the counter of every job by its number of newly stored corporates."""
+        job_connection = MongoConnection(DataAccessConstants.MongoDB.CollectionNames.JOB)
+        for job_id, count in stored_counts.items():
+            job_connection.increment_counter(job_id, count)
+
+    @staticmethod
+    def start_buffer_flusher() -> None:
+        """Starts the background thread that flushes the buffer on time, once per process."""
+        if MongoConnection.write_buffer_flusher_pid == os.getpid():
+            return
+
+        MongoConnection.write_buffer_flusher_pid = os.getpid()
+        threading.Thread(target=MongoConnection.flush_buffer_periodically, daemon=True).start()
+
+    @staticmethod
+    def flush_buffer_periodically() -> None:
+        """Flushes the buffer whenever the flush interval has passed since the last flush."""
+        interval = DataAccessConfig.MongoDB.WRITE_BUFFER_FLUSH_INTERVAL
+        while True:
+            time.sleep(interval / 2)
+            if MongoConnection.write_buffer and time.monotonic() - MongoConnection.write_buffer_flushed_at >= interval:
+                MongoConnection.flush_buffer(raise_errors=False)
+
+    def get_stored_ids(self, job_id: str) -> Set[str]:
+        """
+        Retrieves the IDs of the corporates stored under a job, read from the (job_id, id) index.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Set[str]: The corporate IDs.
+        """
+        documents = self.collection.find(
+            {"job_id": job_id}, {"_id": 0, "id": 1}, batch_size=DataAccessConfig.MongoDB.CURSOR_BATCH_SIZE
+        )
+        return {document["id"] for document in documents}
+
+    def count_by_job_id(self, job_id: str) -> int:
+        """
+        Counts the documents of a job.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            int: The number of documents.
+        """
+        return self.collection.count_documents({"job_id": job_id})
+
+    def record_enumerated(self, job_id: str, fingerprints: Dict[str, str]) -> None:
+        """
+        Stores the corporate IDs listed for a job, once per (job_id, id), with their listing fingerprints.
+
+        Args:
+            job_id (str): The job ID the corporates are listed for.
+            fingerprints (Dict[str, str]): Fingerprints by corporate ID.
+        """
+        if not fingerprints:
+            return
+        self.collection.bulk_write([
+            UpdateOne({"job_id": job_id, "id": corporate_id}, {"$set": {"fingerprint": fingerprint}}, upsert=True)
+            for corporate_id, fingerprint in fingerprints.items()
+        ], ordered=False)
+
+    def get_enumerated(self, job_id: str) -> Dict[str, str]:
+        """
+        Retrieves the corporate IDs listed for a job.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Dict[str, str]: The listing fingerprints by corporate ID.
+        """
+        documents = self.collection.find(
+            {"job_id": job_id, "unresolvable": {"$ne": True}}, {"_id": 0, "id": 1, "fingerprint": 1},
+            batch_size=DataAccessConfig.MongoDB.CURSOR_BATCH_SIZE
+        )
+        return {document["id"]: document.get("fingerprint") for document in documents}
+
+    def mark_unresolvable(self, job_id: str, corporate_ids: List[str]) -> int:
+        """
+        Marks listed corporates of a job whose details could not be fetched, so they are not crawled again.
+
+        Args:
+            job_id (str): The job ID the corporates are listed for.
+            corporate_ids (List[str]): The IDs of the unresolvable corporates.
+
+        Returns:
+            int: The number of corporates this call marked, leaving out those marked before.
+        """
+        marked_count = 0
+        for corporate_id in corporate_ids:
+            while True:
+                try:
+                    document = self.collection.find_one_and_update(
+                        {"job_id": job_id, "id": corporate_id},
+                        {"$set": {"unresolvable": True}},
+                        projection={"_id": 0, "unresolvable": 1},
+                        upsert=True,
+                        return_document=ReturnDocument.BEFORE
+                    )
+                except DuplicateKeyError:
+                    continue
+                break
+            if document is None or not document.get("unresolvable"):
+                marked_count += 1
+        return marked_count
+
+    def get_unresolvable_ids(self, job_id: str) -> Set[str]:
+        """
+        Retrieves the IDs of the listed corporates of a job that were marked unresolvable.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Set[str]: The corporate IDs.
+        """
+        documents = self.collection.find({"job_id": job_id, "unresolvable": True}, {"_id": 0, "id": 1})
+        return {document["id"] for document in documents}
+
+    def record_listing_page(self, job_id: str, listing: str, page: int, page_count: int) -> None:
+        """
+        Checkpoints a page of a listing once the batch tasks of its corporates are created.
+
+        Args:
+            job_id (str): The job ID the listing is crawled for.
+            listing (str): The city of the listing, DataAccessConstants.MongoDB.Enumeration.GLOBAL_LISTING
+                           for the listing of all cities.
+            page (int): The completed page.
+            page_count (int): The number of pages of the listing.
+        """
+        self.collection.update_one(
+            {"job_id": job_id, "listing": listing},
+            {"$addToSet": {"pages": page}, "$set": {"page_count": page_count}},
+            upsert=True
+        )
+
+    def get_checkpoints(self, job_id: str) -> Dict[str, Dict]:
+        """
+        Retrieves the checkpoints of the listings of a job.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Dict[str, Dict]: The checkpoints ({page_count, pages}) by listing. Listings without a
+                             completed page have none.
+        """
+        documents = self.collection.find({"job_id": job_id}, {"_id": 0, "listing": 1, "page_count": 1, "pages": 1})
+        return {document["listing"]: document for document in documents}
+
+    def list_jobs(self, status: str) -> List[Dict]:
+        """
+        Retrieves the jobs with a status, newest first, from the (status, created_at) index.
+
+        Args:
+            status (str): The job status.
+
+        Returns:
+            List[Dict]: The job_id, created_at and compacted fields of the jobs.
+        """
+        return list(self.collection.find(
+            {"status": status}, {"_id": 0, "job_id": 1, "created_at": 1, "compacted": 1},
+            sort=[("created_at", DESCENDING)]
+        ))
+
+    def mark_expired(self, job_id: str) -> None:
+        """
+        Marks a job expired, so it is no longer the latest completed job and its deletion is
+        picked up again after an interruption.
+
+        Args:
+            job_id (str): The job ID of the document to be updated.
+        """
+        self.collection.update_one(
+            {"job_id": job_id}, {"$set": {"status": DataAccessConstants.MongoDB.JobStatus.EXPIRED}}
+        )
+        MongoConnection.invalidate_latest_completed_job()
+
+    def mark_compacted(self, job_id: str) -> None:
+        """
+        Marks a job compacted.
+
+        Args:
+            job_id (str): The job ID of the document to be updated.
+        """
+        self.collection.update_one({"job_id": job_id}, {"$set": {"compacted": True}})
+
+    def delete_by_job_id(self, job_id: str) -> int:
+        """
+        Deletes every document of a job.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            int: The number of deleted documents.
+        """
+        return self.collection.delete_many({"job_id": job_id}).deleted_count
+
+    def claim_job(self, job_id: str, query: Dict, claim_field: str, expires_before: datetime) -> bool:
+        """
+        Atomically claims a job for a retention run.
+
+        The claim is the time stored in claim_field. A job matching query is claimed unless
+        another run holds an unexpired claim on it, so a job is deleted or compacted by one run
+        at a time, and a run that died is taken over once its claim expires.
+
+        Args:
+            job_id (str): The job ID to claim.
+            query (Dict): The further conditions the job has to meet, e.g. its status.
+            claim_field (str): The field holding the claim.
+            expires_before (datetime): Claims older than this have expired.
+
+        Returns:
+            bool: True if this call claimed the job, False otherwise.
+        """
+        job = self.collection.find_one_and_update(
+            {
+                **query,
+                "job_id": job_id,
+                "$or": [{claim_field: {"$exists": False}}, {claim_field: {"$lt": expires_before}}],
+            },
+            {"$set": {claim_field: datetime.now()}},
+            projection={"_id": 1}
+        )
+        return job is not None
+
+    def delete_corporates_batch(self, job_id: str, batch_size: int) -> List[Dict]:
+        """
+        Deletes up to batch_size corporate documents of a job.
+
+        After the delete the batch is read again, and only the documents that are gone are
+        returned, so a caller never releases the contents of a document it did not delete.
+
+        Args:
+            job_id (str): The job ID.
+            batch_size (int): The maximum number of documents deleted.
+
+        Returns:
+            List[Dict]: The _id, the content hash and, for compacted documents, the content reference
+                        of the deleted documents.
+        """
+        documents = list(self.collection.find(
+            {"job_id": job_id}, {"_id": 1, "content_hash": 1, DataAccessConstants.MongoDB.CONTENT_REF_FIELD: 1}
+        ).limit(batch_size))
+        if not documents:
+            return []
+
+        document_ids = [document["_id"] for document in documents]
+        self.collection.delete_many({"_id": {"$in": document_ids}})
+        remaining_ids = {document["_id"] for document in self.collection.find({"_id": {"$in": document_ids}}, {"_id": 1})}
+        return [document for document in documents if document["_id"] not in remaining_ids]
+
+    def find_uncompacted(self, job_id: str, batch_size: int) -> List[Dict]:
+        """
+        Retrieves up to batch_size corporate documents of a job that still hold their contents.
+
+        Args:
+            job_id (str): The job ID.
+            batch_size (int): The maximum number of documents returned.
+
+        Returns:
+            List[Dict]: The documents.
+        """
+        return list(self.collection.find(
+            {"job_id": job_id, DataAccessConstants.MongoDB.CONTENT_REF_FIELD: {"$exists": False}}
+        ).limit(batch_size))
+
+    def replace_with_references(self, references: List[Dict]) -> None:
+        """
+        Replaces corporate documents that still hold their contents by references to their shared
+        contents, keeping their _id.
+
+        Args:
+            references (List[Dict]): The reference documents, each with the _id of the document it replaces.
+        """
+        if references:
+            self.collection.bulk_write([
+                ReplaceOne(
+                    {"_id": reference["_id"], DataAccessConstants.MongoDB.CONTENT_REF_FIELD: {"$exists": False}},
+                    reference
+                )
+                for reference in references
+            ], ordered=False)
+
+    def acquire_contents(self, job_id: str, contents: Dict[str, Dict]) -> None:
+        """
+        Stores shared contents once per content hash and adds the job to the jobs referencing them.
+
+        A job references a content at most once, so acquiring a content again for the same job
+        changes nothing.
+
+        Args:
+            job_id (str): The job ID referencing the contents.
+            contents (Dict[str, Dict]): The contents by content hash.
+        """
+        if contents:
+            self.collection.bulk_write([
+                UpdateOne(
+                    {"_id": content_hash},
+                    {"$setOnInsert": {"document": content}, "$addToSet": {"jobs": job_id}},
+                    upsert=True
+                )
+                for content_hash, content in contents.items()
+            ], ordered=False)
+
+    def release_contents(self, job_id: str, content_hashes: List[str]) -> int:
+        """
+        Removes a job from the jobs referencing shared contents and deletes the contents no job references anymore.
+
+        Releasing a content the job no longer references changes nothing.
+
+        Args:
+            job_id (str): The job ID that no longer references the contents.
+            content_hashes (List[str]): The content hashes.
+
+        Returns:
+            int: The number of deleted contents.
+        """
+        if not content_hashes:
+            return 0
+        self.collection.update_many({"_id": {"$in": content_hashes}}, {"$pull": {"jobs": job_id}})
+        return self.collection.delete_many({"_id": {"$in": content_hashes}, "jobs": {"$size": 0}}).deleted_count
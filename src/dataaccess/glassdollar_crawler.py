@@ -1,27 +1,118 @@
+import os
+import time
 from typing import List, Dict, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from loguru import logger
 
 from src.configs.dataaccess import DataAccessConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.glassdollar_queries import GlassDollarQueries
+from src.dataaccess.rate_limiter import GlassDollarRequestError, RetryPolicy, SharedRateLimiter, UnresolvedCorporatesError
+from src.monitoring.metrics import GLASSDOLLAR_RATE_LIMIT_WAIT, GlassDollarRequestTimer
 
 
 class GlassDollarCrawlerDataAccess:
-    headers = {
-        'authority': 'ranking.glassdollar.com',
-        'accept': '*/*',
-        'accept-language': 'en-US,en;q=0.8',
-        'content-type': 'application/json',
-        'origin': 'https://ranking.glassdollar.com',
-        'referer': 'https://ranking.glassdollar.com/',
-        'sec-ch-ua': '"Brave";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
-        'sec-ch-ua-mobile': '?0',
-        'sec-ch-ua-platform': '"macOS"',
-        'sec-fetch-dest': 'empty',
-        'sec-fetch-mode': 'cors',
-        'sec-fetch-site': 'same-origin',
-        'sec-gpc': '1',
-        'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-    }
+    """
+    Synchronous data access for the GlassDollar GraphQL API.
+
+    Requests go through one requests.Session per process, so TCP and TLS connections are
+    kept alive and reused between calls instead of being opened for every request. Every
+    request is paced by the rate limiter shared by all workers and retried with jittered
+    exponential backoff on timeouts, 429/5xx responses and GraphQL errors.
+
+    Attributes:
+        session (requests.Session): The HTTP session of the current process.
+        session_pid (int): The process ID the session was created in.
+        rate_limiter (SharedRateLimiter): The rate limiter shared by all workers.
+    """
+
+    headers = GlassDollarQueries.headers
+    session = None
+    session_pid = None
+    rate_limiter = SharedRateLimiter()
+
+    @staticmethod
+    def connect():
+        """Creates the HTTP session with a keep-alive connection pool of the configured size."""
+        adapter = HTTPAdapter(
+            pool_connections=DataAccessConfig.GlassDollar.POOL_SIZE,
+            pool_maxsize=DataAccessConfig.GlassDollar.POOL_SIZE,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(GlassDollarCrawlerDataAccess.headers)
+        session.headers["accept-encoding"] = ACCEPT_ENCODING
+        session.headers["connection"] = "keep-alive"
+
+        GlassDollarCrawlerDataAccess.session = session
+        GlassDollarCrawlerDataAccess.session_pid = os.getpid()
+
+    @staticmethod
+    def disconnect():
+        """Closes the HTTP session and its pooled connections."""
+        if GlassDollarCrawlerDataAccess.session:
+            GlassDollarCrawlerDataAccess.session.close()
+            GlassDollarCrawlerDataAccess.session = None
+            GlassDollarCrawlerDataAccess.session_pid = None
+
+    @staticmethod
+    def post(payload: Dict, operation: str = "graphql") -> Dict:
+        """
+        Sends a GraphQL payload to the GlassDollar API over the process session.
+
+        A session inherited through fork is replaced, since its sockets belong to the parent.
+        Every attempt is recorded in the request metrics under the given operation.
+
+        Parameters:
+            payload (Dict): The GraphQL payload.
+            operation (str): The name of the operation in the metrics.
+
+        Returns:
+            Dict: The decoded response.
+
+        Raises:
+            GlassDollarRequestError: If the request still fails after GLASSDOLLAR_MAX_RETRIES retries.
+        """
+        if GlassDollarCrawlerDataAccess.session is None or GlassDollarCrawlerDataAccess.session_pid != os.getpid():
+            GlassDollarCrawlerDataAccess.connect()
+
+        rate_limiter = GlassDollarCrawlerDataAccess.rate_limiter
+        max_retries = DataAccessConfig.GlassDollar.MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            with GLASSDOLLAR_RATE_LIMIT_WAIT.time():
+                rate_limiter.acquire()
+            retry_after = None
+            timer = GlassDollarRequestTimer(operation)
+            try:
+                response = GlassDollarCrawlerDataAccess.session.post(
+                    DataAccessConfig.GlassDollar.URI, json=payload, timeout=DataAccessConfig.GlassDollar.TIMEOUT
+                )
+            except requests.RequestException as ex:
+                timer.observe_error(ex)
+                reason = f"{type(ex).__name__}: {ex}"
+            else:
+                timer.observe_response(response.status_code, len(response.content))
+                try:
+                    data = response.json()
+                except ValueError:
+                    data = None
+                reason = RetryPolicy.check_response(response.status_code, data)
+                if reason is None:
+                    rate_limiter.on_success()
+                    return data
+                if response.status_code in DataAccessConstants.GlassDollar.THROTTLING_STATUS_CODES:
+                    rate_limiter.on_throttle()
+                retry_after = response.headers.get("retry-after")
+
+            if attempt < max_retries:
+                delay = RetryPolicy.backoff(attempt, retry_after)
+                logger.warning(f"GlassDollar request failed with {reason}, retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+        raise GlassDollarRequestError(f"GlassDollar request failed after {max_retries + 1} attempts: {reason}")
 
     @staticmethod
     def get_cities() -> List[str]:
@@ -32,9 +123,8 @@ class GlassDollarCrawlerDataAccess:
             List[str]: A list of city names.
 
         """
-        payload = {'query': "query {getCorporateCities}"}
-        response = requests.post(DataAccessConfig.GlassDollar.URI, headers=GlassDollarCrawlerDataAccess.headers, json=payload)
-        data = response.json()
+        payload = GlassDollarQueries.cities()
+        data = GlassDollarCrawlerDataAccess.post(payload, "cities")
         cities = data["data"]["getCorporateCities"]
 
         logger.info(f"Cities to fetch corporates: {cities}")
@@ -53,44 +143,46 @@ class GlassDollarCrawlerDataAccess:
             int: Total count of corporates.
 
         """
-        formatted_cities = ', '.join(f'"{city}"' for city in cities)
-        query = f"""query {{
-                      corporates(filters: {{industry: [], hq_city: [{formatted_cities}]}} page: 1) {{
-                        count
-                      }}
-                    }}"""
-        payload = {"query": query}
-
-        response = requests.post(DataAccessConfig.GlassDollar.URI, headers=GlassDollarCrawlerDataAccess.headers, json=payload)
-        data = response.json()
+        payload = GlassDollarQueries.total_corporate_count(cities)
+        data = GlassDollarCrawlerDataAccess.post(payload, "total_corporate_count")
         return data["data"]["corporates"]["count"]
 
     @staticmethod
-    def get_corporates_by_city(city, page) -> Tuple[List[str], int]:
+    def get_corporate_rows_by_city(city, page) -> Tuple[List[Dict], int]:
         """
-        Fetches a list of corporate IDs from a specific city and page number.
+        Fetches the listing rows of a specific city and page number.
+
+        Besides the ID, each row holds the listing fields that fingerprint the corporate.
 
         Parameters:
-            city (str): The city for which to fetch corporate IDs.
+            city (str): The city for which to fetch corporates.
             page (int): The page number for pagination.
 
         Returns:
-            Tuple[List[str], int]: A tuple containing a list of corporate IDs and the total count.
-        """
-        query = f"""query {{
-                      corporates(filters: {{industry: [], hq_city: ["{city}"]}} page: {page}) {{
-                        rows {{ id }}
-                        count
-                      }}
-                    }}"""
-        payload = {"query": query}
-        response = requests.post(DataAccessConfig.GlassDollar.URI, headers=GlassDollarCrawlerDataAccess.headers, json=payload)
-
-        data = response.json()
-        corporate_ids = [row["id"] for row in data["data"]["corporates"]["rows"]]
+            Tuple[List[Dict], int]: A tuple containing the listing rows and the total count.
+        """
+        payload = GlassDollarQueries.corporates_by_city(city, page)
+        data = GlassDollarCrawlerDataAccess.post(payload, "corporates_by_city")
+        rows = data["data"]["corporates"]["rows"]
         total_corporate_count = data["data"]["corporates"]["count"]
 
-        return corporate_ids, total_corporate_count
+        return rows, total_corporate_count
+
+    @staticmethod
+    def get_corporate_rows(cities: List[str], page: int) -> Tuple[List[Dict], int]:
+        """
+        Fetches a page of the listing rows across all given cities with a single query.
+
+        Parameters:
+            cities (List[str]): The cities to list corporates of.
+            page (int): The page number for pagination.
+
+        Returns:
+            Tuple[List[Dict], int]: A tuple containing the listing rows and the total count.
+        """
+        payload = GlassDollarQueries.corporates_by_cities(cities, page)
+        data = GlassDollarCrawlerDataAccess.post(payload, "corporates_by_cities")
+        return data["data"]["corporates"]["rows"], data["data"]["corporates"]["count"]
 
     @staticmethod
     def get_corporate_details(corporate_id: str) -> Dict:
@@ -104,20 +196,56 @@ class GlassDollarCrawlerDataAccess:
             Dict: A dictionary containing corporate details.
 
         """
-        query = f"""query {{
-                      corporate(id: "{corporate_id}") {{
-                        id name description logo_url hq_city hq_country website_url
-                        linkedin_url twitter_url startup_partners_count
-                        startup_partners {{
-                          company_name logo_url: logo city website country theme_gd
-                        }}
-                        startup_themes
-                      }}
-                    }}"""
+        payload = GlassDollarQueries.corporate_details(corporate_id)
+        data = GlassDollarCrawlerDataAccess.post(payload, "corporate_details")
+
+        return data["data"]["corporate"]
 
-        payload = {'query': query}
+    @staticmethod
+    def get_corporate_details_batch(corporate_ids: List[str]) -> List[Dict]:
+        """
+        Retrieves details of several corporates with a single aliased GraphQL request.
 
-        response = requests.post(DataAccessConfig.GlassDollar.URI, headers=GlassDollarCrawlerDataAccess.headers, json=payload)
-        data = response.json()
+        Parameters:
+            corporate_ids (List[str]): The IDs of the corporates to fetch details for.
 
-        return data["data"]["corporate"]
+        Returns:
+            List[Dict]: Corporate details in the same order as the given IDs.
+
+        Raises:
+            UnresolvedCorporatesError: If the API returned no details for some of the corporates.
+        """
+        payload = GlassDollarQueries.corporate_details_batch(corporate_ids)
+        data = GlassDollarCrawlerDataAccess.post(payload, "corporate_details_batch")
+
+        return GlassDollarCrawlerDataAccess.parse_corporate_details_batch(corporate_ids, data)
+
+    @staticmethod
+    def parse_corporate_details_batch(corporate_ids: List[str], data: Dict) -> List[Dict]:
+        """
+        Unpacks the aliased response of a batched corporate details query.
+
+        Parameters:
+            corporate_ids (List[str]): The IDs that were requested, in alias order.
+            data (Dict): The decoded GraphQL response.
+
+        Returns:
+            List[Dict]: The corporate details in request order.
+
+        Raises:
+            UnresolvedCorporatesError: If an alias came back empty. It carries the details of the
+                                       resolved corporates, so the caller can still store them.
+        """
+        corporates = []
+        unresolved_ids = []
+        for index, corporate_id in enumerate(corporate_ids):
+            corporate = data["data"].get(f"c{index}")
+            if corporate is None:
+                unresolved_ids.append(corporate_id)
+                continue
+            corporates.append(corporate)
+
+        if unresolved_ids:
+            logger.error(f"No details returned for corporates {unresolved_ids}")
+            raise UnresolvedCorporatesError(unresolved_ids, corporates)
+        return corporates
@@ -0,0 +1,188 @@
+from typing import List, Dict, Tuple
+import asyncio
+import httpx
+from loguru import logger
+
+from src.configs.dataaccess import DataAccessConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.glassdollar_crawler import GlassDollarCrawlerDataAccess
+from src.dataaccess.glassdollar_queries import GlassDollarQueries
+from src.dataaccess.rate_limiter import AdaptiveConcurrencyLimiter, GlassDollarRequestError, RetryPolicy
+from src.monitoring.metrics import GLASSDOLLAR_RATE_LIMIT_WAIT, GlassDollarRequestTimer
+
+
+class AsyncGlassDollarCrawlerDataAccess:
+    """
+    Asyncio counterpart of GlassDollarCrawlerDataAccess.
+
+    All requests go through one shared httpx.AsyncClient, so connections are kept alive
+    and reused across the many requests a crawl keeps in flight. Requests share the rate
+    limiter of GlassDollarCrawlerDataAccess, are retried like the synchronous ones, and the
+    number of requests in flight adapts to throttling.
+
+    Attributes:
+        client (httpx.AsyncClient): The shared HTTP client.
+        concurrency_limiter (AdaptiveConcurrencyLimiter): Bounds the requests in flight.
+    """
+
+    client = None
+    concurrency_limiter = None
+
+    @staticmethod
+    def connect():
+        """Creates the shared HTTP client with a bounded keep-alive connection pool."""
+        limits = httpx.Limits(
+            max_connections=DataAccessConfig.GlassDollar.MAX_CONNECTIONS,
+            max_keepalive_connections=DataAccessConfig.GlassDollar.MAX_KEEPALIVE_CONNECTIONS,
+        )
+        AsyncGlassDollarCrawlerDataAccess.client = httpx.AsyncClient(
+            headers=GlassDollarQueries.headers,
+            limits=limits,
+            timeout=DataAccessConfig.GlassDollar.TIMEOUT,
+        )
+        AsyncGlassDollarCrawlerDataAccess.concurrency_limiter = AdaptiveConcurrencyLimiter(
+            DataAccessConfig.GlassDollar.MAX_CONNECTIONS
+        )
+
+    @staticmethod
+    async def disconnect():
+        """Closes the shared HTTP client and its connections."""
+        if AsyncGlassDollarCrawlerDataAccess.client:
+            await AsyncGlassDollarCrawlerDataAccess.client.aclose()
+            AsyncGlassDollarCrawlerDataAccess.client = None
+            AsyncGlassDollarCrawlerDataAccess.concurrency_limiter = None
+
+    @staticmethod
+    async def post(payload: Dict, operation: str = "graphql") -> Dict:
+        """
+        Sends a GraphQL payload to the GlassDollar API.
+
+        Every attempt is recorded in the request metrics under the given operation.
+
+        Parameters:
+            payload (Dict): The GraphQL payload.
+            operation (str): The name of the operation in the metrics.
+
+        Returns:
+            Dict: The decoded response.
+
+        Raises:
+            GlassDollarRequestError: If the request still fails after GLASSDOLLAR_MAX_RETRIES retries.
+        """
+        if AsyncGlassDollarCrawlerDataAccess.concurrency_limiter is None:
+            AsyncGlassDollarCrawlerDataAccess.concurrency_limiter = AdaptiveConcurrencyLimiter(
+                DataAccessConfig.GlassDollar.MAX_CONNECTIONS
+            )
+        rate_limiter = GlassDollarCrawlerDataAccess.rate_limiter
+        concurrency_limiter = AsyncGlassDollarCrawlerDataAccess.concurrency_limiter
+        max_retries = DataAccessConfig.GlassDollar.MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            with GLASSDOLLAR_RATE_LIMIT_WAIT.time():
+                await rate_limiter.acquire_async()
+            retry_after = None
+            try:
+                async with concurrency_limiter:
+                    timer = GlassDollarRequestTimer(operation)
+                    response = await AsyncGlassDollarCrawlerDataAccess.client.post(DataAccessConfig.GlassDollar.URI, json=payload)
+            except httpx.HTTPError as ex:
+                timer.observe_error(ex)
+                reason = f"{type(ex).__name__}: {ex}"
+            else:
+                timer.observe_response(response.status_code, len(response.content))
+                try:
+                    data = response.json()
+                except ValueError:
+                    data = None
+                reason = RetryPolicy.check_response(response.status_code, data)
+                if reason is None:
+                    await asyncio.to_thread(rate_limiter.on_success)
+                    concurrency_limiter.on_success()
+                    return data
+                if response.status_code in DataAccessConstants.GlassDollar.THROTTLING_STATUS_CODES:
+                    await asyncio.to_thread(rate_limiter.on_throttle)
+                    concurrency_limiter.on_throttle()
+                retry_after = response.headers.get("retry-after")
+
+            if attempt < max_retries:
+                delay = RetryPolicy.backoff(attempt, retry_after)
+                logger.warning(f"GlassDollar request failed with {reason}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        raise GlassDollarRequestError(f"GlassDollar request failed after {max_retries + 1} attempts: {reason}")
+
+    @staticmethod
+    async def get_cities() -> List[str]:
+        """
+        Fetches a list of cities from the GlassDollar API.
+
+        Returns:
+            List[str]: A list of city names.
+        """
+        data = await AsyncGlassDollarCrawlerDataAccess.post(GlassDollarQueries.cities(), "cities")
+        cities = data["data"]["getCorporateCities"]
+
+        logger.info(f"Cities to fetch corporates: {cities}")
+
+        return cities
+
+    @staticmethod
+    async def get_total_corporate_count(cities: List[str]) -> int:
+        """
+        Calculates the total number of corporates across given cities.
+
+        Parameters:
+            cities (List[str]): A list of cities to include in the count.
+
+        Returns:
+            int: Total count of corporates.
+        """
+        data = await AsyncGlassDollarCrawlerDataAccess.post(GlassDollarQueries.total_corporate_count(cities), "total_corporate_count")
+        return data["data"]["corporates"]["count"]
+
+    @staticmethod
+    async def get_corporate_rows_by_city(city: str, page: int) -> Tuple[List[Dict], int]:
+        """
+        Fetches the listing rows of a specific city and page number.
+
+        Besides the ID, each row holds the listing fields that fingerprint the corporate.
+
+        Parameters:
+            city (str): The city for which to fetch corporates.
+            page (int): The page number for pagination.
+
+        Returns:
+            Tuple[List[Dict], int]: A tuple containing the listing rows and the total count.
+        """
+        data = await AsyncGlassDollarCrawlerDataAccess.post(GlassDollarQueries.corporates_by_city(city, page), "corporates_by_city")
+        return data["data"]["corporates"]["rows"], data["data"]["corporates"]["count"]
+
+    @staticmethod
+    async def get_corporate_details(corporate_id: str) -> Dict:
+        """
+        Retrieves details of a specific corporate by its ID.
+
+        Parameters:
+            corporate_id (str): The ID of the corporate to fetch details for.
+
+        Returns:
+            Dict: A dictionary containing corporate details.
+        """
+        data = await AsyncGlassDollarCrawlerDataAccess.post(GlassDollarQueries.corporate_details(corporate_id), "corporate_details")
+        return data["data"]["corporate"]
+
+    @staticmethod
+    async def get_corporate_details_batch(corporate_ids: List[str]) -> List[Dict]:
+        """
+        Retrieves details of several corporates with a single aliased GraphQL request.
+
+        Parameters:
+            corporate_ids (List[str]): The IDs of the corporates to fetch details for.
+
+        Returns:
+            List[Dict]: Corporate details in the same order as the given IDs.
+
+        Raises:
+            UnresolvedCorporatesError: If the API returned no details for some of the corporates.
+        """
+        data = await AsyncGlassDollarCrawlerDataAccess.post(GlassDollarQueries.corporate_details_batch(corporate_ids), "corporate_details_batch")
+        return GlassDollarCrawlerDataAccess.parse_corporate_details_batch(corporate_ids, data)
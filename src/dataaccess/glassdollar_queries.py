@@ -0,0 +1,87 @@
+from typing import List, Dict
+
+
+class GlassDollarQueries:
+    """
+    Builds the GraphQL payloads sent to the GlassDollar API.
+
+    The payloads are shared by the synchronous and the asynchronous crawler data access layers.
+    """
+
+    headers = {
+        'authority': 'ranking.glassdollar.com',
+        'accept': '*/*',
+        'accept-language': 'en-US,en;q=0.8',
+        'content-type': 'application/json',
+        'origin': 'https://ranking.glassdollar.com',
+        'referer': 'https://ranking.glassdollar.com/',
+        'sec-ch-ua': '"Brave";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"macOS"',
+        'sec-fetch-dest': 'empty',
+        'sec-fetch-mode': 'cors',
+        'sec-fetch-site': 'same-origin',
+        'sec-gpc': '1',
+        'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    }
+
+    corporate_fields = """
+                        id name description logo_url hq_city hq_country website_url
+                        linkedin_url twitter_url startup_partners_count
+                        startup_partners {
+                          company_name logo_url: logo city website country theme_gd
+                        }
+                        startup_themes
+                      """
+
+    listing_fields = "id name hq_city hq_country startup_partners_count"
+
+    @staticmethod
+    def cities() -> Dict:
+        """Payload listing every city that has corporates."""
+        return {'query': "query {getCorporateCities}"}
+
+    @staticmethod
+    def total_corporate_count(cities: List[str]) -> Dict:
+        """Payload counting the corporates across the given cities."""
+        formatted_cities = ', '.join(f'"{city}"' for city in cities)
+        query = f"""query {{
+                      corporates(filters: {{industry: [], hq_city: [{formatted_cities}]}} page: 1) {{
+                        count
+                      }}
+                    }}"""
+        return {"query": query}
+
+    @staticmethod
+    def corporates_by_cities(cities: List[str], page: int) -> Dict:
+        """Payload listing a page of the corporates across the given cities, with their fingerprint fields."""
+        formatted_cities = ', '.join(f'"{city}"' for city in cities)
+        query = f"""query {{
+                      corporates(filters: {{industry: [], hq_city: [{formatted_cities}]}} page: {page}) {{
+                        rows {{ {GlassDollarQueries.listing_fields} }}
+                        count
+                      }}
+                    }}"""
+        return {"query": query}
+
+    @staticmethod
+    def corporates_by_city(city: str, page: int) -> Dict:
+        """Payload listing the corporates of a city page with the fields used to fingerprint them."""
+        return GlassDollarQueries.corporates_by_cities([city], page)
+
+    @staticmethod
+    def corporate_details(corporate_id: str) -> Dict:
+        """Payload fetching the details of a single corporate."""
+        query = f"""query {{
+                      corporate(id: "{corporate_id}") {{{GlassDollarQueries.corporate_fields}}}
+                    }}"""
+        return {'query': query}
+
+    @staticmethod
+    def corporate_details_batch(corporate_ids: List[str]) -> Dict:
+        """Payload fetching the details of several corporates, aliased as c0, c1, ..."""
+        aliased_queries = "\n".join(
+            f'c{index}: corporate(id: "{corporate_id}") {{{GlassDollarQueries.corporate_fields}}}'
+            for index, corporate_id in enumerate(corporate_ids)
+        )
+        return {'query': f"query {{\n{aliased_queries}\n}}"}
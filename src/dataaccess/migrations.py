@@ -0,0 +1,31 @@
+from loguru import logger
+from pymongo import ASCENDING
+
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.database import MongoConnection
+
+
+def remove_duplicate_corporates() -> int:
+    """
+    Removes the duplicate corporates of jobs crawled before corporates were upserted on (job_id, id)
+    and creates the unique (job_id, id) index.
+
+    Run it once from a single process, with the API and the workers stopped, before deploying a
+    version that requires the index.
+
+    Returns:
+        int: The number of deleted documents.
+    """
+    collection = MongoConnection(DataAccessConstants.MongoDB.CollectionNames.CORPORATES).collection
+    removed_count = MongoConnection.remove_duplicate_corporates(collection)
+    collection.create_index([("job_id", ASCENDING), ("id", ASCENDING)], unique=True)
+    logger.info(f"Removed {removed_count} duplicate corporates and created the unique (job_id, id) index")
+    return removed_count
+
+
+if __name__ == "__main__":
+    MongoConnection.connect()
+    try:
+        remove_duplicate_corporates()
+    finally:
+        MongoConnection.disconnect()
@@ -0,0 +1,284 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from loguru import logger
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.configs.dataaccess import DataAccessConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.database import MongoConnection
+
+
+class GlassDollarRequestError(Exception):
+    """Raised when a GlassDollar request still fails after all retries."""
+
+
+class UnresolvedCorporatesError(GlassDollarRequestError):
+    """
+    Raised when a batched details request returned no details for some corporates.
+
+    Attributes:
+        corporate_ids (List[str]): The IDs of the unresolved corporates.
+        corporates (List[Dict]): The details of the corporates that were resolved.
+    """
+
+    def __init__(self, corporate_ids: List[str], corporates: List[Dict]):
+        super().__init__(f"No details returned for corporates {corporate_ids}")
+        self.corporate_ids = corporate_ids
+        self.corporates = corporates
+
+
+class SharedRateLimiter:
+    """
+    A token bucket shared by every worker process through MongoDB, with AIMD rate control.
+
+    The bucket lives in a single document of the rate_limits collection holding the current
+    tokens, the refill rate in requests per second and the time of the last update. A token is
+    reserved with a single atomic update that refills the bucket and takes the token in one
+    round trip, so concurrent processes never hand out the same token and never retry. A
+    reservation may drive the bucket negative; the caller then waits until its token has been
+    refilled.
+
+    The refill rate adapts AIMD-style: it is multiplied by AIMD_DECREASE_FACTOR when the upstream
+    throttles (at most once per AIMD_DECREASE_COOLDOWN seconds across all processes) and raised by
+    AIMD_INCREASE_STEP after every AIMD_INCREASE_EVERY successful requests of a process.
+
+    Without a MongoDB connection (e.g. in one-off scripts) requests are not limited.
+    """
+
+    def __init__(self, key: str = DataAccessConstants.GlassDollar.RATE_LIMIT_KEY):
+        self.key = key
+        self.success_count = 0
+        self.lock = threading.Lock()
+
+    def get_collection(self):
+        """Returns the rate_limits collection, or None without a MongoDB connection."""
+        if MongoConnection.client is None:
+            return None
+        return MongoConnection(DataAccessConstants.MongoDB.CollectionNames.RATE_LIMITS).collection
+
+    def get_bucket(self, collection) -> Dict:
+        """Returns the bucket document, creating a full bucket on first use."""
+        bucket = collection.find_one({"_id": self.key})
+        if bucket is not None:
+            return bucket
+
+        bucket = {
+            "_id": self.key,
+            "tokens": DataAccessConfig.GlassDollar.RATE_LIMIT_BURST,
+            "rate": DataAccessConfig.GlassDollar.RATE_LIMIT,
+            "updated_at": time.time(),
+            "decreased_at": 0.0,
+        }
+        try:
+            collection.insert_one(bucket)
+        except DuplicateKeyError:
+            bucket = collection.find_one({"_id": self.key})
+        return bucket
+
+    def reserve(self) -> float:
+        """
+        Reserves one token from the shared bucket, creating a full bucket on first use.
+
+        If another process creates the bucket at the same time, the update is sent once more
+        and then finds it.
+
+        Returns:
+            float: The number of seconds to wait before the request may be sent.
+        """
+        collection = self.get_collection()
+        if collection is None:
+            return 0.0
+
+        now = time.time()
+        updated_at = {"$ifNull": ["$updated_at", now]}
+        rate = {"$ifNull": ["$rate", DataAccessConfig.GlassDollar.RATE_LIMIT]}
+        refilled_tokens = {"$add": [
+            {"$ifNull": ["$tokens", DataAccessConfig.GlassDollar.RATE_LIMIT_BURST]},
+            {"$multiply": [{"$max": [0, {"$subtract": [now, updated_at]}]}, rate]},
+        ]}
+        update = [{"$set": {
+            "tokens": {"$subtract": [{"$min": [DataAccessConfig.GlassDollar.RATE_LIMIT_BURST, refilled_tokens]}, 1]},
+            "rate": rate,
+            "updated_at": {"$max": [updated_at, now]},
+            "decreased_at": {"$ifNull": ["$decreased_at", 0.0]},
+        }}]
+        try:
+            bucket = collection.find_one_and_update(
+                {"_id": self.key}, update, projection={"tokens": 1, "rate": 1},
+                upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            bucket = collection.find_one_and_update(
+                {"_id": self.key}, update, projection={"tokens": 1, "rate": 1}, return_document=ReturnDocument.AFTER
+            )
+        return max(0.0, -bucket["tokens"] / bucket["rate"])
+
+    def acquire(self) -> None:
+        """Blocks until the caller may send a request."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Waits, without blocking the event loop, until the caller may send a request."""
+        wait = await asyncio.to_thread(self.reserve)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        """Records a successful request and additively raises the shared rate every few successes."""
+        with self.lock:
+            self.success_count += 1
+            if self.success_count < DataAccessConfig.GlassDollar.AIMD_INCREASE_EVERY:
+                return
+            self.success_count = 0
+
+        collection = self.get_collection()
+        if collection is None:
+            return
+        collection.update_one(
+            {"_id": self.key, "rate": {"$lte": DataAccessConfig.GlassDollar.RATE_LIMIT_MAX - DataAccessConfig.GlassDollar.AIMD_INCREASE_STEP}},
+            {"$inc": {"rate": DataAccessConfig.GlassDollar.AIMD_INCREASE_STEP}}
+        )
+
+    def on_throttle(self) -> None:
+        """Records a throttled request and multiplicatively lowers the shared rate."""
+        with self.lock:
+            self.success_count = 0
+
+        collection = self.get_collection()
+        if collection is None:
+            return
+
+        bucket = self.get_bucket(collection)
+        now = time.time()
+        if now - bucket.get("decreased_at", 0.0) < DataAccessConfig.GlassDollar.AIMD_DECREASE_COOLDOWN:
+            return
+
+        rate = max(DataAccessConfig.GlassDollar.RATE_LIMIT_MIN, bucket["rate"] * DataAccessConfig.GlassDollar.AIMD_DECREASE_FACTOR)
+        result = collection.update_one(
+            {"_id": self.key, "decreased_at": bucket.get("decreased_at", 0.0)},
+            {"$set": {"rate": rate, "decreased_at": now}}
+        )
+        if result.modified_count:
+            logger.warning(f"GlassDollar is throttling, lowered the shared rate limit to {rate:.2f} requests/s")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    An asyncio limit on the requests in flight that adapts AIMD-style.
+
+    The limit is halved when the upstream throttles and raised by one after every
+    AIMD_INCREASE_EVERY successful requests, between 1 and the given maximum.
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.in_flight = 0
+        self.success_count = 0
+        self.condition: Optional[asyncio.Condition] = None
+
+    async def __aenter__(self):
+        if self.condition is None:
+            self.condition = asyncio.Condition()
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_success(self) -> None:
+        """Raises the limit by one after every AIMD_INCREASE_EVERY successful requests."""
+        self.success_count += 1
+        if self.success_count >= DataAccessConfig.GlassDollar.AIMD_INCREASE_EVERY:
+            self.success_count = 0
+            self.limit = min(self.max_limit, self.limit + 1)
+
+    def on_throttle(self) -> None:
+        """Halves the limit."""
+        self.success_count = 0
+        self.limit = max(1, int(self.limit * DataAccessConfig.GlassDollar.AIMD_DECREASE_FACTOR))
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for GlassDollar requests.
+    """
+
+    @staticmethod
+    def backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Computes the delay before the next attempt.
+
+        A Retry-After header given in seconds takes precedence. Otherwise the delay is drawn
+        uniformly between zero and RETRY_BACKOFF_BASE * 2 ** attempt, capped at RETRY_BACKOFF_MAX
+        ("full jitter"), so retrying workers spread out instead of retrying in lockstep.
+
+        Parameters:
+            attempt (int): The zero based number of the failed attempt.
+            retry_after (str, optional): The Retry-After header of the failed response.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), DataAccessConfig.GlassDollar.RETRY_BACKOFF_MAX)
+        ceiling = min(DataAccessConfig.GlassDollar.RETRY_BACKOFF_MAX, DataAccessConfig.GlassDollar.RETRY_BACKOFF_BASE * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def check_response(status_code: int, data: Optional[Dict]) -> Optional[str]:
+        """
+        Classifies a GlassDollar response.
+
+        Only throttling, 5xx responses and GraphQL errors with a transient code are worth
+        retrying. A 4xx, a body that is not JSON or any other GraphQL error fails the same way
+        on every attempt, so it is raised at once.
+
+        Parameters:
+            status_code (int): The HTTP status code.
+            data (Dict, optional): The decoded body, None when it is not JSON.
+
+        Returns:
+            Optional[str]: Why the request should be retried, None if the response is usable.
+
+        Raises:
+            GlassDollarRequestError: If the response can not be fixed by retrying.
+        """
+        if status_code in DataAccessConstants.GlassDollar.RETRYABLE_STATUS_CODES or status_code >= 500:
+            return f"HTTP {status_code}"
+        if status_code >= 400:
+            raise GlassDollarRequestError(f"GlassDollar request failed with HTTP {status_code}: {data}")
+        if data is None:
+            raise GlassDollarRequestError(f"GlassDollar returned HTTP {status_code} with a non JSON body")
+        if data.get("data") is None:
+            errors = data.get("errors") or []
+            if any(RetryPolicy.is_transient(error) for error in errors):
+                return f"GraphQL errors {errors}"
+            raise GlassDollarRequestError(f"GlassDollar returned no data with GraphQL errors {errors}")
+        if data.get("errors"):
+            logger.warning(f"GlassDollar returned partial data with GraphQL errors {data['errors']}")
+        return None
+
+    @staticmethod
+    def is_transient(error: Dict) -> bool:
+        """
+        Checks if a GraphQL error is transient, by the code in its extensions.
+
+        Parameters:
+            error (Dict): The GraphQL error.
+
+        Returns:
+            bool: True if the error may not happen again on a retry.
+        """
+        extensions = error.get("extensions") if isinstance(error, dict) else None
+        return isinstance(extensions, dict) and extensions.get("code") in DataAccessConstants.GlassDollar.TRANSIENT_GRAPHQL_ERROR_CODES
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from loguru import logger
 from src.controllers.routing import router
+from src.dataaccess.async_database import AsyncMongoConnection
 from src.dataaccess.database import MongoConnection
+from src.dataaccess.glassdollar_crawler import GlassDollarCrawlerDataAccess
 
 app = FastAPI()
 
@@ -11,10 +13,17 @@ app.include_router(router)
 @app.on_event("startup")
 async def startup_event():
     MongoConnection.connect()
-    logger.info("Initialized MongoDB connection for FastAPI")
+    MongoConnection.ensure_indices()
+    AsyncMongoConnection.connect()
+    logger.info("Initialized MongoDB connections for FastAPI")
+    GlassDollarCrawlerDataAccess.connect()
+    logger.info("Initialized GlassDollar HTTP session for FastAPI")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    AsyncMongoConnection.disconnect()
     MongoConnection.disconnect()
-    logger.info("Closed MongoDB connection for FastAPI")
+    logger.info("Closed MongoDB connections for FastAPI")
+    GlassDollarCrawlerDataAccess.disconnect()
+    logger.info("Closed GlassDollar HTTP session for FastAPI")
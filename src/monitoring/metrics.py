@@ -0,0 +1,133 @@
+import os
+import time
+from typing import Dict, Optional
+from loguru import logger
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess, start_http_server
+)
+from pymongo import monitoring
+
+from src.configs.app import AppConfig
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+GLASSDOLLAR_REQUEST_DURATION = Histogram(
+    "glassdollar_request_duration_seconds", "Duration of a single GlassDollar request attempt",
+    ["operation"], buckets=LATENCY_BUCKETS
+)
+GLASSDOLLAR_RESPONSE_SIZE = Histogram(
+    "glassdollar_response_size_bytes", "Size of the decoded GlassDollar response bodies",
+    ["operation"], buckets=SIZE_BUCKETS
+)
+GLASSDOLLAR_RESPONSES = Counter(
+    "glassdollar_responses_total", "GlassDollar request attempts by HTTP status, or by error when no response came back",
+    ["operation", "status"]
+)
+GLASSDOLLAR_RATE_LIMIT_WAIT = Histogram(
+    "glassdollar_rate_limit_wait_seconds", "Time spent waiting for the shared GlassDollar rate limiter",
+    buckets=LATENCY_BUCKETS
+)
+TASK_QUEUE_WAIT = Histogram(
+    "crawl_task_queue_wait_seconds", "Time between publishing a Celery task and a worker starting it",
+    ["task"], buckets=TASK_BUCKETS
+)
+TASK_DURATION = Histogram(
+    "crawl_task_duration_seconds", "Execution time of Celery tasks",
+    ["task", "state"], buckets=TASK_BUCKETS
+)
+CORPORATES = Counter(
+    "crawl_corporates_total", "Corporates queued for storage, crawled or reused from an earlier job",
+    ["source"]
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "Duration of MongoDB commands",
+    ["command", "collection", "outcome"], buckets=LATENCY_BUCKETS
+)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    A pymongo command listener recording the duration of every MongoDB command.
+
+    It is registered on the pymongo and Motor clients, so the operations of MongoConnection
+    and AsyncMongoConnection are timed by the driver without wrapping each method.
+    """
+
+    def __init__(self):
+        self.collections: Dict[int, str] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self.collections[event.request_id] = collection if isinstance(collection, str) else ""
+
+    def succeeded(self, event):
+        self.observe(event, "success")
+
+    def failed(self, event):
+        self.observe(event, "failure")
+
+    def observe(self, event, outcome: str):
+        collection = self.collections.pop(event.request_id, "")
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection, outcome).observe(event.duration_micros / 1e6)
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+
+class GlassDollarRequestTimer:
+    """Times a GlassDollar request attempt and records its status, or its error, and response size."""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.started_at = time.perf_counter()
+
+    def observe_response(self, status_code: int, size: int) -> None:
+        GLASSDOLLAR_REQUEST_DURATION.labels(self.operation).observe(time.perf_counter() - self.started_at)
+        GLASSDOLLAR_RESPONSE_SIZE.labels(self.operation).observe(size)
+        GLASSDOLLAR_RESPONSES.labels(self.operation, str(status_code)).inc()
+
+    def observe_error(self, ex: Exception) -> None:
+        GLASSDOLLAR_REQUEST_DURATION.labels(self.operation).observe(time.perf_counter() - self.started_at)
+        GLASSDOLLAR_RESPONSES.labels(self.operation, type(ex).__name__).inc()
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    Returns the registry to expose.
+
+    With PROMETHEUS_MULTIPROC_DIR set, the metrics of every process writing to that directory
+    (e.g. the Celery prefork pool) are aggregated; otherwise those of the current process.
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    """Renders the metrics in the Prometheus text format."""
+    return generate_latest(get_registry())
+
+
+def start_worker_exporter() -> Optional[int]:
+    """
+    Serves the worker metrics on WORKER_METRICS_PORT, unless the port is 0.
+
+    Returns:
+        Optional[int]: The port the metrics are served on.
+    """
+    if not AppConfig.WORKER_METRICS_PORT:
+        return None
+    start_http_server(AppConfig.WORKER_METRICS_PORT, registry=get_registry())
+    logger.info(f"Serving worker metrics on port {AppConfig.WORKER_METRICS_PORT}")
+    return AppConfig.WORKER_METRICS_PORT
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drops the live metrics of an exited pool process in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
+
@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+from src.constants.dataaccess import DataAccessConstants
 
 
 class Job(BaseModel):
@@ -12,13 +14,55 @@ class Job(BaseModel):
     counter (int): A counter to track progress, defaults to 0.
     total_corporate_count (int): Total number of corporates to process.
     created_at (datetime): Timestamp when the job was created.
+    status (str): "running" until the counter reaches the total, "completed" afterwards,
+                  "expired" while the retention policy deletes it.
+    completed_at (datetime): Timestamp when the job was completed.
+    cities (List[str]): The cities crawled by the job, to resume it.
+    enumeration (str): "city" when every city is listed on its own, "global" for a single listing of all cities.
+    incremental (bool): Whether unchanged corporates are copied from earlier jobs.
+    compacted (bool): Whether the corporates of the job reference shared contents instead of holding them.
     """
     job_id: str
     total_corporate_count: int
     created_at: Optional[datetime] = None
     counter: int = 0
+    status: str = DataAccessConstants.MongoDB.JobStatus.RUNNING
+    completed_at: Optional[datetime] = None
+    cities: List[str] = []
+    enumeration: str = DataAccessConstants.MongoDB.Enumeration.CITY
+    incremental: bool = False
+    compacted: bool = False
 
     def __init__(self, **data):
         super().__init__(**data)
         if self.created_at is None:
             self.created_at = datetime.now()
+        if self.counter >= self.total_corporate_count and self.status == DataAccessConstants.MongoDB.JobStatus.RUNNING:
+            self.status = DataAccessConstants.MongoDB.JobStatus.COMPLETED
+            self.completed_at = self.created_at
+
+
+class JobProgress(BaseModel):
+    """
+    Pydantic model representing the progress of a job.
+
+    Attributes:
+    job_id (str): Unique identifier for the job.
+    status (str): "running", "completed" or "expired".
+    counter (int): The number of stored corporates.
+    total_corporate_count (int): Total number of corporates to process.
+    progress (float): The stored fraction of the corporates, between 0 and 1.
+    rate (float): Stored corporates per second since the job was created.
+    eta_seconds (float): Estimated seconds until completion at the current rate, None while unknown.
+    created_at (datetime): Timestamp when the job was created.
+    completed_at (datetime): Timestamp when the job was completed.
+    """
+    job_id: str
+    status: str
+    counter: int
+    total_corporate_count: int
+    progress: float
+    rate: float
+    eta_seconds: Optional[float] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
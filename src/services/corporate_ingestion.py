@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import List, Dict, Optional
+from loguru import logger
+
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.database import MongoConnection
+from src.monitoring.metrics import CORPORATES
+from src.schemas.corporates import Corporate
+from src.services.corporate_serializer import CorporateSerializer
+
+
+class CorporateIngestionService:
+    """
+    A service class for validating crawled corporates and storing them for a job.
+    """
+
+    @staticmethod
+    def store_corporates(corporates_data: List[Dict], job_id: str, fingerprints: Optional[Dict[str, str]] = None) -> int:
+        """
+        Validates crawled corporate details and stores them through the write-behind buffer.
+
+        The call returns once the documents are inserted and the job counter advanced. Each
+        document carries the content hash that job diffs compare.
+
+        Parameters:
+        corporates_data (List[Dict]): Corporate details as returned by the GlassDollar API.
+        job_id (str): The ID of the job the corporates belong to.
+        fingerprints (Dict[str, str], optional): Listing fingerprints by corporate ID, stored for
+                                                 later incremental crawls.
+
+        Returns:
+        int: The number of stored corporates.
+
+        A corporate that fails validation is left out and excluded from the job, so the rest of
+        the batch is still stored.
+        """
+        corporates = []
+        invalid_ids = []
+        for corporate_data in corporates_data:
+            try:
+                corporate = Corporate(**corporate_data, job_id=job_id, created_at=datetime.now())
+            except ValueError as ex:
+                logger.error(f"Error occurred in validation {str(ex)}. corporate_data: {corporate_data}")
+                if corporate_data.get("id"):
+                    invalid_ids.append(corporate_data["id"])
+                continue
+            document = corporate.model_dump()
+            document["content_hash"] = CorporateSerializer.content_hash(document)
+            corporates.append(document)
+
+        MongoConnection.buffer_corporates(corporates)
+        CORPORATES.labels("crawled").inc(len(corporates))
+
+        if fingerprints:
+            MongoConnection(DataAccessConstants.MongoDB.CollectionNames.FINGERPRINTS).upsert_fingerprints(
+                {corporate["id"]: fingerprints[corporate["id"]] for corporate in corporates if corporate["id"] in fingerprints},
+                job_id
+            )
+
+        if invalid_ids:
+            CorporateIngestionService.exclude_corporates(invalid_ids, job_id)
+
+        return len(corporates)
+
+    @staticmethod
+    def exclude_corporates(corporate_ids: List[str], job_id: str) -> int:
+        """
+        Counts corporates that can not be stored toward the job counter, so the job still completes.
+
+        The corporates are marked unresolvable among the listed corporates of the job, which
+        keeps a resume from crawling them again. Corporates excluded before are not counted twice.
+
+        Parameters:
+        corporate_ids (List[str]): The IDs of the corporates that can not be stored.
+        job_id (str): The ID of the job the corporates belong to.
+
+        Returns:
+        int: The number of newly excluded corporates.
+        """
+        collection_names = DataAccessConstants.MongoDB.CollectionNames
+        excluded_count = MongoConnection(collection_names.ENUMERATED_CORPORATES).mark_unresolvable(job_id, corporate_ids)
+        if excluded_count:
+            MongoConnection(collection_names.JOB).increment_counter(job_id, excluded_count)
+        logger.warning(f"Excluded {excluded_count} unresolvable corporates from job {job_id}: {corporate_ids}")
+        return excluded_count
@@ -0,0 +1,76 @@
+import hashlib
+from typing import Dict, List
+import orjson
+
+
+class CorporateSerializer:
+    """
+    Encodes raw corporate documents read from MongoDB straight to JSON bytes.
+
+    Corporates are validated once, when a worker stores them, so documents read back for
+    a response are trusted. Encoding them with orjson skips building Corporate and
+    StartupPartner models per document only to dump them again. The output matches
+    `Corporate.model_dump_json(exclude_none=True)` for the fields present in the document.
+    """
+
+    @staticmethod
+    def clean(document: Dict) -> Dict:
+        """
+        Drops the _id and the None values of a document and of its startup partners.
+
+        Parameters:
+        document (Dict): The raw document.
+
+        Returns:
+        Dict: The document as it is returned.
+        """
+        document = {key: value for key, value in document.items() if value is not None and key != "_id"}
+        if "startup_partners" in document:
+            document["startup_partners"] = [
+                {key: value for key, value in partner.items() if value is not None}
+                for partner in document["startup_partners"]
+            ]
+        return document
+
+    @staticmethod
+    def encode_document(document: Dict) -> bytes:
+        """
+        Encodes a single raw document.
+
+        Parameters:
+        document (Dict): The raw document.
+
+        Returns:
+        bytes: The JSON encoded document.
+        """
+        return orjson.dumps(CorporateSerializer.clean(document), default=str)
+
+    @staticmethod
+    def encode_documents(documents: List[Dict]) -> bytes:
+        """
+        Encodes raw documents as a JSON array.
+
+        Parameters:
+        documents (List[Dict]): The raw documents.
+
+        Returns:
+        bytes: The JSON encoded array.
+        """
+        return orjson.dumps([CorporateSerializer.clean(document) for document in documents], default=str)
+
+    @staticmethod
+    def content_hash(document: Dict) -> str:
+        """
+        Hashes the content of a corporate, independent of the job it is stored under.
+
+        Parameters:
+        document (Dict): The corporate document.
+
+        Returns:
+        str: The SHA-1 hex digest of the document without its _id, job_id, created_at and content_hash.
+        """
+        content = {
+            key: value for key, value in document.items()
+            if key not in ("_id", "job_id", "created_at", "content_hash")
+        }
+        return hashlib.sha1(orjson.dumps(content, default=str, option=orjson.OPT_SORT_KEYS)).hexdigest()
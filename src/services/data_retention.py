@@ -0,0 +1,192 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.database import MongoConnection
+from src.services.corporate_serializer import CorporateSerializer
+from src.services.snapshot_export import SnapshotExportService
+
+
+class DataRetentionService:
+    """
+    A service class bounding the size of the corporates collection.
+
+    Completed jobs beyond the AppConfig.RETENTION_KEEP_JOBS newest ones, or created more than
+    AppConfig.RETENTION_MAX_AGE_DAYS days ago, expire. Their corporates are deleted in batches
+    of AppConfig.RETENTION_BATCH_SIZE, so the deletion never holds a long write on the
+    collection. The latest completed job is always kept, and running jobs are never deleted.
+
+    With AppConfig.CORPORATE_COMPACTION, the corporates of the older completed jobs are compacted:
+    their contents are stored once per content hash in a shared collection and the job
+    documents only keep a reference, so a corporate that did not change across jobs is held once.
+
+    Runs may overlap, so a run claims a job before deleting or compacting it. A claim expires
+    after AppConfig.RETENTION_CLAIM_TIMEOUT seconds, when a later run takes over the job. Shared
+    contents record the IDs of the jobs referencing them, so a job taken over, or processed twice,
+    can not reference or release a content more than once.
+    """
+
+    REFERENCE_FIELDS = ["_id", "job_id", "id", "created_at", "content_hash"]
+
+    @staticmethod
+    def apply_retention(now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Deletes the expired jobs and, if enabled, compacts the older completed jobs.
+
+        Jobs are marked expired before their corporates are deleted, so a deletion that was
+        interrupted is finished by the next run.
+
+        Parameters:
+        now (datetime, optional): The time the age of jobs is measured at, the current time by default.
+
+        Returns:
+        Dict[str, int]: The number of expired jobs, deleted corporates and compacted corporates.
+        """
+        collection_names = DataAccessConstants.MongoDB.CollectionNames
+        jobs = MongoConnection(collection_names.JOB)
+        completed_jobs = jobs.list_jobs(DataAccessConstants.MongoDB.JobStatus.COMPLETED)
+
+        expired_job_ids = DataRetentionService.select_expired_jobs(completed_jobs, now or datetime.now())
+        for job_id in expired_job_ids:
+            jobs.mark_expired(job_id)
+
+        claims_expire_before = datetime.now() - timedelta(seconds=AppConfig.RETENTION_CLAIM_TIMEOUT)
+        deleted_count = 0
+        for job in jobs.list_jobs(DataAccessConstants.MongoDB.JobStatus.EXPIRED):
+            if jobs.claim_job(job["job_id"], {"status": DataAccessConstants.MongoDB.JobStatus.EXPIRED},
+                              "deletion_claimed_at", claims_expire_before):
+                deleted_count += DataRetentionService.delete_job(job["job_id"])
+
+        compacted_count = 0
+        if AppConfig.CORPORATE_COMPACTION:
+            for job in completed_jobs[1:]:
+                if job["job_id"] in expired_job_ids or job.get("compacted"):
+                    continue
+                if jobs.claim_job(
+                    job["job_id"], {"status": DataAccessConstants.MongoDB.JobStatus.COMPLETED, "compacted": {"$ne": True}},
+                    "compaction_claimed_at", claims_expire_before
+                ):
+                    compacted_count += DataRetentionService.compact_job(job["job_id"])
+
+        return {"expired_jobs": len(expired_job_ids), "deleted_corporates": deleted_count, "compacted_corporates": compacted_count}
+
+    @staticmethod
+    def select_expired_jobs(completed_jobs: List[Dict], now: datetime) -> List[str]:
+        """
+        Selects the completed jobs the retention policy expires.
+
+        Parameters:
+        completed_jobs (List[Dict]): The completed jobs, newest first.
+        now (datetime): The time the age of jobs is measured at.
+
+        Returns:
+        List[str]: The expired job IDs.
+        """
+        expired_job_ids = []
+        for index, job in enumerate(completed_jobs[1:], start=1):
+            beyond_count = 0 < AppConfig.RETENTION_KEEP_JOBS <= index
+            too_old = (
+                AppConfig.RETENTION_MAX_AGE_DAYS > 0 and job.get("created_at") is not None
+                and job["created_at"] < now - timedelta(days=AppConfig.RETENTION_MAX_AGE_DAYS)
+            )
+            if beyond_count or too_old:
+                expired_job_ids.append(job["job_id"])
+        return expired_job_ids
+
+    @staticmethod
+    def delete_job(job_id: str) -> int:
+        """
+        Deletes an expired job, its corporates batch by batch, and everything kept for it.
+
+        The job is removed from the shared contents of the corporates this call deleted, also
+        from those of corporates whose compaction was interrupted, and contents no job
+        references anymore are deleted. The job document goes last.
+
+        Parameters:
+        job_id (str): The expired job ID, claimed by the caller.
+
+        Returns:
+        int: The number of deleted corporates.
+        """
+        collection_names = DataAccessConstants.MongoDB.CollectionNames
+        corporates = MongoConnection(collection_names.CORPORATES)
+        contents = MongoConnection(collection_names.CORPORATE_CONTENTS)
+
+        deleted_count = 0
+        while True:
+            deleted = corporates.delete_corporates_batch(job_id, AppConfig.RETENTION_BATCH_SIZE)
+            if not deleted:
+                break
+            deleted_count += len(deleted)
+            contents.release_contents(job_id, list({
+                document.get(DataAccessConstants.MongoDB.CONTENT_REF_FIELD) or document["content_hash"]
+                for document in deleted
+                if DataAccessConstants.MongoDB.CONTENT_REF_FIELD in document or document.get("content_hash")
+            }))
+
+        MongoConnection(collection_names.CHECKPOINTS).delete_by_job_id(job_id)
+        MongoConnection(collection_names.ENUMERATED_CORPORATES).delete_by_job_id(job_id)
+        snapshot_path = SnapshotExportService.get_snapshot_path(job_id)
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+        MongoConnection(collection_names.JOB).delete_by_job_id(job_id)
+
+        logger.info(f"Deleted expired job {job_id} with {deleted_count} corporates")
+        return deleted_count
+
+    @staticmethod
+    def compact_job(job_id: str) -> int:
+        """
+        Replaces the corporates of a completed job by references to shared contents, batch by batch.
+
+        Contents are referenced before the documents referencing them are replaced, so a
+        compacted document never misses its contents, and an interrupted compaction is finished
+        by the run that takes over the job.
+
+        Parameters:
+        job_id (str): The completed job ID, claimed by the caller.
+
+        Returns:
+        int: The number of compacted corporates.
+        """
+        collection_names = DataAccessConstants.MongoDB.CollectionNames
+        corporates = MongoConnection(collection_names.CORPORATES)
+        contents = MongoConnection(collection_names.CORPORATE_CONTENTS)
+
+        compacted_count = 0
+        while True:
+            documents = corporates.find_uncompacted(job_id, AppConfig.RETENTION_BATCH_SIZE)
+            if not documents:
+                break
+            compacted = [DataRetentionService.to_reference(document) for document in documents]
+            contents.acquire_contents(job_id, {content_hash: content for content_hash, content, _ in compacted})
+            corporates.replace_with_references([reference for _, _, reference in compacted])
+            compacted_count += len(documents)
+
+        MongoConnection(collection_names.JOB).mark_compacted(job_id)
+        logger.info(f"Compacted {compacted_count} corporates of job {job_id}")
+        return compacted_count
+
+    @staticmethod
+    def to_reference(document: Dict) -> Tuple[str, Dict, Dict]:
+        """
+        Splits a corporate document into its shared contents and the reference kept for the job.
+
+        Parameters:
+        document (Dict): The raw corporate document.
+
+        Returns:
+        Tuple[str, Dict, Dict]: The content hash, the contents and the reference document.
+        """
+        content_hash = document.get("content_hash") or CorporateSerializer.content_hash(document)
+        content = {
+            key: value for key, value in document.items()
+            if key not in ("_id", "job_id", "created_at", "content_hash")
+        }
+        reference = {field: document[field] for field in DataRetentionService.REFERENCE_FIELDS if field in document}
+        reference["content_hash"] = content_hash
+        reference[DataAccessConstants.MongoDB.CONTENT_REF_FIELD] = content_hash
+        return content_hash, content, reference
@@ -0,0 +1,177 @@
+import asyncio
+import math
+from typing import Dict, List, Optional, Set
+from loguru import logger
+
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.database import MongoConnection
+from src.dataaccess.glassdollar_crawler_async import AsyncGlassDollarCrawlerDataAccess
+from src.dataaccess.rate_limiter import UnresolvedCorporatesError
+from src.services.corporate_ingestion import CorporateIngestionService
+from src.services.incremental_crawl import IncrementalCrawlingService
+
+
+class GlassDollarAsyncCrawlingService:
+    """
+    A service class that crawls a whole job inside one event loop.
+
+    City pages and corporate detail batches are fetched concurrently over the shared
+    connection pool of AsyncGlassDollarCrawlerDataAccess, with at most
+    AppConfig.ASYNC_CRAWL_CONCURRENCY requests in flight.
+    """
+
+    @staticmethod
+    async def crawl(cities: List[str], job_id: str, incremental: bool = False) -> int:
+        """
+        Crawls every corporate of the given cities and stores them for the job.
+
+        A failed listing page or detail batch does not stop the rest of the crawl. Once every
+        other city, page and batch is done, the first error is raised, so the task can be
+        retried. Corporates already stored or excluded for the job are skipped, so a retried
+        crawl only fetches what is missing.
+
+        Parameters:
+        cities (List[str]): The cities to crawl corporates in.
+        job_id (str): The job ID associated with this crawl.
+        incremental (bool): Copies corporates that did not change since an earlier job
+                            instead of fetching their details again.
+
+        Returns:
+        int: The number of stored corporates.
+
+        Raises:
+        GlassDollarRequestError: If a listing page or detail batch still failed after its retries.
+        """
+        semaphore = asyncio.Semaphore(AppConfig.ASYNC_CRAWL_CONCURRENCY)
+        known_ids = await asyncio.to_thread(GlassDollarAsyncCrawlingService.get_known_ids, job_id)
+        AsyncGlassDollarCrawlerDataAccess.connect()
+        try:
+            results = await asyncio.gather(
+                *(GlassDollarAsyncCrawlingService.crawl_city(city, job_id, semaphore, incremental, known_ids)
+                  for city in cities),
+                return_exceptions=True
+            )
+        finally:
+            await AsyncGlassDollarCrawlerDataAccess.disconnect()
+            await asyncio.to_thread(MongoConnection.flush_buffer)
+
+        stored_count = sum(result for result in results if not isinstance(result, BaseException))
+        logger.info(f"Async crawl stored {stored_count} corporates for job {job_id}")
+        GlassDollarAsyncCrawlingService.raise_first_error(results, f"job {job_id}")
+        return stored_count
+
+    @staticmethod
+    def get_known_ids(job_id: str) -> Set[str]:
+        """
+        Retrieves the IDs of the corporates of a job that are stored or excluded as unresolvable.
+
+        Parameters:
+        job_id (str): The job ID.
+
+        Returns:
+        Set[str]: The corporate IDs.
+        """
+        collection_names = DataAccessConstants.MongoDB.CollectionNames
+        return (MongoConnection(collection_names.CORPORATES).get_stored_ids(job_id)
+                | MongoConnection(collection_names.ENUMERATED_CORPORATES).get_unresolvable_ids(job_id))
+
+    @staticmethod
+    def raise_first_error(results: List, scope: str) -> None:
+        """
+        Raises the first error among the results of a gather run with return_exceptions.
+
+        Parameters:
+        results (List): The results of the gather.
+        scope (str): What the results belong to, for the log.
+        """
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            logger.error(f"{len(errors)} of {len(results)} parts of {scope} failed: {errors[0]}")
+            raise errors[0]
+
+    @staticmethod
+    async def crawl_city(city: str, job_id: str, semaphore: asyncio.Semaphore, incremental: bool = False,
+                         known_ids: Optional[Set[str]] = None) -> int:
+        """
+        Fetches all pages of a city concurrently and crawls the listed corporates.
+
+        The first page is fetched alone to learn the page size and the total count,
+        the remaining pages are then requested at once. The corporates of the pages that
+        were fetched are crawled even if other pages failed.
+
+        Parameters:
+        city (str): The name of the city to crawl corporates in.
+        job_id (str): The job ID associated with this crawl.
+        semaphore (asyncio.Semaphore): Bounds the requests in flight.
+        incremental (bool): Copies corporates that did not change since an earlier job.
+        known_ids (Set[str], optional): Corporate IDs that are already handled and are skipped.
+
+        Returns:
+        int: The number of stored corporates of the city.
+
+        Raises:
+        GlassDollarRequestError: If a listing page or detail batch still failed after its retries.
+        """
+        async with semaphore:
+            rows, total_corporate_count = await AsyncGlassDollarCrawlerDataAccess.get_corporate_rows_by_city(city, 1)
+        if not rows:
+            return 0
+
+        page_count = math.ceil(total_corporate_count / len(rows))
+        pages = await asyncio.gather(
+            *(GlassDollarAsyncCrawlingService.fetch_page(city, page, semaphore) for page in range(2, page_count + 1)),
+            return_exceptions=True
+        )
+        for page_rows in pages:
+            if not isinstance(page_rows, BaseException):
+                rows.extend(page_rows)
+
+        known_ids = known_ids or set()
+        fingerprints = {
+            corporate_id: fingerprint
+            for corporate_id, fingerprint in IncrementalCrawlingService.fingerprint_rows(rows).items()
+            if corporate_id not in known_ids
+        }
+        if incremental:
+            corporate_ids = await asyncio.to_thread(IncrementalCrawlingService.reuse_unchanged, fingerprints, job_id)
+        else:
+            corporate_ids = list(fingerprints)
+        reused_count = len(fingerprints) - len(corporate_ids)
+
+        batch_size = AppConfig.CORPORATE_BATCH_SIZE
+        stored_counts = await asyncio.gather(*(
+            GlassDollarAsyncCrawlingService.crawl_batch(corporate_ids[start:start + batch_size], job_id, fingerprints, semaphore)
+            for start in range(0, len(corporate_ids), batch_size)
+        ), return_exceptions=True)
+
+        GlassDollarAsyncCrawlingService.raise_first_error(pages + stored_counts, f"city {city}")
+        return reused_count + sum(stored_counts)
+
+    @staticmethod
+    async def fetch_page(city: str, page: int, semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Fetches the listing rows of a single city page."""
+        async with semaphore:
+            rows, _ = await AsyncGlassDollarCrawlerDataAccess.get_corporate_rows_by_city(city, page)
+        return rows
+
+    @staticmethod
+    async def crawl_batch(corporate_ids: List[str], job_id: str, fingerprints: Dict[str, str],
+                          semaphore: asyncio.Semaphore) -> int:
+        """
+        Fetches the details of a batch of corporates and stores them.
+
+        The blocking MongoDB write runs in a worker thread so the event loop keeps serving
+        the other requests in flight. Corporates the API returned no details for are excluded
+        from the job.
+
+        Returns:
+        int: The number of stored corporates of the batch.
+        """
+        try:
+            async with semaphore:
+                corporates_data = await AsyncGlassDollarCrawlerDataAccess.get_corporate_details_batch(corporate_ids)
+        except UnresolvedCorporatesError as ex:
+            corporates_data = ex.corporates
+            await asyncio.to_thread(CorporateIngestionService.exclude_corporates, ex.corporate_ids, job_id)
+        return await asyncio.to_thread(CorporateIngestionService.store_corporates, corporates_data, job_id, fingerprints)
@@ -1,7 +1,10 @@
+from typing import List, Optional
 from fastapi import HTTPException
 from loguru import logger
 
-from src.celery.app import city_task
+from src.celery.app import city_task, async_crawl_task, enumeration_task, resume_task
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
 from src.dataaccess.glassdollar_crawler import GlassDollarCrawlerDataAccess
 from src.dataaccess.database import MongoConnection
 from src.schemas.job import Job
@@ -13,12 +16,14 @@ class GlassDollarCrawlingService:
     """
 
     @staticmethod
-    def start_crawling(job_id: str) -> None:
+    def start_crawling(job_id: str, incremental: bool = False) -> None:
         """
         Initiates the crawling process with a given job_id.
 
         Parameters:
         job_id (str): Unique identifier for the crawling job.
+        incremental (bool): Reuses corporates that did not change since an earlier job
+                            instead of fetching their details again.
 
         Raises:
         HTTPException: If the job ID has already been used.
@@ -31,11 +36,45 @@ class GlassDollarCrawlingService:
 
         cities = GlassDollarCrawlerDataAccess.get_cities()
         total_corporate_count = GlassDollarCrawlerDataAccess.get_total_corporate_count(cities)
-        GlassDollarCrawlingService.create_job(job_id, total_corporate_count)
+        enumeration = DataAccessConstants.MongoDB.Enumeration.CITY
+        if AppConfig.CRAWL_ENGINE != "async" and AppConfig.CRAWL_ENUMERATION == DataAccessConstants.MongoDB.Enumeration.GLOBAL:
+            enumeration = DataAccessConstants.MongoDB.Enumeration.GLOBAL
+        GlassDollarCrawlingService.create_job(job_id, total_corporate_count, cities, enumeration, incremental)
+
+        if AppConfig.CRAWL_ENGINE == "async":
+            async_crawl_task.delay(cities, job_id, incremental)
+            logger.info(f"Async crawl task created with job id {job_id}")
+            return
+
+        if enumeration == DataAccessConstants.MongoDB.Enumeration.GLOBAL:
+            enumeration_task.delay(cities, job_id, incremental)
+            logger.info(f"Enumeration task created with job id {job_id}")
+            return
+
         for city in cities:
-            city_task.delay(city, job_id)
+            city_task.delay(city, job_id, incremental)
             logger.info(f"Task created for {city} with job id {job_id}")
 
+    @staticmethod
+    def resume_crawling(job_id: str) -> None:
+        """
+        Re-enqueues the crawling work a partial job is missing, e.g. after its workers crashed.
+
+        Parameters:
+        job_id (str): The job ID to resume.
+
+        Raises:
+        HTTPException: If there is no job with the job ID, or if the job is already completed.
+        """
+        job = MongoConnection("job").get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"There is no job with {job_id}")
+        if job.get("status") == DataAccessConstants.MongoDB.JobStatus.COMPLETED:
+            raise HTTPException(status_code=400, detail="This job is already completed.")
+
+        resume_task.delay(job_id)
+        logger.info(f"Resume task created with job id {job_id}")
+
     @staticmethod
     def does_job_id_exist(job_id: str) -> bool:
         """
@@ -50,16 +89,23 @@ class GlassDollarCrawlingService:
         return MongoConnection("job").does_job_id_exist(job_id)
 
     @staticmethod
-    def create_job(job_id: str, total_corporate_count: int) -> None:
+    def create_job(job_id: str, total_corporate_count: int, cities: Optional[List[str]] = None,
+                   enumeration: str = DataAccessConstants.MongoDB.Enumeration.CITY, incremental: bool = False) -> None:
         """
         Creates a new job entry in the database.
 
         Parameters:
         job_id (str): The job ID for the new job.
         total_corporate_count (int): The total count of corporates to be crawled.
+        cities (List[str], optional): The cities to be crawled, kept to resume the job.
+        enumeration (str): "city" or "global", the way the corporates of the cities are listed.
+        incremental (bool): Whether unchanged corporates are copied from earlier jobs.
         """
         job = Job(
             job_id=job_id,
-            total_corporate_count=total_corporate_count
+            total_corporate_count=total_corporate_count,
+            cities=cities or [],
+            enumeration=enumeration,
+            incremental=incremental
         )
         MongoConnection("job").insert_one(job.model_dump())
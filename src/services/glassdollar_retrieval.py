@@ -1,67 +1,214 @@
-from typing import List, Union
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
+from src.configs.app import AppConfig
 from src.constants.dataaccess import DataAccessConstants
-from src.dataaccess.database import MongoConnection
+from src.dataaccess.async_database import AsyncMongoConnection
 from src.schemas.corporates import Corporate
+from src.services.corporate_serializer import CorporateSerializer
+from src.services.search_index import SearchIndexService
 
 
 class GlassDollarRetrievalService:
+    """
+    A service class for reading crawled GlassDollar data on the API side.
+
+    Its methods are coroutines reading through AsyncMongoConnection, so the event loop
+    keeps serving other requests while a query is in flight. With AppConfig.FAST_SERIALIZATION
+    pages are returned as the raw documents, to be encoded by CorporateSerializer.
+    """
+
     @staticmethod
-    def get_documents(job_id: str) -> Union[dict, List[Corporate]]:
+    async def get_documents(job_id: str, fields: Optional[List[str]] = None, after: Optional[str] = None,
+                            limit: Optional[int] = None) -> Union[dict, Tuple[List[Union[Corporate, Dict]], Optional[str]]]:
         """
         Retrieves documents for a specific job_id.
 
         Parameters:
         job_id (str): The job ID to fetch documents for.
+        fields (List[str], optional): Only these fields are returned when given.
+        after (str, optional): The cursor returned with the previous page.
+        limit (int, optional): The maximum number of documents of the page.
 
         Returns:
-        Union[List[dict], dict]: A list of documents or a dict if the job is not completed.
+        Union[Tuple[List[Union[Corporate, Dict]], Optional[str]], dict]: A page of documents with the cursor of
+                                                                         the next page, or a dict if the job
+                                                                         is not completed.
         """
-        is_completed = GlassDollarRetrievalService.is_job_completed(job_id)
+        is_completed = await GlassDollarRetrievalService.is_job_completed(job_id)
 
         if not is_completed:
             return {"message": "Come Back Later"}
 
-        documents = MongoConnection("corporates").fetch_by_job_id(job_id, DataAccessConstants.GlassDollar.EXCLUDED_FIELDS)
+        documents = await AsyncMongoConnection("corporates").fetch_by_job_id(
+            job_id, DataAccessConstants.GlassDollar.EXCLUDED_FIELDS, fields, after, limit, AppConfig.FAST_SERIALIZATION
+        )
 
         return documents
 
     @staticmethod
-    def get_latest_documents() -> List[Corporate]:
+    async def get_latest_documents(fields: Optional[List[str]] = None, after: Optional[str] = None,
+                                   limit: Optional[int] = None, job_id: Optional[str] = None) -> Tuple[List[Union[Corporate, Dict]], Optional[str]]:
         """
         Retrieves the latest completed documents from the database.
 
+        Parameters:
+        fields (List[str], optional): Only these fields are returned when given.
+        after (str, optional): The cursor returned with the previous page.
+        limit (int, optional): The maximum number of documents of the page.
+        job_id (str, optional): The latest completed job ID, when the caller already resolved it.
+
         Returns:
-        List[Corporate]: A list of the Corporate documents.
+        Tuple[List[Union[Corporate, Dict]], Optional[str]]: A page of documents with the cursor of the next page.
         """
-        latest_completed_job_id = MongoConnection("job").get_latest_completed_job_id()
-        if not latest_completed_job_id:
-            raise ValueError("There is no completed job")
-        documents = MongoConnection("corporates").fetch_by_job_id(latest_completed_job_id, DataAccessConstants.GlassDollar.EXCLUDED_FIELDS)
+        latest_completed_job_id = job_id or await GlassDollarRetrievalService.get_latest_completed_job_id()
+        documents = await AsyncMongoConnection("corporates").fetch_by_job_id(
+            latest_completed_job_id, DataAccessConstants.GlassDollar.EXCLUDED_FIELDS, fields, after, limit,
+            AppConfig.FAST_SERIALIZATION
+        )
         return documents
 
     @staticmethod
-    def search_documents(keyword) -> List[Corporate]:
+    async def stream_documents(job_id: str, output_format: str, fields: Optional[List[str]] = None) -> Union[dict, AsyncIterator[bytes]]:
         """
-        Searches for documents that match a given keyword.
+        Streams the documents of a specific job_id, encoded straight from the MongoDB cursor.
 
         Parameters:
-        keyword (str): The keyword to search for.
+        job_id (str): The job ID to fetch documents for.
+        output_format (str): "ndjson" for one document per line, "json" for a JSON array.
+        fields (List[str], optional): Only these fields are returned when given.
 
         Returns:
-        List[Corporate]: A list of Corporate matching the keyword.
+        Union[AsyncIterator[bytes], dict]: The encoded document stream or a dict if the job is not completed.
+        """
+        is_completed = await GlassDollarRetrievalService.is_job_completed(job_id)
+
+        if not is_completed:
+            return {"message": "Come Back Later"}
+
+        documents = AsyncMongoConnection("corporates").iter_by_job_id(job_id, DataAccessConstants.GlassDollar.EXCLUDED_FIELDS, fields)
+        return GlassDollarRetrievalService.encode_stream(documents, output_format)
+
+    @staticmethod
+    async def stream_latest_documents(output_format: str, fields: Optional[List[str]] = None) -> AsyncIterator[bytes]:
         """
-        latest_completed_job_id = MongoConnection("job").get_latest_completed_job_id()
+        Streams the documents of the latest completed job, encoded straight from the MongoDB cursor.
+
+        Parameters:
+        output_format (str): "ndjson" for one document per line, "json" for a JSON array.
+        fields (List[str], optional): Only these fields are returned when given.
+
+        Returns:
+        AsyncIterator[bytes]: The encoded document stream.
+        """
+        latest_completed_job_id = await GlassDollarRetrievalService.get_latest_completed_job_id()
+        documents = AsyncMongoConnection("corporates").iter_by_job_id(
+            latest_completed_job_id, DataAccessConstants.GlassDollar.EXCLUDED_FIELDS, fields
+        )
+        return GlassDollarRetrievalService.encode_stream(documents, output_format)
+
+    @staticmethod
+    async def encode_stream(documents: AsyncIterator[Dict], output_format: str) -> AsyncIterator[bytes]:
+        """
+        Encodes raw documents one at a time as NDJSON lines or as the items of a JSON array.
+
+        Parameters:
+        documents (AsyncIterator[Dict]): The raw documents.
+        output_format (str): "ndjson" or "json".
+
+        Returns:
+        AsyncIterator[bytes]: The encoded chunks.
+        """
+        if output_format == "ndjson":
+            async for document in documents:
+                yield GlassDollarRetrievalService.encode_document(document) + b"\n"
+            return
+
+        yield b"["
+        separator = b""
+        async for document in documents:
+            yield separator + GlassDollarRetrievalService.encode_document(document)
+            separator = b","
+        yield b"]"
+
+    @staticmethod
+    def encode_document(document: Dict) -> bytes:
+        """
+        Encodes a raw document the way the Corporate response model does, leaving out None values.
+
+        Parameters:
+        document (Dict): The raw document.
+
+        Returns:
+        bytes: The JSON encoded document.
+        """
+        return CorporateSerializer.encode_document(document)
+
+    @staticmethod
+    async def search_documents(keyword, fields: Optional[List[str]] = None, limit: Optional[int] = None, offset: int = 0,
+                               job_id: Optional[str] = None) -> Tuple[List[Union[Corporate, Dict]], Optional[str]]:
+        """
+        Searches the documents of the latest completed job, ranked by relevance.
+
+        Parameters:
+        keyword (str): The search query. Every term has to match a term of the document or be its prefix.
+        fields (List[str], optional): Only these fields are returned when given.
+        limit (int, optional): The maximum number of documents of the page.
+        offset (int): The number of top ranked documents skipped.
+        job_id (str, optional): The latest completed job ID, when the caller already resolved it.
+
+        Returns:
+        Tuple[List[Union[Corporate, Dict]], Optional[str]]: A page of Corporate matching the keyword, or of
+                                                           raw documents holding only the requested fields.
+                                                           Ranked pages are addressed by offset, so the
+                                                           cursor is always None.
+        """
+        latest_completed_job_id = job_id or await GlassDollarRetrievalService.get_latest_completed_job_id()
+        index = await SearchIndexService.get_index(latest_completed_job_id)
+        documents = index.search(keyword, limit, offset).documents
+        if fields:
+            documents = [document.model_dump(include=set(fields)) for document in documents]
+        return documents, None
+
+    @staticmethod
+    async def get_search_facets(keyword: str, job_id: Optional[str] = None) -> Dict:
+        """
+        Counts the documents of the latest completed job matching a keyword by country and startup theme.
+
+        Parameters:
+        keyword (str): The search query.
+        job_id (str, optional): The latest completed job ID, when the caller already resolved it.
+
+        Returns:
+        Dict: The number of matching documents and the counts of each facet.
+        """
+        latest_completed_job_id = job_id or await GlassDollarRetrievalService.get_latest_completed_job_id()
+        index = await SearchIndexService.get_index(latest_completed_job_id)
+        return {"total": len(index.match(keyword)), "facets": index.facets(keyword)}
+
+    @staticmethod
+    async def get_latest_completed_job_id() -> str:
+        """
+        Retrieves the ID of the latest completed job.
+
+        Returns:
+        str: The job ID.
+
+        Raises:
+        ValueError: If there is no completed job.
+        """
+        latest_completed_job_id = await AsyncMongoConnection("job").get_latest_completed_job_id()
         if not latest_completed_job_id:
             raise ValueError("There is no completed job")
-        documents = MongoConnection("corporates").search(latest_completed_job_id, keyword, DataAccessConstants.GlassDollar.EXCLUDED_FIELDS)
-        return documents
+        return latest_completed_job_id
 
     @staticmethod
-    def is_job_completed(job_id: str) -> bool:
+    async def is_job_completed(job_id: str) -> bool:
         """
         Checks if a job with the given ID has been completed.
 
+        The status of the job is the only definition of completed, the same one the latest
+        completed job is looked up by. An expired job, which is being deleted, is not completed.
+
         Parameters:
         job_id (str): The job ID to check.
 
@@ -71,10 +218,7 @@ class GlassDollarRetrievalService:
         Raises:
         ValueError: If there is no job with the given job ID.
         """
-        counter, total_corporate_count = MongoConnection("job").get_counter_and_total_value(job_id)
-        if not counter and not total_corporate_count:
+        job = await AsyncMongoConnection("job").get_job_progress(job_id)
+        if job is None:
             raise ValueError(f"There is no job with {job_id}")
-        elif counter == total_corporate_count:
-            return True
-        else:
-            return False
+        return job.get("status") == DataAccessConstants.MongoDB.JobStatus.COMPLETED
@@ -0,0 +1,80 @@
+import hashlib
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+from loguru import logger
+
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.database import MongoConnection
+from src.monitoring.metrics import CORPORATES
+
+
+class IncrementalCrawlingService:
+    """
+    A service class that lets a crawl reuse corporates that did not change since an earlier job.
+
+    Every corporate is fingerprinted from its listing row (name, city, country and
+    startup_partners_count). The fingerprint is stored with the job holding the corporate's
+    full document, so a later incremental crawl can copy that document instead of fetching
+    its details again.
+    """
+
+    @staticmethod
+    def fingerprint_rows(rows: List[Dict]) -> Dict[str, str]:
+        """
+        Fingerprints listing rows.
+
+        Parameters:
+        rows (List[Dict]): Listing rows as returned by the GlassDollar API.
+
+        Returns:
+        Dict[str, str]: The fingerprints by corporate ID.
+        """
+        return {
+            row["id"]: hashlib.sha1(json.dumps(row, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+            for row in rows
+        }
+
+    @staticmethod
+    def reuse_unchanged(fingerprints: Dict[str, str], job_id: str) -> List[str]:
+        """
+        Copies the corporates whose fingerprint did not change into the job.
+
+        Copies are stored through the write-behind buffer, so they advance the job counter
+        like crawled corporates. Corporates whose earlier document can no longer be found are
+        treated as changed.
+
+        Parameters:
+        fingerprints (Dict[str, str]): The current fingerprints by corporate ID.
+        job_id (str): The job ID to copy the corporates into.
+
+        Returns:
+        List[str]: The IDs of new or changed corporates, whose details have to be fetched.
+        """
+        collection_names = DataAccessConstants.MongoDB.CollectionNames
+        stored_fingerprints = MongoConnection(collection_names.FINGERPRINTS).get_fingerprints(list(fingerprints))
+
+        unchanged_ids_by_job = defaultdict(list)
+        for corporate_id, fingerprint in fingerprints.items():
+            stored_fingerprint = stored_fingerprints.get(corporate_id)
+            if stored_fingerprint and stored_fingerprint["fingerprint"] == fingerprint and stored_fingerprint["job_id"] != job_id:
+                unchanged_ids_by_job[stored_fingerprint["job_id"]].append(corporate_id)
+
+        reused_ids = set()
+        created_at = datetime.now()
+        for source_job_id, corporate_ids in unchanged_ids_by_job.items():
+            documents = MongoConnection(collection_names.CORPORATES).fetch_by_ids(source_job_id, corporate_ids)
+            for document in documents:
+                document["job_id"] = job_id
+                document["created_at"] = created_at
+            MongoConnection.buffer_corporates(documents)
+            reused_ids.update(document["id"] for document in documents)
+
+        MongoConnection(collection_names.FINGERPRINTS).upsert_fingerprints(
+            {corporate_id: fingerprints[corporate_id] for corporate_id in reused_ids}, job_id
+        )
+        CORPORATES.labels("reused").inc(len(reused_ids))
+        logger.info(f"Reused {len(reused_ids)} of {len(fingerprints)} unchanged corporates for job {job_id}")
+
+        return [corporate_id for corporate_id in fingerprints if corporate_id not in reused_ids]
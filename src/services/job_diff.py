@@ -0,0 +1,141 @@
+from typing import AsyncIterator, Dict, List, Union
+import orjson
+
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.services.corporate_serializer import CorporateSerializer
+from src.services.glassdollar_retrieval import GlassDollarRetrievalService
+
+
+class JobDiffService:
+    """
+    A service class comparing the corporates of two completed jobs.
+
+    The changed corporate IDs are found inside MongoDB by comparing the content hashes
+    stored at ingest, so only the documents of the change set are read and sent.
+    """
+
+    COMPARED_FIELDS = [
+        "name", "description", "logo_url", "hq_city", "hq_country", "website_url", "linkedin_url",
+        "twitter_url", "startup_partners_count", "startup_partners", "startup_themes",
+    ]
+
+    @staticmethod
+    async def stream_diff(job_id: str, other_job_id: str) -> Union[dict, AsyncIterator[bytes]]:
+        """
+        Streams the differences between two jobs as NDJSON.
+
+        Parameters:
+        job_id (str): The job ID compared from.
+        other_job_id (str): The job ID compared to.
+
+        Returns:
+        Union[AsyncIterator[bytes], dict]: The encoded differences, or a dict if a job is not completed.
+
+        Raises:
+        ValueError: If there is no job with one of the job IDs.
+        """
+        for checked_job_id in (job_id, other_job_id):
+            if not await GlassDollarRetrievalService.is_job_completed(checked_job_id):
+                return {"message": "Come Back Later"}
+        return JobDiffService.encode_diff(job_id, other_job_id)
+
+    @staticmethod
+    async def encode_diff(job_id: str, other_job_id: str) -> AsyncIterator[bytes]:
+        """
+        Encodes one line per added, removed or changed corporate, AppConfig.DIFF_BATCH_SIZE corporates at a time.
+
+        Added and removed corporates carry their document; changed corporates carry the old and
+        new value of every changed field, and the added and removed startup partners.
+
+        Parameters:
+        job_id (str): The job ID compared from.
+        other_job_id (str): The job ID compared to.
+
+        Returns:
+        AsyncIterator[bytes]: The NDJSON lines.
+        """
+        corporates = AsyncMongoConnection(DataAccessConstants.MongoDB.CollectionNames.CORPORATES)
+        batch = []
+        async for changed in corporates.iter_changed_ids(job_id, other_job_id):
+            batch.append(changed)
+            if len(batch) >= AppConfig.DIFF_BATCH_SIZE:
+                for line in await JobDiffService.diff_batch(corporates, job_id, other_job_id, batch):
+                    yield line
+                batch = []
+        if batch:
+            for line in await JobDiffService.diff_batch(corporates, job_id, other_job_id, batch):
+                yield line
+
+    @staticmethod
+    async def diff_batch(corporates: AsyncMongoConnection, job_id: str, other_job_id: str,
+                         batch: List[Dict]) -> List[bytes]:
+        """
+        Reads the documents of a batch of changed corporates from both jobs and encodes their differences.
+
+        Parameters:
+        corporates (AsyncMongoConnection): The corporates collection.
+        job_id (str): The job ID compared from.
+        other_job_id (str): The job ID compared to.
+        batch (List[Dict]): The changed corporate IDs with the jobs holding them.
+
+        Returns:
+        List[bytes]: The NDJSON lines, in the order of the batch.
+        """
+        corporate_ids = [changed["_id"] for changed in batch]
+        old_documents = {document["id"]: document for document in await corporates.fetch_by_ids(job_id, corporate_ids)}
+        new_documents = {document["id"]: document for document in await corporates.fetch_by_ids(other_job_id, corporate_ids)}
+
+        lines = []
+        for corporate_id in corporate_ids:
+            old_document, new_document = old_documents.get(corporate_id), new_documents.get(corporate_id)
+            if old_document is None and new_document is None:
+                continue
+            if old_document is None:
+                change = {"change": "added", "id": corporate_id, "document": JobDiffService.public_document(new_document)}
+            elif new_document is None:
+                change = {"change": "removed", "id": corporate_id, "document": JobDiffService.public_document(old_document)}
+            else:
+                fields = JobDiffService.diff_fields(old_document, new_document)
+                if not fields:
+                    continue
+                change = {"change": "changed", "id": corporate_id, "name": new_document.get("name"), "fields": fields}
+            lines.append(orjson.dumps(change, default=str) + b"\n")
+        return lines
+
+    @staticmethod
+    def public_document(document: Dict) -> Dict:
+        """Drops the fields that are never returned from a raw document."""
+        return CorporateSerializer.clean({
+            key: value for key, value in document.items()
+            if key not in DataAccessConstants.GlassDollar.EXCLUDED_FIELDS
+        })
+
+    @staticmethod
+    def diff_fields(old_document: Dict, new_document: Dict) -> Dict:
+        """
+        Compares the fields of two versions of a corporate.
+
+        Parameters:
+        old_document (Dict): The document of the job compared from.
+        new_document (Dict): The document of the job compared to.
+
+        Returns:
+        Dict: {"old", "new"} values by changed field; startup partners as their "added" and "removed" partners.
+        """
+        fields = {}
+        for field in JobDiffService.COMPARED_FIELDS:
+            old_value, new_value = old_document.get(field), new_document.get(field)
+            if old_value == new_value:
+                continue
+            if field == "startup_partners":
+                old_partners = [CorporateSerializer.clean(partner) for partner in old_value or []]
+                new_partners = [CorporateSerializer.clean(partner) for partner in new_value or []]
+                added = [partner for partner in new_partners if partner not in old_partners]
+                removed = [partner for partner in old_partners if partner not in new_partners]
+                if added or removed:
+                    fields[field] = {"added": added, "removed": removed}
+            else:
+                fields[field] = {"old": old_value, "new": new_value}
+        return fields
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import AsyncIterator, Dict, Tuple
+
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.schemas.job import JobProgress
+
+
+class JobProgressService:
+    """
+    A service class reporting the progress of crawling jobs.
+
+    Progress is read with a single projected query on the job document. The event stream
+    polls it every AppConfig.JOB_PROGRESS_POLL_INTERVAL seconds through an in-process cache,
+    so every subscriber of a job in the API process shares one read per interval.
+    """
+
+    progress_cache: Dict[str, Tuple[JobProgress, float]] = {}
+
+    @staticmethod
+    async def get_progress(job_id: str) -> JobProgress:
+        """
+        Retrieves the progress of a job.
+
+        Parameters:
+        job_id (str): The job ID.
+
+        Returns:
+        JobProgress: The counter, total, rate and estimated time to completion of the job.
+
+        Raises:
+        ValueError: If there is no job with the given job ID.
+        """
+        job = await AsyncMongoConnection(DataAccessConstants.MongoDB.CollectionNames.JOB).get_job_progress(job_id)
+        if job is None:
+            raise ValueError(f"There is no job with {job_id}")
+        return JobProgressService.build_progress(job_id, job)
+
+    @staticmethod
+    def build_progress(job_id: str, job: Dict) -> JobProgress:
+        """
+        Derives the progress of a job from its document.
+
+        The rate is the number of stored corporates per second since the job was created,
+        and the ETA the time the remaining corporates take at that rate.
+
+        Parameters:
+        job_id (str): The job ID.
+        job (Dict): The progress fields of the job document.
+
+        Returns:
+        JobProgress: The progress.
+        """
+        counter = job.get("counter", 0)
+        total_corporate_count = job.get("total_corporate_count", 0)
+        is_completed = counter >= total_corporate_count
+        status = job.get("status") or (
+            DataAccessConstants.MongoDB.JobStatus.COMPLETED if is_completed else DataAccessConstants.MongoDB.JobStatus.RUNNING
+        )
+
+        created_at = job.get("created_at")
+        completed_at = job.get("completed_at")
+        elapsed = ((completed_at or datetime.now()) - created_at).total_seconds() if created_at else 0.0
+        rate = counter / elapsed if elapsed > 0 else 0.0
+        if status == DataAccessConstants.MongoDB.JobStatus.COMPLETED:
+            eta_seconds = 0.0
+        else:
+            eta_seconds = max(0, total_corporate_count - counter) / rate if rate else None
+
+        return JobProgress(
+            job_id=job_id,
+            status=status,
+            counter=counter,
+            total_corporate_count=total_corporate_count,
+            progress=min(1.0, counter / total_corporate_count) if total_corporate_count else 1.0,
+            rate=round(rate, 3),
+            eta_seconds=round(eta_seconds, 1) if eta_seconds is not None else None,
+            created_at=created_at,
+            completed_at=completed_at,
+        )
+
+    @staticmethod
+    async def get_polled_progress(job_id: str) -> JobProgress:
+        """
+        Retrieves the progress of a job, read at most once per AppConfig.JOB_PROGRESS_POLL_INTERVAL.
+
+        Parameters:
+        job_id (str): The job ID.
+
+        Returns:
+        JobProgress: The progress.
+        """
+        cached = JobProgressService.progress_cache.get(job_id)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+
+        progress = await JobProgressService.get_progress(job_id)
+        JobProgressService.progress_cache[job_id] = (progress, time.monotonic() + AppConfig.JOB_PROGRESS_POLL_INTERVAL)
+        for cached_job_id, (_, expires_at) in list(JobProgressService.progress_cache.items()):
+            if time.monotonic() >= expires_at + AppConfig.JOB_PROGRESS_POLL_INTERVAL:
+                JobProgressService.progress_cache.pop(cached_job_id, None)
+        return progress
+
+    @staticmethod
+    async def stream_progress(job_id: str) -> AsyncIterator[bytes]:
+        """
+        Streams the progress of a job as Server-Sent Events.
+
+        A `progress` event is sent whenever the counter or status changes, and a comment
+        every AppConfig.JOB_PROGRESS_KEEPALIVE_INTERVAL seconds in between to keep proxies
+        from closing the connection. The stream ends after the job completes or expires, the
+        last `progress` event carrying the final status. If the job document is deleted meanwhile,
+        a `deleted` event is sent and the stream ends.
+
+        Parameters:
+        job_id (str): The job ID, which has to exist.
+
+        Returns:
+        AsyncIterator[bytes]: The events.
+        """
+        last_state = None
+        last_sent_at = time.monotonic()
+        while True:
+            try:
+                progress = await JobProgressService.get_polled_progress(job_id)
+            except ValueError:
+                yield f"event: deleted\ndata: {json.dumps({'job_id': job_id})}\n\n".encode()
+                return
+            state = (progress.counter, progress.total_corporate_count, progress.status)
+            if state != last_state:
+                yield f"event: progress\ndata: {progress.model_dump_json()}\n\n".encode()
+                last_state = state
+                last_sent_at = time.monotonic()
+            elif time.monotonic() - last_sent_at >= AppConfig.JOB_PROGRESS_KEEPALIVE_INTERVAL:
+                yield b": keep-alive\n\n"
+                last_sent_at = time.monotonic()
+
+            if progress.status in (DataAccessConstants.MongoDB.JobStatus.COMPLETED,
+                                   DataAccessConstants.MongoDB.JobStatus.EXPIRED):
+                return
+            await asyncio.sleep(AppConfig.JOB_PROGRESS_POLL_INTERVAL)
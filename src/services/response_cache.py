@@ -0,0 +1,182 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Union
+from loguru import logger
+from pydantic import TypeAdapter
+
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.schemas.corporates import Corporate
+from src.services.corporate_serializer import CorporateSerializer
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    next_cursor: Optional[str]
+
+
+class ResponseCacheService:
+    """
+    A service class caching serialized retrieval and search responses.
+
+    The corporates of a completed job never change, so a response is fully determined by
+    the job ID, the query, the requested fields and the page. Responses are kept as
+    serialized JSON bytes with an ETag, so a hit is neither read from MongoDB nor validated
+    into Corporate again, and clients can revalidate with If-None-Match.
+
+    Entries live in an in-process LRU bounded by RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_MAX_BYTES and RESPONSE_CACHE_TTL. With RESPONSE_CACHE_SHARED they are
+    also stored in the response_cache collection, expired by a TTL index, so every API
+    process shares them.
+
+    Keys hold the resolved job ID, so the latest-job endpoints move on to fresh keys as
+    soon as a new job completes and the entries of older jobs simply age out.
+    """
+
+    entries = OrderedDict()
+    size = 0
+    lock = threading.Lock()
+    corporates_adapter = TypeAdapter(List[Corporate])
+    SHARED_MAX_BYTES = 15 * 1024 * 1024
+
+    @staticmethod
+    def build_key(kind: str, job_id: str, keyword: Optional[str] = None, fields: Optional[List[str]] = None,
+                  after: Optional[str] = None, limit: Optional[int] = None, offset: Optional[int] = None) -> str:
+        """
+        Builds the cache key of a response.
+
+        Parameters:
+        kind (str): The kind of response, e.g. "documents" or "search".
+        job_id (str): The completed job ID the response is read from.
+        keyword (str, optional): The search keyword.
+        fields (List[str], optional): The requested fields.
+        after (str, optional): The page cursor.
+        limit (int, optional): The page size.
+        offset (int, optional): The number of ranked documents skipped.
+
+        Returns:
+        str: The cache key.
+        """
+        key = json.dumps([kind, job_id, keyword, fields, after, limit, offset], ensure_ascii=False)
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    @staticmethod
+    async def get(key: str) -> Optional[CachedResponse]:
+        """
+        Retrieves a cached response, from the shared backend when the process does not hold it.
+
+        Parameters:
+        key (str): The cache key.
+
+        Returns:
+        Optional[CachedResponse]: The cached response, None on a miss.
+        """
+        with ResponseCacheService.lock:
+            entry = ResponseCacheService.entries.get(key)
+            if entry is not None:
+                cached_response, expires_at = entry
+                if expires_at > time.monotonic():
+                    ResponseCacheService.entries.move_to_end(key)
+                    return cached_response
+                ResponseCacheService.evict(key)
+
+        if not ResponseCacheService.is_shared():
+            return None
+        document = await AsyncMongoConnection(DataAccessConstants.MongoDB.CollectionNames.RESPONSE_CACHE).get_cached_response(key)
+        if document is None:
+            return None
+        cached_response = CachedResponse(document["body"], document["etag"], document["next_cursor"])
+        ResponseCacheService.store_locally(key, cached_response)
+        return cached_response
+
+    @staticmethod
+    async def put(key: str, documents: List[Union[Corporate, Dict]], next_cursor: Optional[str]) -> CachedResponse:
+        """
+        Serializes a page of documents and caches it.
+
+        Parameters:
+        key (str): The cache key.
+        documents (List[Union[Corporate, Dict]]): The documents of the response, Corporate models or
+                                                  trusted raw documents encoded by CorporateSerializer.
+        next_cursor (str, optional): The cursor of the next page.
+
+        Returns:
+        CachedResponse: The cached response.
+        """
+        if documents and isinstance(documents[0], dict):
+            body = CorporateSerializer.encode_documents(documents)
+        else:
+            body = ResponseCacheService.corporates_adapter.dump_json(documents, exclude_none=True)
+        cached_response = CachedResponse(body, f'"{hashlib.sha1(body).hexdigest()}"', next_cursor)
+        ResponseCacheService.store_locally(key, cached_response)
+
+        if ResponseCacheService.is_shared() and len(body) <= ResponseCacheService.SHARED_MAX_BYTES:
+            try:
+                await AsyncMongoConnection(DataAccessConstants.MongoDB.CollectionNames.RESPONSE_CACHE).set_cached_response(key, {
+                    "body": body,
+                    "etag": cached_response.etag,
+                    "next_cursor": next_cursor,
+                    "expires_at": datetime.utcnow() + timedelta(seconds=AppConfig.RESPONSE_CACHE_TTL),
+                })
+            except Exception as ex:
+                logger.warning(f"Could not store the response in the shared cache: {ex}")
+        return cached_response
+
+    @staticmethod
+    def store_locally(key: str, cached_response: CachedResponse) -> None:
+        """Stores a response in the in-process LRU, evicting the least recently used entries over the bounds."""
+        if len(cached_response.body) > AppConfig.RESPONSE_CACHE_MAX_BYTES:
+            return
+
+        with ResponseCacheService.lock:
+            ResponseCacheService.evict(key)
+            ResponseCacheService.entries[key] = (cached_response, time.monotonic() + AppConfig.RESPONSE_CACHE_TTL)
+            ResponseCacheService.size += len(cached_response.body)
+            while (len(ResponseCacheService.entries) > AppConfig.RESPONSE_CACHE_MAX_ENTRIES
+                   or ResponseCacheService.size > AppConfig.RESPONSE_CACHE_MAX_BYTES):
+                ResponseCacheService.evict(next(iter(ResponseCacheService.entries)))
+
+    @staticmethod
+    def evict(key: str) -> None:
+        """Drops an entry of the in-process LRU. The caller holds the lock."""
+        entry = ResponseCacheService.entries.pop(key, None)
+        if entry is not None:
+            ResponseCacheService.size -= len(entry[0].body)
+
+    @staticmethod
+    def clear() -> None:
+        """Drops every entry of the in-process LRU."""
+        with ResponseCacheService.lock:
+            ResponseCacheService.entries.clear()
+            ResponseCacheService.size = 0
+
+    @staticmethod
+    def is_shared() -> bool:
+        """Returns whether responses are shared through MongoDB."""
+        return AppConfig.RESPONSE_CACHE_SHARED and AsyncMongoConnection.client is not None
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """
+        Checks an If-None-Match header against an ETag, using the weak comparison of RFC 9110.
+
+        Parameters:
+        if_none_match (str, optional): The If-None-Match request header.
+        etag (str): The ETag of the cached response.
+
+        Returns:
+        bool: Whether the client already holds the response.
+        """
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == etag:
+                return True
+        return False
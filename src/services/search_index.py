@@ -0,0 +1,220 @@
+import asyncio
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict
+from heapq import nlargest
+from typing import Dict, List, NamedTuple, Optional
+from loguru import logger
+
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.schemas.corporates import Corporate
+
+
+class SearchResult(NamedTuple):
+    total: int
+    documents: List[Corporate]
+
+
+class SearchIndex:
+    """
+    An in-memory inverted index over the corporates of a completed job.
+
+    Documents are ranked with BM25 over the searchable fields, each term occurrence weighted
+    by the field it appears in (SEARCH_FIELD_WEIGHTS). Every query term has to match, either
+    exactly or as the prefix of an indexed term; prefix matches score PREFIX_MATCH_WEIGHT of
+    an exact match. The BM25 score of every posting is computed once at build time, so a
+    query only merges the postings of its terms.
+    """
+
+    SEARCH_FIELD_WEIGHTS = {
+        "name": 3.0,
+        "hq_city": 1.5,
+        "hq_country": 1.5,
+        "startup_themes": 1.0,
+        "description": 1.0,
+    }
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    PREFIX_MATCH_WEIGHT = 0.5
+    MAX_PREFIX_EXPANSIONS = 100
+    FACET_FIELDS = ["hq_country", "startup_themes"]
+
+    def __init__(self, documents: List[Corporate]):
+        """
+        Builds the index.
+
+        Parameters:
+        documents (List[Corporate]): The corporates of the job.
+        """
+        self.documents = documents
+        term_frequencies = []
+        lengths = []
+        for document in documents:
+            frequencies = Counter()
+            for field, weight in SearchIndex.SEARCH_FIELD_WEIGHTS.items():
+                for term in SearchIndex.tokenize(" ".join(SearchIndex.field_values(document, field))):
+                    frequencies[term] += weight
+            term_frequencies.append(frequencies)
+            lengths.append(sum(frequencies.values()))
+
+        average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        document_frequencies = Counter(term for frequencies in term_frequencies for term in frequencies)
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for position, frequencies in enumerate(term_frequencies):
+            normalization = SearchIndex.BM25_K1 * (
+                1 - SearchIndex.BM25_B + SearchIndex.BM25_B * lengths[position] / (average_length or 1.0)
+            )
+            for term, frequency in frequencies.items():
+                document_frequency = document_frequencies[term]
+                idf = math.log(1 + (len(documents) - document_frequency + 0.5) / (document_frequency + 0.5))
+                self.postings[term][position] = idf * frequency * (SearchIndex.BM25_K1 + 1) / (frequency + normalization)
+        self.terms = sorted(self.postings)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercases text, strips accents and splits it into word terms."""
+        text = unicodedata.normalize("NFKD", text.lower())
+        return re.findall(r"\w+", "".join(character for character in text if not unicodedata.combining(character)))
+
+    @staticmethod
+    def field_values(document: Corporate, field: str) -> List[str]:
+        """Returns the text values of a field; startup themes are [name, count] pairs."""
+        value = getattr(document, field)
+        if field == "startup_themes":
+            return [str(theme[0] if isinstance(theme, (list, tuple)) else theme) for theme in value if theme]
+        return [value] if value else []
+
+    def match(self, query: str) -> Dict[int, float]:
+        """
+        Scores the documents matching every term of a query.
+
+        Parameters:
+        query (str): The search query.
+
+        Returns:
+        Dict[int, float]: The scores by document position.
+        """
+        scores = None
+        for term in SearchIndex.tokenize(query):
+            term_scores = dict(self.postings.get(term, {}))
+            start = bisect_left(self.terms, term)
+            for indexed_term in self.terms[start:start + SearchIndex.MAX_PREFIX_EXPANSIONS + 1]:
+                if not indexed_term.startswith(term):
+                    break
+                if indexed_term == term:
+                    continue
+                for position, score in self.postings[indexed_term].items():
+                    score *= SearchIndex.PREFIX_MATCH_WEIGHT
+                    if score > term_scores.get(position, 0.0):
+                        term_scores[position] = score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {position: score + term_scores[position] for position, score in scores.items() if position in term_scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+    def search(self, query: str, limit: Optional[int] = None, offset: int = 0) -> SearchResult:
+        """
+        Ranks the documents matching a query.
+
+        Parameters:
+        query (str): The search query.
+        limit (int, optional): The maximum number of documents returned.
+        offset (int): The number of top ranked documents skipped.
+
+        Returns:
+        SearchResult: The number of matching documents and the requested page of them.
+        """
+        scores = self.match(query)
+        if limit is None:
+            ranked = sorted(scores, key=lambda position: (-scores[position], position))[offset:]
+        else:
+            ranked = nlargest(offset + limit, scores, key=lambda position: (scores[position], -position))[offset:]
+        return SearchResult(len(scores), [self.documents[position] for position in ranked])
+
+    def facets(self, query: str) -> Dict[str, Dict[str, int]]:
+        """
+        Counts the documents matching a query by country and by startup theme.
+
+        Parameters:
+        query (str): The search query.
+
+        Returns:
+        Dict[str, Dict[str, int]]: The counts by value of each facet field, the most frequent first.
+        """
+        counts = {field: Counter() for field in SearchIndex.FACET_FIELDS}
+        for position in self.match(query):
+            for field in SearchIndex.FACET_FIELDS:
+                counts[field].update(set(SearchIndex.field_values(self.documents[position], field)))
+        return {field: dict(counter.most_common()) for field, counter in counts.items()}
+
+
+class SearchIndexService:
+    """
+    A service class holding the search indices of completed jobs.
+
+    The corporates of a completed job never change, so its index is built once, on the
+    first search of the job, and kept for later searches. Only the indices of the
+    SEARCH_INDEX_MAX_JOBS most recently searched jobs are kept in memory.
+    """
+
+    indices = OrderedDict()
+    build_locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    async def get_index(job_id: str) -> SearchIndex:
+        """
+        Retrieves the search index of a completed job, building it on first use.
+
+        Parameters:
+        job_id (str): The completed job ID.
+
+        Returns:
+        SearchIndex: The search index.
+        """
+        index = SearchIndexService.indices.get(job_id)
+        if index is None:
+            lock = SearchIndexService.build_locks.setdefault(job_id, asyncio.Lock())
+            async with lock:
+                index = SearchIndexService.indices.get(job_id)
+                if index is None:
+                    index = await SearchIndexService.build_index(job_id)
+                    SearchIndexService.indices[job_id] = index
+                    while len(SearchIndexService.indices) > AppConfig.SEARCH_INDEX_MAX_JOBS:
+                        SearchIndexService.indices.popitem(last=False)
+            SearchIndexService.build_locks.pop(job_id, None)
+
+        SearchIndexService.indices.move_to_end(job_id)
+        return index
+
+    @staticmethod
+    async def build_index(job_id: str) -> SearchIndex:
+        """
+        Reads the corporates of a job and builds their search index off the event loop.
+
+        Parameters:
+        job_id (str): The completed job ID.
+
+        Returns:
+        SearchIndex: The search index.
+        """
+        documents = [
+            Corporate(**document) async for document in AsyncMongoConnection(
+                DataAccessConstants.MongoDB.CollectionNames.CORPORATES
+            ).iter_by_job_id(job_id, DataAccessConstants.GlassDollar.EXCLUDED_FIELDS)
+        ]
+        index = await asyncio.to_thread(SearchIndex, documents)
+        logger.info(f"Built the search index of job {job_id} over {len(documents)} corporates")
+        return index
+
+    @staticmethod
+    def clear() -> None:
+        """Drops every search index."""
+        SearchIndexService.indices.clear()
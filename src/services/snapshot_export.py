@@ -0,0 +1,158 @@
+import asyncio
+import os
+from typing import Dict, List, Union
+from urllib.parse import quote
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.services.glassdollar_retrieval import GlassDollarRetrievalService
+
+
+class SnapshotExportService:
+    """
+    A service class writing the corporates of completed jobs to compressed Parquet snapshots.
+
+    A snapshot holds one row per corporate, with `startup_partners` as a nested list of
+    structs, and is written one row group at a time straight from the MongoDB cursor.
+    The corporates of a completed job never change, so a snapshot is written once, on
+    the first download of the job, and served from AppConfig.SNAPSHOT_DIR afterwards.
+    """
+
+    STARTUP_PARTNER_TYPE = pa.struct([
+        ("company_name", pa.string()),
+        ("logo_url", pa.string()),
+        ("city", pa.string()),
+        ("website", pa.string()),
+        ("country", pa.string()),
+        ("theme_gd", pa.string()),
+    ])
+    SCHEMA = pa.schema([
+        ("id", pa.string()),
+        ("name", pa.string()),
+        ("description", pa.string()),
+        ("logo_url", pa.string()),
+        ("hq_city", pa.string()),
+        ("hq_country", pa.string()),
+        ("website_url", pa.string()),
+        ("linkedin_url", pa.string()),
+        ("twitter_url", pa.string()),
+        ("startup_partners_count", pa.int32()),
+        ("startup_partners", pa.list_(STARTUP_PARTNER_TYPE)),
+        ("startup_themes", pa.list_(pa.list_(pa.string()))),
+        ("job_id", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+    export_locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    async def get_snapshot(job_id: str) -> Union[dict, str]:
+        """
+        Retrieves the snapshot file of a job, exporting it on first use.
+
+        Parameters:
+        job_id (str): The job ID.
+
+        Returns:
+        Union[str, dict]: The path of the snapshot, or a dict if the job is not completed.
+
+        Raises:
+        ValueError: If there is no job with the given job ID.
+        """
+        if not await GlassDollarRetrievalService.is_job_completed(job_id):
+            return {"message": "Come Back Later"}
+
+        path = SnapshotExportService.get_snapshot_path(job_id)
+        if not os.path.exists(path):
+            lock = SnapshotExportService.export_locks.setdefault(job_id, asyncio.Lock())
+            async with lock:
+                if not os.path.exists(path):
+                    await SnapshotExportService.export_job(job_id)
+            SnapshotExportService.export_locks.pop(job_id, None)
+        return path
+
+    @staticmethod
+    def get_snapshot_path(job_id: str) -> str:
+        """
+        Returns the path of the snapshot of a job.
+
+        Parameters:
+        job_id (str): The job ID, quoted so that it can not leave the snapshot directory.
+
+        Returns:
+        str: The path.
+        """
+        return os.path.join(AppConfig.SNAPSHOT_DIR, f"{quote(job_id, safe='')}.parquet")
+
+    @staticmethod
+    async def export_job(job_id: str) -> str:
+        """
+        Writes the snapshot of a job from the MongoDB cursor, AppConfig.SNAPSHOT_ROW_GROUP_SIZE
+        corporates at a time.
+
+        Row groups are encoded and written off the event loop. The file is written under a
+        temporary name and renamed when complete, so readers never see a partial snapshot.
+
+        Parameters:
+        job_id (str): The completed job ID.
+
+        Returns:
+        str: The path of the snapshot.
+        """
+        path = SnapshotExportService.get_snapshot_path(job_id)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(AppConfig.SNAPSHOT_DIR, exist_ok=True)
+
+        writer = pq.ParquetWriter(temporary_path, SnapshotExportService.SCHEMA, compression=AppConfig.SNAPSHOT_COMPRESSION)
+        row_count = 0
+        try:
+            records = []
+            async for document in AsyncMongoConnection(
+                DataAccessConstants.MongoDB.CollectionNames.CORPORATES
+            ).iter_by_job_id(job_id, ["_id"]):
+                records.append(SnapshotExportService.to_record(document))
+                if len(records) >= AppConfig.SNAPSHOT_ROW_GROUP_SIZE:
+                    await asyncio.to_thread(SnapshotExportService.write_row_group, writer, records)
+                    row_count += len(records)
+                    records = []
+            if records:
+                await asyncio.to_thread(SnapshotExportService.write_row_group, writer, records)
+                row_count += len(records)
+            writer.close()
+            os.replace(temporary_path, path)
+        except BaseException:
+            writer.close()
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        logger.info(f"Exported the snapshot of job {job_id} with {row_count} corporates to {path}")
+        return path
+
+    @staticmethod
+    def write_row_group(writer: pq.ParquetWriter, records: List[Dict]) -> None:
+        """Encodes records as a row group of the snapshot."""
+        writer.write_table(pa.Table.from_pylist(records, schema=SnapshotExportService.SCHEMA))
+
+    @staticmethod
+    def to_record(document: Dict) -> Dict:
+        """
+        Shapes a raw corporate document as a row of the snapshot schema.
+
+        Parameters:
+        document (Dict): The raw document.
+
+        Returns:
+        Dict: The row; startup themes become lists of strings.
+        """
+        record = {field: document.get(field) for field in SnapshotExportService.SCHEMA.names}
+        record["startup_partners"] = record["startup_partners"] or []
+        record["startup_themes"] = [
+            [str(value) for value in theme] if isinstance(theme, (list, tuple)) else [str(theme)]
+            for theme in record["startup_themes"] or []
+        ]
+        return record
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+import httpx
+
+from src.configs.app import AppConfig
+from src.dataaccess.database import MongoConnection
+from src.dataaccess.glassdollar_crawler_async import AsyncGlassDollarCrawlerDataAccess
+from src.dataaccess.rate_limiter import GlassDollarRequestError
+from src.services.glassdollar_async_crawler import GlassDollarAsyncCrawlingService
+
+
+def test_crawl(monkeypatch, job, empty_mongo_client, glassdollar_transport):
+    MongoConnection.client = empty_mongo_client
+    job.counter = 0
+    job.total_corporate_count = 5
+    MongoConnection("job").insert_one(job.model_dump())
+
+    def mock_connect():
+        AsyncGlassDollarCrawlerDataAccess.client = httpx.AsyncClient(transport=glassdollar_transport)
+
+    monkeypatch.setattr(AsyncGlassDollarCrawlerDataAccess, "connect", mock_connect)
+    monkeypatch.setattr(AppConfig, "CORPORATE_BATCH_SIZE", 2)
+
+    stored_count = asyncio.run(GlassDollarAsyncCrawlingService.crawl(["Copenhagen"], job.job_id))
+
+    assert stored_count == 5
+    assert MongoConnection("corporates").collection.count_documents({"job_id": job.job_id}) == 5
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (5, 5)
+
+
+def test_crawl_failed_batch(monkeypatch, job, empty_mongo_client, glassdollar_transport):
+    MongoConnection.client = empty_mongo_client
+    job.counter = 0
+    job.total_corporate_count = 5
+    MongoConnection("job").insert_one(job.model_dump())
+
+    def mock_connect():
+        AsyncGlassDollarCrawlerDataAccess.client = httpx.AsyncClient(transport=glassdollar_transport)
+
+    get_corporate_details_batch = AsyncGlassDollarCrawlerDataAccess.get_corporate_details_batch
+    failing_ids = {"corporate_id_0"}
+
+    async def mock_get_corporate_details_batch(corporate_ids):
+        if failing_ids & set(corporate_ids):
+            raise GlassDollarRequestError("Service unavailable")
+        return await get_corporate_details_batch(corporate_ids)
+
+    monkeypatch.setattr(AsyncGlassDollarCrawlerDataAccess, "connect", mock_connect)
+    monkeypatch.setattr(AsyncGlassDollarCrawlerDataAccess, "get_corporate_details_batch", mock_get_corporate_details_batch)
+    monkeypatch.setattr(AppConfig, "CORPORATE_BATCH_SIZE", 2)
+
+    with pytest.raises(GlassDollarRequestError):
+        asyncio.run(GlassDollarAsyncCrawlingService.crawl(["Copenhagen"], job.job_id))
+    assert MongoConnection("corporates").get_stored_ids(job.job_id) == {"corporate_id_2", "corporate_id_3", "corporate_id_4"}
+
+    failing_ids.clear()
+    stored_count = asyncio.run(GlassDollarAsyncCrawlingService.crawl(["Copenhagen"], job.job_id))
+
+    assert stored_count == 2
+    assert MongoConnection("corporates").collection.count_documents({"job_id": job.job_id}) == 5
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (5, 5)
@@ -0,0 +1,39 @@
+import pytest
+
+from benchmarks.crawl_benchmark import percentile, run_benchmark
+from benchmarks import serialization_benchmark
+
+
+@pytest.mark.parametrize("engine", ["celery", "async"])
+def test_run_benchmark(engine):
+    results = run_benchmark(corporates=30, cities=3, page_size=4, error_rate=0.1, batch_size=5, engine=engine)
+
+    assert results["stored_corporates"] == 30
+    assert results["job_completed"] is True
+    assert results["api_requests"] > results["api_errors"]
+    assert results["mongo_operations"]["total"] > 0
+    if engine == "celery":
+        assert results["task_latency_seconds"]["city_task"]["count"] == 3
+        assert results["task_latency_seconds"]["corporate_batch_task"]["count"] == 9
+
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3, 1, 2, 4], 0.5) == 2
+    assert percentile(list(range(1, 101)), 0.99) == 99
+
+
+def test_run_benchmark_with_global_enumeration():
+    results = run_benchmark(corporates=30, cities=3, page_size=4, batch_size=5, enumeration="global")
+
+    assert results["stored_corporates"] == 30
+    assert results["job_completed"] is True
+    assert results["task_latency_seconds"]["enumeration_task"]["count"] == 1
+    assert "city_task" not in results["task_latency_seconds"]
+
+
+def test_serialization_benchmark():
+    results = serialization_benchmark.run_benchmark(corporates=50, repeat=1)
+
+    assert results["identical_output"] is True
+    assert results["models_ms_per_10k"] > 0 and results["fast_ms_per_10k"] > 0
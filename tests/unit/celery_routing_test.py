@@ -0,0 +1,30 @@
+import pytest
+
+from src.celery.app import (
+    async_crawl_task, celery_app, city_task, corporate_batch_task, corporate_task, enumeration_task
+)
+from src.configs.app import AppConfig
+
+
+@pytest.mark.parametrize(
+    ["task", "queue"],
+    [
+        (city_task, AppConfig.CRAWL_QUEUE),
+        (enumeration_task, AppConfig.CRAWL_QUEUE),
+        (async_crawl_task, AppConfig.CRAWL_QUEUE),
+        (corporate_task, AppConfig.CORPORATE_QUEUE),
+        (corporate_batch_task, AppConfig.CORPORATE_QUEUE),
+    ],
+)
+def test_tasks_are_routed_to_their_queue(task, queue):
+    route = celery_app.amqp.router.route({}, task.name)
+
+    assert route["queue"].name == queue
+    assert route["queue"].routing_key == queue
+    assert route["queue"].exchange.name == queue
+
+
+def test_queues_support_priorities():
+    for queue in celery_app.conf.task_queues:
+        assert queue.queue_arguments == {"x-max-priority": AppConfig.TASK_MAX_PRIORITY}
+    assert corporate_batch_task.retry_kwargs == {"priority": AppConfig.RETRY_TASK_PRIORITY}
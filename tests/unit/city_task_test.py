@@ -0,0 +1,89 @@
+from src.celery.app import city_task, corporate_batch_task, enumeration_task
+from src.configs.app import AppConfig
+from src.dataaccess.database import MongoConnection
+from src.dataaccess.glassdollar_crawler import GlassDollarCrawlerDataAccess
+from src.schemas.job import Job
+
+
+def test_city_task_fetches_every_page(monkeypatch, mocker, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    corporate_ids = [f"corporate-{index}" for index in range(10)]
+    requested_pages = []
+
+    def mock_get_corporate_rows_by_city(city, page):
+        requested_pages.append(page)
+        rows = [
+            {"id": corporate_id, "name": corporate_id, "hq_city": city, "hq_country": "Turkey", "startup_partners_count": 0}
+            for corporate_id in corporate_ids[(page - 1) * 4:page * 4]
+        ]
+        return rows, len(corporate_ids)
+
+    monkeypatch.setattr(GlassDollarCrawlerDataAccess, "get_corporate_rows_by_city", mock_get_corporate_rows_by_city)
+    monkeypatch.setattr(AppConfig, "CORPORATE_BATCH_SIZE", 3)
+    mocked_batch_task = mocker.patch("src.celery.app.corporate_batch_task.delay")
+
+    city_task("Istanbul", "job-1")
+
+    assert sorted(requested_pages) == [1, 2, 3]
+    enqueued_ids = [corporate_id for call in mocked_batch_task.call_args_list for corporate_id in call.args[0]]
+    assert sorted(enqueued_ids) == sorted(corporate_ids)
+    assert all(len(call.args[0]) <= 3 for call in mocked_batch_task.call_args_list)
+
+
+def test_city_task_without_corporates(monkeypatch, mocker, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(GlassDollarCrawlerDataAccess, "get_corporate_rows_by_city", lambda city, page: ([], 0))
+    mocked_batch_task = mocker.patch("src.celery.app.corporate_batch_task.delay")
+
+    city_task("Istanbul", "job-1")
+
+    mocked_batch_task.assert_not_called()
+
+
+def test_enumeration_task_dedupes_corporates(monkeypatch, mocker, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    job = Job(job_id="test_job_id", total_corporate_count=8)
+    MongoConnection("job").insert_one(job.model_dump())
+    listing = [f"corporate-{index}" for index in range(6)] + ["corporate-0", "corporate-3"]
+
+    def mock_get_corporate_rows(cities, page):
+        rows = [
+            {"id": corporate_id, "name": corporate_id, "hq_city": "Istanbul", "hq_country": "Turkey", "startup_partners_count": 0}
+            for corporate_id in listing[(page - 1) * 3:page * 3]
+        ]
+        return rows, len(listing)
+
+    monkeypatch.setattr(GlassDollarCrawlerDataAccess, "get_corporate_rows", mock_get_corporate_rows)
+    mocked_batch_task = mocker.patch("src.celery.app.corporate_batch_task.delay")
+
+    enumeration_task(["Istanbul", "Ankara"], job.job_id)
+
+    enqueued_ids = [corporate_id for call in mocked_batch_task.call_args_list for corporate_id in call.args[0]]
+    assert sorted(enqueued_ids) == sorted(set(listing))
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (0, 6)
+
+
+def test_set_total_corporate_count_completes_job(empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    job = Job(job_id="test_job_id", total_corporate_count=7, counter=5)
+    MongoConnection("job").insert_one(job.model_dump())
+
+    assert MongoConnection("job").set_total_corporate_count(job.job_id, 5) is True
+    assert MongoConnection("job").collection.find_one({"job_id": job.job_id})["status"] == "completed"
+
+
+def test_corporate_batch_task_excludes_unresolved_corporates(mocked_glassdollar_post, empty_mongo_client,
+                                                             corporate_ids, batch_details_response):
+    MongoConnection.client = empty_mongo_client
+    mocked_glassdollar_post.return_value.json.return_value = batch_details_response
+    job = Job(job_id="test_job_id", total_corporate_count=3, counter=0)
+    MongoConnection("job").insert_one(job.model_dump())
+
+    corporate_batch_task.apply(args=(corporate_ids, job.job_id))
+    corporate_batch_task.apply(args=(corporate_ids, job.job_id), retries=corporate_batch_task.max_retries)
+
+    assert mocked_glassdollar_post.call_count == corporate_batch_task.max_retries + 2
+    assert MongoConnection("enumerated_corporates").get_unresolvable_ids(job.job_id) == {"corporate_id_2"}
+    assert MongoConnection("corporates").get_stored_ids(job.job_id) == {"corporate_id_1", "corporate_id_3"}
+    stored_job = MongoConnection("job").get_job(job.job_id)
+    assert (stored_job["counter"], stored_job["status"]) == (3, "completed")
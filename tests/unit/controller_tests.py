@@ -1,13 +1,32 @@
+import json
+import pytest
 from fastapi.testclient import TestClient
 from src.main import app
 from src.services.glassdollar_crawler import GlassDollarCrawlingService
 from src.services.glassdollar_retrieval import GlassDollarRetrievalService
+from src.services.job_diff import JobDiffService
+from src.services.job_progress import JobProgressService
+from src.services.snapshot_export import SnapshotExportService
+from src.schemas.job import JobProgress
 
 client = TestClient(app)
+pytestmark = pytest.mark.usefixtures("empty_response_cache", "completed_jobs")
+
+
+@pytest.fixture
+def completed_jobs(monkeypatch):
+    async def mock_is_job_completed(job_id):
+        return True
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "is_job_completed", mock_is_job_completed)
+
+
+async def mock_get_latest_completed_job_id():
+    return "latest-job-id"
 
 
 def test_start_glassdollar_crawling(monkeypatch, job_id):
-    def mock_start_crawling(job_id):
+    def mock_start_crawling(job_id, incremental):
         return
 
     monkeypatch.setattr(GlassDollarCrawlingService, "start_crawling", mock_start_crawling)
@@ -26,9 +45,20 @@ def test_start_glassdollar_crawling_no_job_id():
     assert response.status_code == 422
 
 
+def test_resume_glassdollar_crawling(monkeypatch, job_id):
+    resumed_job_ids = []
+    monkeypatch.setattr(GlassDollarCrawlingService, "resume_crawling", resumed_job_ids.append)
+
+    response = client.post(f"/jobs/{job_id}/resume")
+
+    assert response.status_code == 200
+    assert response.json()["job_id"] == job_id
+    assert resumed_job_ids == [job_id]
+
+
 def test_get_documents_success(monkeypatch, job_id, output_corporates):
-    def mock_get_documents(job_id):
-        return output_corporates
+    async def mock_get_documents(job_id, fields, after, limit):
+        return output_corporates, None
 
     monkeypatch.setattr(GlassDollarRetrievalService, "get_documents", mock_get_documents)
 
@@ -38,7 +68,7 @@ def test_get_documents_success(monkeypatch, job_id, output_corporates):
 
 
 def test_get_documents_error(monkeypatch, job_id):
-    def mock_get_documents(job_id):
+    async def mock_get_documents(job_id, fields, after, limit):
         raise ValueError(f"There is no job with {job_id}")
 
     monkeypatch.setattr(GlassDollarRetrievalService, "get_documents", mock_get_documents)
@@ -49,9 +79,10 @@ def test_get_documents_error(monkeypatch, job_id):
 
 
 def test_get_latest_completed_job_documents(monkeypatch, output_corporates):
-    def mock_get_latest_documents():
-        return output_corporates
+    async def mock_get_latest_documents(fields, after, limit, job_id):
+        return output_corporates, None
 
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_latest_completed_job_id", mock_get_latest_completed_job_id)
     monkeypatch.setattr(GlassDollarRetrievalService, "get_latest_documents", mock_get_latest_documents)
     response = client.get("/documents/glassdollar-latest")
     assert response.status_code == 200
@@ -59,10 +90,10 @@ def test_get_latest_completed_job_documents(monkeypatch, output_corporates):
 
 
 def test_get_latest_completed_job_documents_error(monkeypatch):
-    def mock_get_latest_documents():
+    async def mock_get_latest_completed_job_id():
         raise ValueError("There is no completed job")
 
-    monkeypatch.setattr(GlassDollarRetrievalService, "get_latest_documents", mock_get_latest_documents)
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_latest_completed_job_id", mock_get_latest_completed_job_id)
 
     response = client.get("/documents/glassdollar-latest")
     assert response.status_code == 404
@@ -70,21 +101,251 @@ def test_get_latest_completed_job_documents_error(monkeypatch):
 
 
 def test_search_documents(monkeypatch, output_corporates, keyword):
-    def mock_search_documents(keyword):
-        return output_corporates
+    async def mock_search_documents(keyword, fields, limit, offset, job_id):
+        assert (limit, offset) == (None, 0)
+        return output_corporates, None
 
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_latest_completed_job_id", mock_get_latest_completed_job_id)
     monkeypatch.setattr(GlassDollarRetrievalService, "search_documents", mock_search_documents)
     response = client.get(f"/search/glassdollar/{keyword}")
     assert response.status_code == 200
     assert response.json() == [cor.dict(exclude_none=True) for cor in output_corporates]
 
 
+def test_get_search_facets(monkeypatch, keyword):
+    facets = {"total": 1, "facets": {"hq_country": {"Turkey": 1}, "startup_themes": {"Automation": 1}}}
+
+    async def mock_get_search_facets(keyword):
+        return facets
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_search_facets", mock_get_search_facets)
+    response = client.get(f"/search/glassdollar/{keyword}/facets")
+    assert response.status_code == 200
+    assert response.json() == facets
+
+
 def test_search_documents_error(monkeypatch, keyword):
-    def mock_search_documents(keyword):
+    async def mock_get_latest_completed_job_id():
         raise ValueError("There is no completed job")
 
-    monkeypatch.setattr(GlassDollarRetrievalService, "search_documents", mock_search_documents)
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_latest_completed_job_id", mock_get_latest_completed_job_id)
 
     response = client.get(f"/search/glassdollar/{keyword}")
     assert response.status_code == 404
     assert "There is no completed job" in response.text
+
+
+def test_get_documents_stream(monkeypatch, job_id, output_corporates):
+    async def mock_stream_documents(job_id, output_format, fields):
+        return iter([cor.model_dump_json(exclude_none=True).encode() + b"\n" for cor in output_corporates])
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "stream_documents", mock_stream_documents)
+
+    response = client.get(f"/documents/glassdollar/{job_id}?stream=ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [cor.model_dump(exclude_none=True) for cor in output_corporates]
+
+
+def test_get_documents_page(monkeypatch, job_id, output_corporates):
+    next_cursor = "6577bcf3eb34a56785e95947"
+
+    async def mock_get_documents(job_id, fields, after, limit):
+        assert (fields, after, limit) == (["name", "hq_city"], next_cursor, 3)
+        return [cor.model_copy(update={"description": None}) for cor in output_corporates], next_cursor
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_documents", mock_get_documents)
+
+    response = client.get(f"/documents/glassdollar/{job_id}?fields=name,hq_city&after={next_cursor}&limit=3")
+    assert response.status_code == 200
+    assert response.headers["X-Next-Cursor"] == next_cursor
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["fields=job_id", "fields=unknown", "after=not-a-cursor"],
+)
+def test_get_documents_invalid_page_parameters(job_id, query):
+    response = client.get(f"/documents/glassdollar/{job_id}?{query}")
+    assert response.status_code == 400
+
+
+def test_get_documents_cached_with_etag(monkeypatch, job_id, output_corporates):
+    calls = []
+
+    async def mock_get_documents(job_id, fields, after, limit):
+        calls.append(job_id)
+        return output_corporates, None
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_documents", mock_get_documents)
+
+    response = client.get(f"/documents/glassdollar/{job_id}")
+    etag = response.headers["ETag"]
+    cached_response = client.get(f"/documents/glassdollar/{job_id}")
+    not_modified_response = client.get(f"/documents/glassdollar/{job_id}", headers={"If-None-Match": f"W/{etag}"})
+
+    assert calls == [job_id]
+    assert cached_response.content == response.content
+    assert cached_response.headers["ETag"] == etag
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.content == b""
+
+
+def test_get_documents_cached_not_served_after_expiry(monkeypatch, job_id, output_corporates):
+    async def mock_get_documents(job_id, fields, after, limit):
+        return output_corporates, None
+
+    async def mock_is_job_completed(job_id):
+        if job_id in deleted_job_ids:
+            raise ValueError(f"There is no job with {job_id}")
+        return job_id not in expired_job_ids
+
+    expired_job_ids, deleted_job_ids = set(), set()
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_documents", mock_get_documents)
+    monkeypatch.setattr(GlassDollarRetrievalService, "is_job_completed", mock_is_job_completed)
+
+    assert client.get(f"/documents/glassdollar/{job_id}").status_code == 200
+    expired_job_ids.add(job_id)
+    assert client.get(f"/documents/glassdollar/{job_id}").json() == {"message": "Come Back Later"}
+    deleted_job_ids.add(job_id)
+    assert client.get(f"/documents/glassdollar/{job_id}").status_code == 404
+
+
+def test_get_documents_not_completed_is_not_cached(monkeypatch, job_id):
+    calls = []
+
+    async def mock_get_documents(job_id, fields, after, limit):
+        calls.append(job_id)
+        return {"message": "Come Back Later"}
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_documents", mock_get_documents)
+
+    assert client.get(f"/documents/glassdollar/{job_id}").json() == {"message": "Come Back Later"}
+    assert client.get(f"/documents/glassdollar/{job_id}").json() == {"message": "Come Back Later"}
+    assert calls == [job_id, job_id]
+
+
+def test_get_latest_completed_job_documents_follows_new_job(monkeypatch, output_corporates):
+    latest_job_ids = iter(["first-job-id", "second-job-id"])
+    calls = []
+
+    async def mock_get_latest_completed_job_id():
+        return next(latest_job_ids)
+
+    async def mock_get_latest_documents(fields, after, limit, job_id):
+        calls.append(job_id)
+        return output_corporates, None
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_latest_completed_job_id", mock_get_latest_completed_job_id)
+    monkeypatch.setattr(GlassDollarRetrievalService, "get_latest_documents", mock_get_latest_documents)
+
+    client.get("/documents/glassdollar-latest")
+    client.get("/documents/glassdollar-latest")
+    assert calls == ["first-job-id", "second-job-id"]
+
+
+def test_get_metrics():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "glassdollar_request_duration_seconds" in response.text
+
+
+@pytest.mark.parametrize(
+    ["range_header", "status_code", "content", "content_range"],
+    [
+        (None, 200, b"0123456789", None),
+        ("bytes=2-5", 206, b"2345", "bytes 2-5/10"),
+        ("bytes=7-", 206, b"789", "bytes 7-9/10"),
+        ("bytes=-3", 206, b"789", "bytes 7-9/10"),
+        ("bytes=8-20", 206, b"89", "bytes 8-9/10"),
+        ("bytes=10-", 416, None, "bytes */10"),
+        ("bytes=abc", 416, None, "bytes */10"),
+    ],
+)
+def test_download_snapshot(monkeypatch, tmp_path, job_id, range_header, status_code, content, content_range):
+    path = tmp_path / f"{job_id}.parquet"
+    path.write_bytes(b"0123456789")
+
+    async def mock_get_snapshot(job_id):
+        return str(path)
+
+    monkeypatch.setattr(SnapshotExportService, "get_snapshot", mock_get_snapshot)
+
+    response = client.get(f"/snapshots/glassdollar/{job_id}", headers={"Range": range_header} if range_header else {})
+    assert response.status_code == status_code
+    assert response.headers.get("content-range") == content_range
+    if content is not None:
+        assert response.content == content
+        assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_download_snapshot_not_completed(monkeypatch, job_id):
+    async def mock_get_snapshot(job_id):
+        return {"message": "Come Back Later"}
+
+    monkeypatch.setattr(SnapshotExportService, "get_snapshot", mock_get_snapshot)
+
+    response = client.get(f"/snapshots/glassdollar/{job_id}")
+    assert response.status_code == 200
+    assert response.json() == {"message": "Come Back Later"}
+
+
+def test_get_job_progress(monkeypatch, job_id):
+    async def mock_get_progress(job_id):
+        return JobProgress(job_id=job_id, status="running", counter=1, total_corporate_count=4, progress=0.25, rate=0.5)
+
+    monkeypatch.setattr(JobProgressService, "get_progress", mock_get_progress)
+
+    response = client.get(f"/jobs/{job_id}")
+    assert response.status_code == 200
+    assert response.json()["counter"] == 1
+    assert response.json()["eta_seconds"] is None
+
+
+def test_get_job_progress_unknown_job(monkeypatch, job_id):
+    async def mock_get_progress(job_id):
+        raise ValueError(f"There is no job with {job_id}")
+
+    monkeypatch.setattr(JobProgressService, "get_progress", mock_get_progress)
+
+    assert client.get(f"/jobs/{job_id}").status_code == 404
+    assert client.get(f"/jobs/{job_id}/events").status_code == 404
+
+
+def test_stream_job_progress(monkeypatch, job_id):
+    progress = JobProgress(job_id=job_id, status="completed", counter=4, total_corporate_count=4, progress=1.0, rate=0.5)
+
+    async def mock_get_progress(job_id):
+        return progress
+
+    monkeypatch.setattr(JobProgressService, "get_progress", mock_get_progress)
+    monkeypatch.setattr(JobProgressService, "progress_cache", {})
+
+    response = client.get(f"/jobs/{job_id}/events")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == f"event: progress\ndata: {progress.model_dump_json()}\n\n"
+
+
+def test_get_job_diff(monkeypatch):
+    async def mock_stream_diff(job_id, other_job_id):
+        async def lines():
+            yield b'{"change":"added","id":"corporate_id","document":{"name":"NNIT Group"}}\n'
+        return lines()
+
+    monkeypatch.setattr(JobDiffService, "stream_diff", mock_stream_diff)
+
+    response = client.get("/jobs/old/diff/new")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["change"] for line in response.text.splitlines()] == ["added"]
+
+
+def test_get_job_diff_unknown_job(monkeypatch):
+    async def mock_stream_diff(job_id, other_job_id):
+        raise ValueError(f"There is no job with {other_job_id}")
+
+    monkeypatch.setattr(JobDiffService, "stream_diff", mock_stream_diff)
+
+    assert client.get("/jobs/old/diff/new").status_code == 404
@@ -0,0 +1,26 @@
+import json
+from datetime import datetime
+from bson import ObjectId
+
+from src.services.corporate_serializer import CorporateSerializer
+from src.services.response_cache import ResponseCacheService
+
+
+def test_encode_documents_matches_corporate_model(input_corporate):
+    input_corporate.startup_partners[0].logo_url = None
+    input_corporate.created_at = datetime(2023, 12, 12, 2, 51, 31, 123000)
+    document = {"_id": ObjectId(), **input_corporate.model_dump()}
+
+    body = CorporateSerializer.encode_documents([document])
+
+    assert body == ResponseCacheService.corporates_adapter.dump_json([input_corporate], exclude_none=True)
+    assert "logo_url" not in json.loads(body)[0]["startup_partners"][0]
+
+
+def test_encode_document_drops_none_values(input_corporate):
+    document = {**input_corporate.model_dump(), "description": None}
+
+    encoded_document = json.loads(CorporateSerializer.encode_document(document))
+
+    assert "description" not in encoded_document
+    assert encoded_document["hq_city"] == "Søborg"
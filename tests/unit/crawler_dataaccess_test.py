@@ -0,0 +1,93 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from src.configs.dataaccess import DataAccessConfig
+from src.dataaccess.glassdollar_crawler import GlassDollarCrawlerDataAccess
+from src.dataaccess.rate_limiter import GlassDollarRequestError, UnresolvedCorporatesError
+
+
+def test_get_corporate_details_batch(mocked_glassdollar_post, corporate_ids, batch_details_response):
+    mocked_glassdollar_post.return_value.json.return_value = batch_details_response
+
+    with pytest.raises(UnresolvedCorporatesError) as ex:
+        GlassDollarCrawlerDataAccess.get_corporate_details_batch(corporate_ids)
+
+    assert ex.value.corporate_ids == ["corporate_id_2"]
+    assert [corporate["id"] for corporate in ex.value.corporates] == ["corporate_id_1", "corporate_id_3"]
+    assert mocked_glassdollar_post.call_count == 1
+    query = mocked_glassdollar_post.call_args.kwargs["json"]["query"]
+    for index, corporate_id in enumerate(corporate_ids):
+        assert f'c{index}: corporate(id: "{corporate_id}")' in query
+
+
+def test_post_reuses_session(mocked_glassdollar_post):
+    GlassDollarCrawlerDataAccess.disconnect()
+
+    GlassDollarCrawlerDataAccess.post({"query": "query {getCorporateCities}"})
+    session = GlassDollarCrawlerDataAccess.session
+    GlassDollarCrawlerDataAccess.post({"query": "query {getCorporateCities}"})
+
+    assert GlassDollarCrawlerDataAccess.session is session
+    assert "gzip" in session.headers["accept-encoding"]
+    assert mocked_glassdollar_post.call_count == 2
+
+
+def test_post_retries_throttled_requests(mocker, mocked_glassdollar_post, mocked_rate_limiter):
+    def responses_total(status):
+        return REGISTRY.get_sample_value("glassdollar_responses_total", {"operation": "cities", "status": status}) or 0
+
+    throttled_count, success_count = responses_total("429"), responses_total("200")
+    throttled_response = mocker.Mock(status_code=429, headers={"retry-after": "0"}, content=b"{}")
+    throttled_response.json.return_value = {"errors": [{"message": "Too many requests"}]}
+    response = mocker.Mock(status_code=200, content=b"{}")
+    response.json.return_value = {"data": {"getCorporateCities": ["Copenhagen"]}}
+    mocked_glassdollar_post.side_effect = [throttled_response, response]
+
+    assert GlassDollarCrawlerDataAccess.get_cities() == ["Copenhagen"]
+    assert mocked_glassdollar_post.call_count == 2
+    assert (responses_total("429"), responses_total("200")) == (throttled_count + 1, success_count + 1)
+    mocked_rate_limiter.on_throttle.assert_called_once()
+
+
+def test_post_raises_after_retries(monkeypatch, mocked_glassdollar_post, mocked_rate_limiter):
+    monkeypatch.setattr(DataAccessConfig.GlassDollar, "MAX_RETRIES", 2)
+    monkeypatch.setattr(DataAccessConfig.GlassDollar, "RETRY_BACKOFF_BASE", 0)
+    mocked_glassdollar_post.return_value.status_code = 502
+    mocked_glassdollar_post.return_value.headers = {}
+
+    with pytest.raises(GlassDollarRequestError):
+        GlassDollarCrawlerDataAccess.get_cities()
+    assert mocked_glassdollar_post.call_count == 3
+
+
+@pytest.mark.parametrize(
+    ["status_code", "body"],
+    [
+        (400, {"errors": [{"message": "Syntax Error"}]}),
+        (200, None),
+        (200, {"data": None, "errors": [{"message": "Cannot query field", "extensions": {"code": "GRAPHQL_VALIDATION_FAILED"}}]}),
+    ],
+)
+def test_post_raises_non_retryable_responses(mocked_glassdollar_post, mocked_rate_limiter, status_code, body):
+    mocked_glassdollar_post.return_value.status_code = status_code
+    mocked_glassdollar_post.return_value.headers = {}
+    if body is None:
+        mocked_glassdollar_post.return_value.json.side_effect = ValueError("Expecting value")
+    else:
+        mocked_glassdollar_post.return_value.json.return_value = body
+
+    with pytest.raises(GlassDollarRequestError):
+        GlassDollarCrawlerDataAccess.get_cities()
+    assert mocked_glassdollar_post.call_count == 1
+
+
+def test_post_retries_transient_graphql_errors(mocker, monkeypatch, mocked_glassdollar_post, mocked_rate_limiter):
+    monkeypatch.setattr(DataAccessConfig.GlassDollar, "RETRY_BACKOFF_BASE", 0)
+    failed_response = mocker.Mock(status_code=200, headers={}, content=b"{}")
+    failed_response.json.return_value = {"data": None, "errors": [{"message": "Timeout", "extensions": {"code": "TIMEOUT"}}]}
+    response = mocker.Mock(status_code=200, content=b"{}")
+    response.json.return_value = {"data": {"getCorporateCities": ["Copenhagen"]}}
+    mocked_glassdollar_post.side_effect = [failed_response, response]
+
+    assert GlassDollarCrawlerDataAccess.get_cities() == ["Copenhagen"]
+    assert mocked_glassdollar_post.call_count == 2
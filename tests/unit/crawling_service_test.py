@@ -11,7 +11,7 @@ def test_start_crawling(monkeypatch, job, mocked_city_task):
 
     monkeypatch.setattr(GlassDollarCrawlingService, "does_job_id_exist", mock_does_job_id_exists)
 
-    def mock_create_job(job_id, total_corporate_count):
+    def mock_create_job(job_id, total_corporate_count, *args):
         return
 
     monkeypatch.setattr(GlassDollarCrawlingService, "create_job", mock_create_job)
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from src.configs.app import AppConfig
+from src.constants.dataaccess import DataAccessConstants
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.dataaccess.database import MongoConnection
+from src.schemas.job import Job
+from src.services.corporate_serializer import CorporateSerializer
+from src.services.data_retention import DataRetentionService
+
+NOW = datetime(2024, 6, 1)
+
+
+def insert_job(job_id, days_ago, corporates):
+    job = Job(job_id=job_id, total_corporate_count=1, counter=1, created_at=NOW - timedelta(days=days_ago))
+    MongoConnection("job").insert_one(job.model_dump())
+    documents = []
+    for corporate in corporates:
+        document = {**corporate, "job_id": job_id, "created_at": job.created_at}
+        document["content_hash"] = CorporateSerializer.content_hash(document)
+        documents.append(document)
+    MongoConnection("corporates").collection.insert_many(documents)
+
+
+@pytest.fixture
+def corporates(input_corporate):
+    return [input_corporate.model_copy(update={"id": f"corporate-{index}"}).model_dump() for index in range(3)]
+
+
+@pytest.mark.parametrize(
+    ["keep_jobs", "max_age_days", "expected_job_ids"],
+    [
+        (0, 0, []),
+        (2, 0, ["job-3", "job-4"]),
+        (0, 17, ["job-4"]),
+        (3, 1, ["job-2", "job-3", "job-4"]),
+        (1, 0, ["job-2", "job-3", "job-4"]),
+    ],
+)
+def test_select_expired_jobs(monkeypatch, keep_jobs, max_age_days, expected_job_ids):
+    monkeypatch.setattr(AppConfig, "RETENTION_KEEP_JOBS", keep_jobs)
+    monkeypatch.setattr(AppConfig, "RETENTION_MAX_AGE_DAYS", max_age_days)
+    completed_jobs = [{"job_id": f"job-{index}", "created_at": NOW - timedelta(days=index * 5)} for index in range(1, 5)]
+
+    assert DataRetentionService.select_expired_jobs(completed_jobs, NOW) == expected_job_ids
+
+
+def test_apply_retention_deletes_expired_jobs(monkeypatch, empty_mongo_client, corporates):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(AppConfig, "RETENTION_KEEP_JOBS", 1)
+    monkeypatch.setattr(AppConfig, "RETENTION_BATCH_SIZE", 2)
+    insert_job("old", 10, corporates)
+    insert_job("new", 1, corporates)
+    MongoConnection("checkpoints").record_listing_page("old", "Istanbul", 1, 1)
+    running_job = Job(job_id="running", total_corporate_count=5, created_at=NOW - timedelta(days=30))
+    MongoConnection("job").insert_one(running_job.model_dump())
+
+    results = DataRetentionService.apply_retention(NOW)
+
+    assert results == {"expired_jobs": 1, "deleted_corporates": 3, "compacted_corporates": 0}
+    assert MongoConnection("job").get_job("old") is None
+    assert MongoConnection("corporates").count_by_job_id("old") == 0
+    assert MongoConnection("checkpoints").get_checkpoints("old") == {}
+    assert MongoConnection("corporates").count_by_job_id("new") == 3
+    assert MongoConnection("job").get_job("running") is not None
+
+
+def test_apply_retention_compacts_older_jobs(monkeypatch, empty_mongo_client, corporates):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(AppConfig, "CORPORATE_COMPACTION", True)
+    monkeypatch.setattr(AppConfig, "RETENTION_BATCH_SIZE", 2)
+    insert_job("first", 3, corporates)
+    insert_job("second", 2, corporates[:2] + [{**corporates[2], "name": "Changed"}])
+    insert_job("latest", 1, corporates)
+    AsyncMongoConnection.client = AsyncMongoMockClient(mock_mongo_client=empty_mongo_client)
+    excluded_fields = DataAccessConstants.GlassDollar.EXCLUDED_FIELDS
+
+    def fetch_documents(job_id, fields=None):
+        return asyncio.run(AsyncMongoConnection("corporates").fetch_by_job_id(job_id, excluded_fields, fields, raw=True))[0]
+
+    expected_documents = {job_id: fetch_documents(job_id) for job_id in ("first", "second")}
+
+    results = DataRetentionService.apply_retention(NOW)
+
+    assert results["compacted_corporates"] == 6
+    assert MongoConnection("corporate_contents").collection.count_documents({}) == 4
+    assert MongoConnection("corporates").collection.count_documents({"job_id": "latest", "content_ref": {"$exists": True}}) == 0
+    assert MongoConnection("job").get_job("first")["compacted"] is True
+    for job_id, documents in expected_documents.items():
+        assert fetch_documents(job_id) == documents
+    assert [document["name"] for document in MongoConnection("corporates").fetch_by_ids("second", ["corporate-2"])] == ["Changed"]
+    assert DataRetentionService.apply_retention(NOW)["compacted_corporates"] == 0
+
+    assert fetch_documents("first", ["name", "hq_city"]) == [{"name": corporate["name"], "hq_city": corporate["hq_city"]} for corporate in corporates]
+
+    DataRetentionService.delete_job("second")
+    DataRetentionService.delete_job("second")
+    contents = {content["_id"]: content["jobs"] for content in MongoConnection("corporate_contents").collection.find()}
+    assert sorted(contents.values()) == [["first"], ["first"], ["first"]]
+    assert len(fetch_documents("first")) == 3
+
+
+def test_apply_retention_claims_jobs(monkeypatch, empty_mongo_client, corporates):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(AppConfig, "RETENTION_KEEP_JOBS", 1)
+    insert_job("old", 10, corporates)
+    insert_job("new", 1, corporates)
+    MongoConnection("job").mark_expired("old")
+    claims_expire_before = datetime.now() - timedelta(hours=1)
+    assert MongoConnection("job").claim_job("old", {"status": "expired"}, "deletion_claimed_at", claims_expire_before) is True
+
+    results = DataRetentionService.apply_retention(NOW)
+
+    assert results["deleted_corporates"] == 0
+    assert MongoConnection("corporates").count_by_job_id("old") == 3
+
+    monkeypatch.setattr(AppConfig, "RETENTION_CLAIM_TIMEOUT", -60)
+    assert DataRetentionService.apply_retention(NOW)["deleted_corporates"] == 3
+    assert MongoConnection("job").get_job("old") is None
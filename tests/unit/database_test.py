@@ -0,0 +1,177 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from src.configs.dataaccess import DataAccessConfig
+from src.dataaccess.database import CorporatesNotStoredError, MongoConnection
+from src.dataaccess.migrations import remove_duplicate_corporates
+
+
+def test_buffer_corporates_flushes_when_full(monkeypatch, job, input_corporate, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(MongoConnection, "write_buffer", [])
+    monkeypatch.setattr(DataAccessConfig.MongoDB, "WRITE_BUFFER_SIZE", 3)
+    monkeypatch.setattr(DataAccessConfig.MongoDB, "WRITE_BUFFER_FLUSH_INTERVAL", 60)
+    job.counter = 0
+    job.total_corporate_count = 3
+    MongoConnection("job").insert_one(job.model_dump())
+
+    with ThreadPoolExecutor() as executor:
+        waiting_call = executor.submit(
+            MongoConnection.buffer_corporates,
+            [{**input_corporate.model_dump(), "id": f"corporate-{index}"} for index in range(2)]
+        )
+        time.sleep(0.1)
+        assert not waiting_call.done()
+        assert MongoConnection("corporates").collection.count_documents({}) == 0
+
+        MongoConnection.buffer_corporates([input_corporate.model_dump()])
+        waiting_call.result(timeout=5)
+
+    assert MongoConnection("corporates").collection.count_documents({}) == 3
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (3, 3)
+    assert MongoConnection.write_buffer == []
+
+
+def test_buffer_corporates_writes_without_buffer(job, input_corporate, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    job.counter = 0
+    MongoConnection("job").insert_one(job.model_dump())
+
+    MongoConnection.buffer_corporates([input_corporate.model_dump()])
+
+    assert MongoConnection("corporates").collection.count_documents({}) == 1
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (1, 1)
+
+
+def test_flush_buffer(monkeypatch, job, input_corporate, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(MongoConnection, "write_buffer", [input_corporate.model_dump()])
+    job.counter = 0
+    MongoConnection("job").insert_one(job.model_dump())
+
+    assert MongoConnection.flush_buffer() == 1
+    assert MongoConnection.flush_buffer() == 0
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (1, 1)
+
+
+def test_flush_buffer_stores_duplicates_once(monkeypatch, job, input_corporate, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    MongoConnection.ensure_indices()
+    job.counter = 0
+    job.total_corporate_count = 2
+    job.status = "running"
+    MongoConnection("job").insert_one(job.model_dump())
+    corporate = input_corporate.model_dump()
+    other_corporate = {**corporate, "id": "other_corporate_id"}
+
+    monkeypatch.setattr(MongoConnection, "write_buffer", [corporate, corporate])
+    assert MongoConnection.flush_buffer() == 1
+    monkeypatch.setattr(MongoConnection, "write_buffer", [corporate, other_corporate])
+    assert MongoConnection.flush_buffer() == 1
+
+    assert MongoConnection("corporates").collection.count_documents({"job_id": job.job_id}) == 2
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (2, 2)
+    assert MongoConnection("job").collection.find_one({"job_id": job.job_id})["status"] == "completed"
+
+
+def test_upsert_corporates_skips_duplicate_key_errors(mocker, input_corporate, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    corporates = MongoConnection("corporates")
+    mocker.patch.object(corporates.collection, "bulk_write", side_effect=BulkWriteError({
+        "upserted": [{"index": 1, "_id": "stored"}],
+        "writeErrors": [{"index": 0, "code": 11000, "errmsg": "duplicate key"}],
+    }))
+    corporate = input_corporate.model_dump()
+
+    assert corporates.upsert_corporates([corporate, {**corporate, "id": "other_corporate_id"}]) == {corporate["job_id"]: 1}
+
+
+def test_buffer_corporates_raises_write_errors(monkeypatch, mocker, job, input_corporate, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(MongoConnection, "write_buffer", [])
+    monkeypatch.setattr(DataAccessConfig.MongoDB, "WRITE_BUFFER_SIZE", 2)
+    job.counter = 0
+    job.total_corporate_count = 2
+    MongoConnection("job").insert_one(job.model_dump())
+    corporate = input_corporate.model_dump()
+    mocker.patch.object(MongoConnection("corporates").collection, "bulk_write", side_effect=BulkWriteError({
+        "upserted": [{"index": 1, "_id": "stored"}],
+        "writeErrors": [{"index": 0, "code": 121, "errmsg": "document failed validation"}],
+    }))
+
+    with pytest.raises(CorporatesNotStoredError) as ex:
+        MongoConnection.buffer_corporates([corporate, {**corporate, "id": "other_corporate_id"}])
+
+    assert ex.value.stored_counts == {job.job_id: 1}
+    assert MongoConnection.write_buffer == []
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (1, 2)
+
+
+def test_ensure_indices_fails_on_duplicate_corporates(empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    MongoConnection("corporates").collection.insert_many([
+        {"job_id": "job-1", "id": "corporate-1", "name": "First"},
+        {"job_id": "job-1", "id": "corporate-1", "name": "Second"},
+    ])
+
+    with pytest.raises(OperationFailure):
+        MongoConnection.ensure_indices()
+
+    assert MongoConnection("corporates").collection.count_documents({}) == 2
+
+
+def test_remove_duplicate_corporates(empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    MongoConnection("corporates").collection.insert_many([
+        {"job_id": "job-1", "id": "corporate-1", "name": "First"},
+        {"job_id": "job-1", "id": "corporate-1", "name": "Second"},
+        {"job_id": "job-2", "id": "corporate-1", "name": "Other job"},
+    ])
+
+    assert remove_duplicate_corporates() == 1
+
+    assert MongoConnection("corporates").collection.index_information()["job_id_1_id_1"]["unique"] is True
+    names = sorted(document["name"] for document in MongoConnection("corporates").collection.find())
+    assert names == ["First", "Other job"]
+    MongoConnection.ensure_indices()
+
+
+def test_get_collection_is_cached(empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+
+    assert MongoConnection("job").collection is MongoConnection("job").collection
+    assert "job_id_1" not in MongoConnection("job").collection.index_information()
+
+
+def test_ensure_indices(empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+
+    MongoConnection.ensure_indices()
+
+    assert "job_id_1" in MongoConnection("corporates").collection.index_information()
+    assert MongoConnection("corporates").collection.index_information()["job_id_1_id_1"]["unique"] is True
+    assert "job_id_1_id_1_content_hash_1" in MongoConnection("corporates").collection.index_information()
+    assert "text" not in MongoConnection("corporates").collection.index_information()
+    assert "created_at_-1" in MongoConnection("job").collection.index_information()
+
+
+def test_increment_counter_completes_job(job, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    MongoConnection.invalidate_latest_completed_job()
+    job.counter = 0
+    job.total_corporate_count = 2
+    job.status = "running"
+    MongoConnection("job").insert_one(job.model_dump())
+
+    assert MongoConnection("job").get_latest_completed_job_id() is None
+    assert MongoConnection("job").increment_counter(job.job_id) is False
+    assert MongoConnection("job").increment_counter(job.job_id) is True
+    assert MongoConnection("job").increment_counter(job.job_id, 0) is False
+
+    stored_job = MongoConnection("job").collection.find_one({"job_id": job.job_id})
+    assert stored_job["status"] == "completed"
+    assert stored_job["completed_at"] is not None
+    assert MongoConnection("job").get_latest_completed_job_id() == job.job_id
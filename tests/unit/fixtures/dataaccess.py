@@ -0,0 +1,54 @@
+import json
+import re
+import httpx
+import pytest
+
+
+@pytest.fixture
+def corporate_ids():
+    return ["corporate_id_1", "corporate_id_2", "corporate_id_3"]
+
+
+@pytest.fixture
+def batch_details_response(input_corporate):
+    corporate_data = input_corporate.model_dump(exclude={"job_id", "created_at"})
+    return {
+        "data": {
+            "c0": {**corporate_data, "id": "corporate_id_1"},
+            "c1": None,
+            "c2": {**corporate_data, "id": "corporate_id_3"},
+        }
+    }
+
+
+@pytest.fixture
+def mocked_glassdollar_post(mocker):
+    mocked_post = mocker.patch("src.dataaccess.glassdollar_crawler.requests.Session.post")
+    mocked_post.return_value.status_code = 200
+    return mocked_post
+
+
+@pytest.fixture
+def mocked_rate_limiter(mocker):
+    return mocker.patch("src.dataaccess.glassdollar_crawler.GlassDollarCrawlerDataAccess.rate_limiter")
+
+
+@pytest.fixture
+def glassdollar_transport(input_corporate):
+    corporate_data = input_corporate.model_dump(exclude={"job_id", "created_at"})
+    city_corporate_ids = [f"corporate_id_{index}" for index in range(5)]
+    page_size = 2
+
+    def handler(request):
+        query = json.loads(request.content)["query"]
+        page_match = re.search(r"page: (\d+)", query)
+        if page_match:
+            page = int(page_match.group(1))
+            rows = city_corporate_ids[(page - 1) * page_size:page * page_size]
+            body = {"data": {"corporates": {"rows": [{"id": row_id} for row_id in rows], "count": len(city_corporate_ids)}}}
+        else:
+            aliases = re.findall(r'(c\d+): corporate\(id: "([^"]+)"\)', query)
+            body = {"data": {alias: {**corporate_data, "id": corporate_id} for alias, corporate_id in aliases}}
+        return httpx.Response(200, json=body)
+
+    return httpx.MockTransport(handler)
@@ -1,9 +1,31 @@
 import pytest
 import pymongo
 import mongomock
+from mongomock_motor import AsyncMongoMockClient
+
+from src.dataaccess.database import MongoConnection
+from src.services.response_cache import ResponseCacheService
 
 
 @pytest.fixture
 @mongomock.patch(servers=(('server.example.com', 27017),))
 def mongo_client():
     return pymongo.MongoClient('server.example.com')
+
+
+@pytest.fixture
+def empty_mongo_client():
+    return mongomock.MongoClient()
+
+
+@pytest.fixture
+def empty_response_cache():
+    ResponseCacheService.clear()
+    yield
+    ResponseCacheService.clear()
+
+
+@pytest.fixture
+def async_mongo_client():
+    MongoConnection.invalidate_latest_completed_job()
+    return AsyncMongoMockClient()
@@ -0,0 +1,25 @@
+from src.dataaccess.database import MongoConnection
+from src.services.incremental_crawl import IncrementalCrawlingService
+
+
+def test_reuse_unchanged(input_corporate, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    rows = [
+        {"id": "unchanged_id", "name": "NNIT Group", "startup_partners_count": 3},
+        {"id": "changed_id", "name": "Changed", "startup_partners_count": 4},
+        {"id": "new_id", "name": "New", "startup_partners_count": 1},
+    ]
+    previous_fingerprints = IncrementalCrawlingService.fingerprint_rows(rows[:2])
+    previous_fingerprints["changed_id"] = "outdated"
+    MongoConnection("fingerprints").upsert_fingerprints(previous_fingerprints, "previous_job_id")
+    MongoConnection("corporates").collection.insert_many([
+        input_corporate.model_copy(update={"id": corporate_id, "job_id": "previous_job_id"}).model_dump()
+        for corporate_id in ("unchanged_id", "changed_id")
+    ])
+
+    fingerprints = IncrementalCrawlingService.fingerprint_rows(rows)
+    function_output = IncrementalCrawlingService.reuse_unchanged(fingerprints, "job_id")
+
+    assert function_output == ["changed_id", "new_id"]
+    assert MongoConnection("corporates").get_stored_ids("job_id") == {"unchanged_id"}
+    assert MongoConnection("fingerprints").get_fingerprints(["unchanged_id"])["unchanged_id"]["job_id"] == "job_id"
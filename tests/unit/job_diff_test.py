@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from src.configs.app import AppConfig
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.schemas.job import Job
+from src.services.corporate_serializer import CorporateSerializer
+from src.services.job_diff import JobDiffService
+
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+def stored(corporate, job_id, **changes):
+    document = {**corporate.model_dump(), **changes, "job_id": job_id}
+    document["content_hash"] = CorporateSerializer.content_hash(document)
+    return document
+
+
+def test_content_hash_ignores_job(input_corporate):
+    document = input_corporate.model_dump()
+
+    assert CorporateSerializer.content_hash({**document, "job_id": "a"}) == CorporateSerializer.content_hash({**document, "job_id": "b"})
+    assert CorporateSerializer.content_hash(document) != CorporateSerializer.content_hash({**document, "name": "Other"})
+
+
+def test_stream_diff(monkeypatch, input_corporate, startup_partner, async_mongo_client):
+    AsyncMongoConnection.client = async_mongo_client
+    monkeypatch.setattr(AppConfig, "DIFF_BATCH_SIZE", 2)
+    asyncio.run(AsyncMongoConnection("job").collection.insert_many([
+        Job(job_id=job_id, total_corporate_count=1, counter=1).model_dump() for job_id in ("old", "new")
+    ]))
+    new_partner = startup_partner.model_copy(update={"company_name": "New Startup"}).model_dump()
+    asyncio.run(AsyncMongoConnection("corporates").collection.insert_many([
+        stored(input_corporate, "old", id="unchanged"),
+        stored(input_corporate, "new", id="unchanged"),
+        stored(input_corporate, "old", id="removed"),
+        stored(input_corporate, "new", id="added"),
+        stored(input_corporate, "old", id="changed"),
+        stored(input_corporate, "new", id="changed", startup_partners_count=4,
+               startup_partners=[*input_corporate.model_dump()["startup_partners"], new_partner]),
+    ]))
+
+    lines = asyncio.run(collect(asyncio.run(JobDiffService.stream_diff("old", "new")))).splitlines()
+    changes = {change["id"]: change for change in map(json.loads, lines)}
+
+    assert set(changes) == {"added", "removed", "changed"}
+    assert changes["added"]["change"] == "added"
+    assert changes["added"]["document"]["name"] == input_corporate.name
+    assert "content_hash" not in changes["added"]["document"]
+    assert changes["removed"]["change"] == "removed"
+    assert changes["changed"]["fields"] == {
+        "startup_partners_count": {"old": 3, "new": 4},
+        "startup_partners": {"added": [new_partner], "removed": []},
+    }
+
+
+def test_stream_diff_not_completed(async_mongo_client):
+    AsyncMongoConnection.client = async_mongo_client
+    asyncio.run(AsyncMongoConnection("job").collection.insert_many([
+        Job(job_id="old", total_corporate_count=1, counter=1).model_dump(),
+        Job(job_id="new", total_corporate_count=2, counter=1).model_dump(),
+    ]))
+
+    assert asyncio.run(JobDiffService.stream_diff("old", "new")) == {"message": "Come Back Later"}
@@ -0,0 +1,102 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+import pytest
+
+from src.configs.app import AppConfig
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.schemas.job import Job
+from src.services.job_progress import JobProgressService
+
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream]).decode()
+
+
+@pytest.fixture
+def empty_progress_cache(monkeypatch):
+    monkeypatch.setattr(JobProgressService, "progress_cache", {})
+
+
+def test_get_progress(job_id, async_mongo_client, empty_progress_cache):
+    AsyncMongoConnection.client = async_mongo_client
+    job = Job(job_id=job_id, total_corporate_count=100, counter=25, created_at=datetime.now() - timedelta(seconds=10))
+    asyncio.run(AsyncMongoConnection("job").collection.insert_one(job.model_dump()))
+
+    progress = asyncio.run(JobProgressService.get_progress(job_id))
+
+    assert (progress.status, progress.counter, progress.total_corporate_count, progress.progress) == ("running", 25, 100, 0.25)
+    assert progress.rate == pytest.approx(2.5, rel=0.05)
+    assert progress.eta_seconds == pytest.approx(30, rel=0.05)
+
+
+def test_get_progress_completed(job_id, async_mongo_client, empty_progress_cache):
+    AsyncMongoConnection.client = async_mongo_client
+    created_at = datetime.now() - timedelta(seconds=60)
+    job = Job(job_id=job_id, total_corporate_count=10, counter=10, created_at=created_at)
+    asyncio.run(AsyncMongoConnection("job").collection.insert_one({**job.model_dump(), "completed_at": created_at + timedelta(seconds=5)}))
+
+    progress = asyncio.run(JobProgressService.get_progress(job_id))
+
+    assert (progress.status, progress.progress, progress.rate, progress.eta_seconds) == ("completed", 1.0, 2.0, 0.0)
+
+
+def test_get_progress_unknown_job(job_id, async_mongo_client, empty_progress_cache):
+    AsyncMongoConnection.client = async_mongo_client
+
+    with pytest.raises(ValueError):
+        asyncio.run(JobProgressService.get_progress(job_id))
+
+
+def test_stream_progress(monkeypatch, job_id, async_mongo_client, empty_progress_cache):
+    AsyncMongoConnection.client = async_mongo_client
+    monkeypatch.setattr(AppConfig, "JOB_PROGRESS_POLL_INTERVAL", 0)
+    monkeypatch.setattr(AppConfig, "JOB_PROGRESS_KEEPALIVE_INTERVAL", 0)
+    asyncio.run(AsyncMongoConnection("job").collection.insert_one(Job(job_id=job_id, total_corporate_count=2).model_dump()))
+    updates = [
+        {"$set": {"counter": 0}},
+        {"$set": {"counter": 1}},
+        {"$set": {"counter": 2, "status": "completed"}},
+    ]
+
+    async def mock_sleep(delay):
+        await AsyncMongoConnection("job").collection.update_one({"job_id": job_id}, updates.pop(0))
+
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
+    events = asyncio.run(collect(JobProgressService.stream_progress(job_id))).split("\n\n")[:-1]
+
+    assert events[1] == ": keep-alive"
+    progress_events = [json.loads(event.split("data: ", 1)[1]) for event in events if event.startswith("event: progress")]
+    assert [(event["counter"], event["status"]) for event in progress_events] == [(0, "running"), (1, "running"), (2, "completed")]
+
+
+def test_stream_progress_expired(monkeypatch, job_id, async_mongo_client, empty_progress_cache):
+    AsyncMongoConnection.client = async_mongo_client
+    monkeypatch.setattr(AppConfig, "JOB_PROGRESS_POLL_INTERVAL", 0)
+    asyncio.run(AsyncMongoConnection("job").collection.insert_one(Job(job_id=job_id, total_corporate_count=2).model_dump()))
+
+    async def mock_sleep(delay):
+        await AsyncMongoConnection("job").collection.update_one({"job_id": job_id}, {"$set": {"status": "expired"}})
+
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
+    events = asyncio.run(collect(JobProgressService.stream_progress(job_id))).split("\n\n")[:-1]
+
+    assert [json.loads(event.split("data: ", 1)[1])["status"] for event in events] == ["running", "expired"]
+
+
+def test_stream_progress_deleted(monkeypatch, job_id, async_mongo_client, empty_progress_cache):
+    AsyncMongoConnection.client = async_mongo_client
+    monkeypatch.setattr(AppConfig, "JOB_PROGRESS_POLL_INTERVAL", 0)
+    asyncio.run(AsyncMongoConnection("job").collection.insert_one(Job(job_id=job_id, total_corporate_count=2).model_dump()))
+
+    async def mock_sleep(delay):
+        await AsyncMongoConnection("job").collection.delete_one({"job_id": job_id})
+
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
+    events = asyncio.run(collect(JobProgressService.stream_progress(job_id))).split("\n\n")[:-1]
+
+    assert events[0].startswith("event: progress")
+    assert events[1] == f'event: deleted\ndata: {json.dumps({"job_id": job_id})}'
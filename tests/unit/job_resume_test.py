@@ -0,0 +1,121 @@
+import pytest
+from fastapi import HTTPException
+
+from src.celery.app import city_task, resume_task
+from src.dataaccess.database import MongoConnection
+from src.dataaccess.glassdollar_crawler import GlassDollarCrawlerDataAccess
+from src.schemas.job import Job
+from src.services.glassdollar_crawler import GlassDollarCrawlingService
+from src.services.incremental_crawl import IncrementalCrawlingService
+
+LISTINGS = {
+    "Istanbul": [f"istanbul-{index}" for index in range(9)],
+    "Ankara": [f"ankara-{index}" for index in range(4)],
+}
+
+
+def listing_rows(city, page):
+    return [
+        {"id": corporate_id, "name": corporate_id, "hq_city": city, "hq_country": "Turkey", "startup_partners_count": 0}
+        for corporate_id in LISTINGS[city][(page - 1) * 3:page * 3]
+    ]
+
+
+@pytest.fixture
+def requested_pages(monkeypatch):
+    requested_pages = []
+
+    def mock_get_corporate_rows_by_city(city, page):
+        requested_pages.append((city, page))
+        return listing_rows(city, page), len(LISTINGS[city])
+
+    monkeypatch.setattr(GlassDollarCrawlerDataAccess, "get_corporate_rows_by_city", mock_get_corporate_rows_by_city)
+    return requested_pages
+
+
+def store_corporates(job_id, corporate_ids):
+    MongoConnection("corporates").collection.insert_many([{"job_id": job_id, "id": corporate_id} for corporate_id in corporate_ids])
+
+
+def test_city_task_checkpoints_pages(mocker, empty_mongo_client, requested_pages):
+    MongoConnection.client = empty_mongo_client
+    mocker.patch("src.celery.app.corporate_batch_task.delay")
+
+    city_task("Istanbul", "job-1")
+
+    checkpoint = MongoConnection("checkpoints").get_checkpoints("job-1")["Istanbul"]
+    assert checkpoint["page_count"] == 3
+    assert sorted(checkpoint["pages"]) == [1, 2, 3]
+    assert sorted(MongoConnection("enumerated_corporates").get_enumerated("job-1")) == sorted(LISTINGS["Istanbul"])
+
+
+def test_resume_task_enqueues_missing_work(mocker, empty_mongo_client, requested_pages):
+    MongoConnection.client = empty_mongo_client
+    job = Job(job_id="job-1", total_corporate_count=13, counter=2, cities=["Istanbul", "Ankara"])
+    MongoConnection("job").insert_one(job.model_dump())
+
+    listed_rows = listing_rows("Istanbul", 1) + listing_rows("Istanbul", 3)
+    MongoConnection("enumerated_corporates").record_enumerated(job.job_id, IncrementalCrawlingService.fingerprint_rows(listed_rows))
+    for page in (1, 3):
+        MongoConnection("checkpoints").record_listing_page(job.job_id, "Istanbul", page, 3)
+    store_corporates(job.job_id, ["istanbul-0", "istanbul-1", "istanbul-6", "istanbul-7"])
+    mocked_batch_task = mocker.patch("src.celery.app.corporate_batch_task.delay")
+
+    resume_task(job.job_id)
+
+    assert sorted(requested_pages) == [("Ankara", 1), ("Ankara", 2), ("Istanbul", 2)]
+    enqueued_ids = [corporate_id for call in mocked_batch_task.call_args_list for corporate_id in call.args[0]]
+    assert sorted(enqueued_ids) == sorted(
+        ["istanbul-2", "istanbul-8", "istanbul-3", "istanbul-4", "istanbul-5"] + LISTINGS["Ankara"]
+    )
+    assert MongoConnection("job").get_counter_and_total_value(job.job_id) == (4, 13)
+    assert sorted(MongoConnection("checkpoints").get_checkpoints(job.job_id)["Istanbul"]["pages"]) == [1, 2, 3]
+
+
+def test_resume_task_completes_job_with_lost_increments(mocker, empty_mongo_client, requested_pages):
+    MongoConnection.client = empty_mongo_client
+    job = Job(job_id="job-1", total_corporate_count=5, counter=1, cities=["Ankara"])
+    MongoConnection("job").insert_one(job.model_dump())
+    rows = listing_rows("Ankara", 1) + listing_rows("Ankara", 2)
+    MongoConnection("enumerated_corporates").record_enumerated(job.job_id, IncrementalCrawlingService.fingerprint_rows(rows))
+    for page in (1, 2):
+        MongoConnection("checkpoints").record_listing_page(job.job_id, "Ankara", page, 2)
+    store_corporates(job.job_id, LISTINGS["Ankara"])
+    mocked_batch_task = mocker.patch("src.celery.app.corporate_batch_task.delay")
+
+    resume_task(job.job_id)
+
+    assert requested_pages == []
+    mocked_batch_task.assert_not_called()
+    resumed_job = MongoConnection("job").get_job(job.job_id)
+    assert (resumed_job["counter"], resumed_job["total_corporate_count"], resumed_job["status"]) == (4, 4, "completed")
+
+
+@pytest.mark.parametrize(
+    ["counter", "status_code"],
+    [
+        (None, 404),
+        (1, 400),
+    ],
+)
+def test_resume_crawling_rejects_job(mocker, empty_mongo_client, counter, status_code):
+    MongoConnection.client = empty_mongo_client
+    if counter is not None:
+        MongoConnection("job").insert_one(Job(job_id="job-1", total_corporate_count=1, counter=counter).model_dump())
+    mocked_resume_task = mocker.patch("src.services.glassdollar_crawler.resume_task.delay")
+
+    with pytest.raises(HTTPException) as ex:
+        GlassDollarCrawlingService.resume_crawling("job-1")
+
+    assert ex.value.status_code == status_code
+    mocked_resume_task.assert_not_called()
+
+
+def test_resume_crawling_enqueues_resume_task(mocker, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    MongoConnection("job").insert_one(Job(job_id="job-1", total_corporate_count=2).model_dump())
+    mocked_resume_task = mocker.patch("src.services.glassdollar_crawler.resume_task.delay")
+
+    GlassDollarCrawlingService.resume_crawling("job-1")
+
+    mocked_resume_task.assert_called_once_with("job-1")
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+from prometheus_client import REGISTRY
+
+from src.celery.app import record_task_duration, record_task_start
+from src.monitoring.metrics import MongoCommandMetrics
+
+
+def sample_value(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_mongo_command_metrics():
+    labels = {"command": "find", "collection": "corporates", "outcome": "success"}
+    count = sample_value("mongo_command_duration_seconds_count", labels)
+    listener = MongoCommandMetrics()
+
+    listener.started(SimpleNamespace(command={"find": "corporates"}, command_name="find", request_id=1))
+    listener.succeeded(SimpleNamespace(command_name="find", request_id=1, duration_micros=1500))
+
+    assert sample_value("mongo_command_duration_seconds_count", labels) == count + 1
+    assert listener.collections == {}
+
+
+def test_task_metrics():
+    task = SimpleNamespace(name="src.celery.app.city_task", request=SimpleNamespace(published_at=1.0))
+    wait_count = sample_value("crawl_task_queue_wait_seconds_count", {"task": task.name})
+    duration_count = sample_value("crawl_task_duration_seconds_count", {"task": task.name, "state": "SUCCESS"})
+
+    record_task_start(task_id="task_id", task=task)
+    record_task_duration(task_id="task_id", task=task, state="SUCCESS")
+
+    assert sample_value("crawl_task_queue_wait_seconds_count", {"task": task.name}) == wait_count + 1
+    assert sample_value("crawl_task_duration_seconds_count", {"task": task.name, "state": "SUCCESS"}) == duration_count + 1
@@ -0,0 +1,33 @@
+import pytest
+
+from src.configs.dataaccess import DataAccessConfig
+from src.dataaccess.database import MongoConnection
+from src.dataaccess.rate_limiter import SharedRateLimiter
+
+
+def test_reserve(monkeypatch, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(DataAccessConfig.GlassDollar, "RATE_LIMIT", 10)
+    monkeypatch.setattr(DataAccessConfig.GlassDollar, "RATE_LIMIT_BURST", 2)
+    rate_limiter = SharedRateLimiter()
+
+    assert rate_limiter.reserve() == 0
+    assert rate_limiter.reserve() == 0
+    assert rate_limiter.reserve() == pytest.approx(0.1, abs=0.01)
+    assert rate_limiter.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_aimd(monkeypatch, empty_mongo_client):
+    MongoConnection.client = empty_mongo_client
+    monkeypatch.setattr(DataAccessConfig.GlassDollar, "RATE_LIMIT", 10)
+    monkeypatch.setattr(DataAccessConfig.GlassDollar, "AIMD_INCREASE_EVERY", 2)
+    rate_limiter = SharedRateLimiter()
+    rate_limiter.reserve()
+
+    rate_limiter.on_throttle()
+    rate_limiter.on_throttle()
+    assert rate_limiter.get_bucket(rate_limiter.get_collection())["rate"] == 5
+
+    rate_limiter.on_success()
+    rate_limiter.on_success()
+    assert rate_limiter.get_bucket(rate_limiter.get_collection())["rate"] == 6
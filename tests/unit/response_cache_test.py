@@ -0,0 +1,54 @@
+import asyncio
+
+from src.configs.app import AppConfig
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.services.response_cache import ResponseCacheService
+
+
+def test_put_and_get(empty_response_cache, output_corporates):
+    key = ResponseCacheService.build_key("documents", "job-id", fields=["name"], limit=2)
+
+    cached_response = asyncio.run(ResponseCacheService.put(key, output_corporates, "cursor"))
+
+    assert asyncio.run(ResponseCacheService.get(key)) == cached_response
+    assert cached_response.next_cursor == "cursor"
+    assert asyncio.run(ResponseCacheService.get(ResponseCacheService.build_key("documents", "job-id"))) is None
+
+
+def test_least_recently_used_is_evicted(monkeypatch, empty_response_cache, output_corporates):
+    monkeypatch.setattr(AppConfig, "RESPONSE_CACHE_MAX_ENTRIES", 2)
+
+    asyncio.run(ResponseCacheService.put("first", output_corporates, None))
+    asyncio.run(ResponseCacheService.put("second", output_corporates, None))
+    asyncio.run(ResponseCacheService.get("first"))
+    asyncio.run(ResponseCacheService.put("third", output_corporates, None))
+
+    assert list(ResponseCacheService.entries) == ["first", "third"]
+    assert ResponseCacheService.size == 2 * len(asyncio.run(ResponseCacheService.get("first")).body)
+
+
+def test_expired_entry_is_dropped(monkeypatch, empty_response_cache, output_corporates):
+    monkeypatch.setattr(AppConfig, "RESPONSE_CACHE_TTL", -1)
+
+    asyncio.run(ResponseCacheService.put("key", output_corporates, None))
+
+    assert asyncio.run(ResponseCacheService.get("key")) is None
+    assert ResponseCacheService.size == 0
+
+
+def test_shared_backend(monkeypatch, empty_response_cache, async_mongo_client, output_corporates):
+    AsyncMongoConnection.client = async_mongo_client
+    monkeypatch.setattr(AppConfig, "RESPONSE_CACHE_SHARED", True)
+
+    cached_response = asyncio.run(ResponseCacheService.put("key", output_corporates, None))
+    ResponseCacheService.clear()
+
+    assert asyncio.run(ResponseCacheService.get("key")) == cached_response
+    assert "key" in ResponseCacheService.entries
+
+
+def test_etag_matches():
+    assert ResponseCacheService.etag_matches('"a", W/"b"', '"b"')
+    assert ResponseCacheService.etag_matches("*", '"b"')
+    assert not ResponseCacheService.etag_matches('"a"', '"b"')
+    assert not ResponseCacheService.etag_matches(None, '"b"')
@@ -1,10 +1,19 @@
+import asyncio
+import json
 import pytest
-import pymongo
-import mongomock
 
+from src.configs.app import AppConfig
 from src.services.glassdollar_retrieval import GlassDollarRetrievalService
-from src.services.glassdollar_crawler import GlassDollarCrawlingService
-from src.dataaccess.database import MongoConnection
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.schemas.corporates import Corporate
+
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+def as_corporates(documents):
+    return [document if isinstance(document, Corporate) else Corporate(**document) for document in documents]
 
 
 @pytest.mark.parametrize(
@@ -14,54 +23,108 @@ from src.dataaccess.database import MongoConnection
         (False, {"message": "Come Back Later"}),
     ],
 )
-def test_start_glassdollar_crawling2(monkeypatch, job_id, input_corporate, output_corporate, mongo_client, is_job_completed, expected_message):
-    MongoConnection.client = mongo_client
+def test_start_glassdollar_crawling2(monkeypatch, job_id, input_corporate, output_corporate, async_mongo_client, is_job_completed, expected_message):
+    AsyncMongoConnection.client = async_mongo_client
 
-    MongoConnection("corporates").insert_one(input_corporate.model_dump())
+    asyncio.run(AsyncMongoConnection("corporates").collection.insert_one(input_corporate.model_dump()))
 
-    def mock_is_job_completed(job_id):
+    async def mock_is_job_completed(job_id):
         return is_job_completed
 
     monkeypatch.setattr(GlassDollarRetrievalService, "is_job_completed", mock_is_job_completed)
 
-    function_output = GlassDollarRetrievalService.get_documents(job_id)
+    function_output = asyncio.run(GlassDollarRetrievalService.get_documents(job_id))
     if is_job_completed:
-        expected_output = [output_corporate]
+        documents, next_cursor = function_output
+        assert (as_corporates(documents), next_cursor) == ([output_corporate], None)
     else:
-        expected_output = expected_message
-    assert function_output == expected_output
+        assert function_output == expected_message
 
 
-@mongomock.patch(servers=(('server.example.com', 27017),))
-def test_get_latest_documents(monkeypatch, job, input_corporate, output_corporate, mongo_client):
-    mongo_client = pymongo.MongoClient('server.example.com')
-    MongoConnection.client = mongo_client
+def test_get_latest_documents(monkeypatch, job, input_corporate, output_corporate, async_mongo_client):
+    AsyncMongoConnection.client = async_mongo_client
 
-    MongoConnection("job").insert_one(job.model_dump())
+    asyncio.run(AsyncMongoConnection("job").collection.insert_one(job.model_dump()))
 
-    MongoConnection("corporates").insert_one(input_corporate.model_dump())
+    asyncio.run(AsyncMongoConnection("corporates").collection.insert_one(input_corporate.model_dump()))
 
-    function_output = GlassDollarRetrievalService.get_latest_documents()
-    expected_output = [output_corporate]
-    assert function_output == expected_output
+    documents, next_cursor = asyncio.run(GlassDollarRetrievalService.get_latest_documents())
+    assert (as_corporates(documents), next_cursor) == ([output_corporate], None)
 
 
 @pytest.mark.parametrize(
-    ["job_id", "counter", "total_corporate_count", "expected_output"],
+    ["job_id", "counter", "total_corporate_count", "status", "expected_output"],
     [
-        ("job_id_1", 1, 1, True),
-        ("job_id_2", 0, 1, False),
+        ("job_id_1", 1, 1, "completed", True),
+        ("job_id_2", 0, 1, "running", False),
+        ("job_id_3", 5, 3, "completed", True),
+        ("job_id_4", 1, 1, "expired", False),
     ],
 )
-def test_is_job_completed(monkeypatch, job, mongo_client, job_id, counter, total_corporate_count, expected_output):
-    MongoConnection.client = mongo_client
+def test_is_job_completed(monkeypatch, job, async_mongo_client, job_id, counter, total_corporate_count, status,
+                          expected_output):
+    AsyncMongoConnection.client = async_mongo_client
 
     job.job_id = job_id
     job.counter = counter
     job.total_corporate_count = total_corporate_count
+    job.status = status
 
-    MongoConnection("job").insert_one(job.model_dump())
+    asyncio.run(AsyncMongoConnection("job").collection.insert_one(job.model_dump()))
 
-    function_output = GlassDollarRetrievalService.is_job_completed(job.job_id)
+    function_output = asyncio.run(GlassDollarRetrievalService.is_job_completed(job.job_id))
 
     assert function_output == expected_output
+
+
+def test_is_job_completed_unknown_job(async_mongo_client):
+    AsyncMongoConnection.client = async_mongo_client
+
+    with pytest.raises(ValueError):
+        asyncio.run(GlassDollarRetrievalService.is_job_completed("unknown_job_id"))
+
+
+@pytest.mark.parametrize("output_format", ["ndjson", "json"])
+def test_stream_documents(monkeypatch, job_id, input_corporate, output_corporate, async_mongo_client, output_format):
+    AsyncMongoConnection.client = async_mongo_client
+
+    asyncio.run(AsyncMongoConnection("corporates").collection.insert_one(input_corporate.model_dump()))
+
+    async def mock_is_job_completed(job_id):
+        return True
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "is_job_completed", mock_is_job_completed)
+
+    async def stream():
+        return await collect(await GlassDollarRetrievalService.stream_documents(job_id, output_format))
+
+    function_output = asyncio.run(stream())
+    expected_document = output_corporate.model_dump(exclude_none=True)
+    if output_format == "ndjson":
+        assert [json.loads(line) for line in function_output.splitlines()] == [expected_document]
+    else:
+        assert json.loads(function_output) == [expected_document]
+
+
+@pytest.mark.parametrize("fast_serialization", [True, False])
+def test_get_documents_pages(monkeypatch, job_id, input_corporate, async_mongo_client, fast_serialization):
+    AsyncMongoConnection.client = async_mongo_client
+    monkeypatch.setattr(AppConfig, "FAST_SERIALIZATION", fast_serialization)
+    asyncio.run(AsyncMongoConnection("corporates").collection.insert_many([
+        input_corporate.model_copy(update={"name": f"corporate_{index}"}).model_dump() for index in range(5)
+    ]))
+
+    async def mock_is_job_completed(job_id):
+        return True
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "is_job_completed", mock_is_job_completed)
+
+    names, after = [], None
+    while True:
+        documents, after = asyncio.run(GlassDollarRetrievalService.get_documents(job_id, ["name"], after, 2))
+        names.extend(document["name"] for document in documents)
+        assert all(set(document) == {"_id", "name"} for document in documents)
+        if after is None:
+            break
+
+    assert names == [f"corporate_{index}" for index in range(5)]
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.schemas.corporates import Corporate
+from src.services.glassdollar_retrieval import GlassDollarRetrievalService
+from src.services.response_cache import ResponseCacheService
+from src.services.search_index import SearchIndex, SearchIndexService
+
+
+def build_index():
+    return SearchIndex([
+        Corporate(name="Siemens", hq_city="Munich", hq_country="Germany", startup_themes=[["Automation", "4"]]),
+        Corporate(name="Siemens Energy", hq_city="Munich", hq_country="Germany",
+                  description="Energy technology and automation", startup_themes=[["Energy", "2"]]),
+        Corporate(name="Sony", hq_city="Tokyo", hq_country="Japan", startup_themes=[["Automation", "1"], ["Media", "1"]]),
+    ])
+
+
+def test_search_ranks_by_relevance():
+    result = build_index().search("siemens energy")
+
+    assert result.total == 1
+    assert [document.name for document in result.documents] == ["Siemens Energy"]
+    assert [document.name for document in build_index().search("automation").documents] == ["Siemens", "Sony", "Siemens Energy"]
+
+
+def test_search_matches_prefixes_and_accents():
+    index = build_index()
+
+    assert [document.name for document in index.search("sie").documents] == ["Siemens", "Siemens Energy"]
+    assert [document.name for document in index.search("TÓKY").documents] == ["Sony"]
+    assert index.search("siemens tokyo").total == 0
+
+
+def test_search_pages():
+    index = build_index()
+
+    result = index.search("automation", limit=1, offset=1)
+    assert result.total == 3
+    assert [document.name for document in result.documents] == ["Sony"]
+    assert index.search("automation", offset=3).documents == []
+
+
+def test_facets():
+    assert build_index().facets("automation") == {
+        "hq_country": {"Germany": 2, "Japan": 1},
+        "startup_themes": {"Automation": 2, "Energy": 1, "Media": 1},
+    }
+
+
+def test_search_documents(job, input_corporate, output_corporate, async_mongo_client, empty_response_cache):
+    AsyncMongoConnection.client = async_mongo_client
+    SearchIndexService.clear()
+    asyncio.run(AsyncMongoConnection("job").collection.insert_one(job.model_dump()))
+    asyncio.run(AsyncMongoConnection("corporates").collection.insert_one(input_corporate.model_dump()))
+
+    assert asyncio.run(GlassDollarRetrievalService.search_documents("denm")) == ([output_corporate], None)
+    documents, _ = asyncio.run(GlassDollarRetrievalService.search_documents("nnit", ["name", "hq_city"]))
+    assert documents == [{"name": "NNIT Group", "hq_city": input_corporate.hq_city}]
+    cached_response = asyncio.run(ResponseCacheService.put("search-key", documents, None))
+    assert [set(document) for document in json.loads(cached_response.body)] == [{"name", "hq_city"}]
+    assert asyncio.run(GlassDollarRetrievalService.get_search_facets("automation")) == {
+        "total": 1,
+        "facets": {"hq_country": {"Denmark": 1}, "startup_themes": {"Digital Transformation": 1, "Automation": 1}},
+    }
+    assert list(SearchIndexService.indices) == [job.job_id]
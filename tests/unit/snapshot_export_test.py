@@ -0,0 +1,67 @@
+import asyncio
+import pyarrow.parquet as pq
+import pytest
+
+from src.configs.app import AppConfig
+from src.dataaccess.async_database import AsyncMongoConnection
+from src.services.glassdollar_retrieval import GlassDollarRetrievalService
+from src.services.snapshot_export import SnapshotExportService
+
+
+@pytest.fixture
+def snapshot_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(AppConfig, "SNAPSHOT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_export_job(monkeypatch, job_id, input_corporate, async_mongo_client, snapshot_dir):
+    AsyncMongoConnection.client = async_mongo_client
+    monkeypatch.setattr(AppConfig, "SNAPSHOT_ROW_GROUP_SIZE", 2)
+    asyncio.run(AsyncMongoConnection("corporates").collection.insert_many([
+        input_corporate.model_copy(update={"id": f"corporate_{index}"}).model_dump() for index in range(5)
+    ]))
+
+    path = asyncio.run(SnapshotExportService.export_job(job_id))
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 3
+    table = pq.read_table(path, memory_map=True)
+    assert table.column("id").to_pylist() == [f"corporate_{index}" for index in range(5)]
+    row = table.slice(0, 1).to_pylist()[0]
+    assert row["startup_partners"] == [partner.model_dump() for partner in input_corporate.startup_partners]
+    assert row["startup_themes"] == input_corporate.startup_themes
+    assert [name for name in snapshot_dir.iterdir()] == [snapshot_dir / f"{job_id}.parquet"]
+
+
+def test_get_snapshot(monkeypatch, job_id, input_corporate, async_mongo_client, snapshot_dir):
+    AsyncMongoConnection.client = async_mongo_client
+    asyncio.run(AsyncMongoConnection("corporates").collection.insert_one(input_corporate.model_dump()))
+    exports = []
+
+    async def mock_is_job_completed(job_id):
+        return True
+
+    async def mock_export_job(job_id):
+        exports.append(job_id)
+        return await export_job(job_id)
+
+    export_job = SnapshotExportService.export_job
+    monkeypatch.setattr(GlassDollarRetrievalService, "is_job_completed", mock_is_job_completed)
+    monkeypatch.setattr(SnapshotExportService, "export_job", mock_export_job)
+
+    assert asyncio.run(SnapshotExportService.get_snapshot(job_id)) == str(snapshot_dir / f"{job_id}.parquet")
+    assert asyncio.run(SnapshotExportService.get_snapshot(job_id)) == str(snapshot_dir / f"{job_id}.parquet")
+    assert exports == [job_id]
+
+
+def test_get_snapshot_not_completed(monkeypatch, job_id, snapshot_dir):
+    async def mock_is_job_completed(job_id):
+        return False
+
+    monkeypatch.setattr(GlassDollarRetrievalService, "is_job_completed", mock_is_job_completed)
+
+    assert asyncio.run(SnapshotExportService.get_snapshot(job_id)) == {"message": "Come Back Later"}
+
+
+def test_get_snapshot_path_stays_in_snapshot_dir(snapshot_dir):
+    assert SnapshotExportService.get_snapshot_path("../job/1") == str(snapshot_dir / "..%2Fjob%2F1.parquet")